@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for scoring, rendering and publishing on synthetic universes.
+
+Each case runs on seeded synthetic company universes (10, 1k and 100k rows
+by default) shaped like discovery output: log-normal prices, market caps
+and P/E ratios, a 52-week range around the price, skewed debt and holder
+values, and the real expert-overlay symbols at the top so every report
+section has content. Cases:
+
+- ``score``: analyze_expert_validated_asymmetry
+- ``report``: generate_expert_report (plain text)
+- ``persist``: run-store append plus writing the Markdown report
+- ``readme``: ReadmeUpdater.update_readme on a scratch README
+
+Results are the best of ``--repeat`` runs. ``--save`` writes them to
+``benchmarks/baseline.json``; ``--check`` fails when a case is slower than
+its baseline by more than the threshold ratio (noise below ``min_seconds``
+is ignored).
+"""
+
+import contextlib
+import io
+import json
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+ROOT_DIR = Path(__file__).parent.parent
+sys.path.append(str(ROOT_DIR))
+sys.path.append(str(ROOT_DIR / "src"))
+sys.path.append(str(ROOT_DIR / "scripts"))
+
+import numpy as np
+
+from dynamic_pli_analyzer import (EXPERT_INSIGHTS, analyze_expert_validated_asymmetry, generate_expert_report,
+                                  run_record)
+from report_renderer import render_report
+from run_store import RunStore
+from track_record import TrackRecord
+from update_readme import ReadmeUpdater
+
+BASELINE_FILE = Path(__file__).parent / "baseline.json"
+DEFAULT_SIZES = (10, 1_000, 100_000)
+DEFAULT_THRESHOLDS = {'max_ratio': 1.5, 'min_seconds': 0.005}
+
+
+def synthetic_companies(n: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """``n`` company records shaped like discovery output, deterministic per seed"""
+    rng = np.random.default_rng(seed)
+    price = rng.lognormal(np.log(500), 1.0, n).round(2)
+    low = (price / rng.uniform(1.0, 1.6, n)).round(2)
+    high = np.maximum(price * rng.uniform(1.05, 2.5, n), price).round(2)
+    pe = rng.lognormal(np.log(35), 0.8, n).round(1)
+    market_cap = rng.lognormal(np.log(5e10), 1.5, n)
+    avg_volume = rng.lognormal(np.log(3e5), 1.2, n).astype(int)
+    debt = rng.gamma(1.2, 0.2, n).round(3)
+    mf_value = market_cap * rng.beta(1.5, 20, n)
+    changes = {name: rng.normal(mu, sd, n).round(2) for name, mu, sd in (
+        ('one_month_change', 0.5, 8), ('three_month_change', 1.5, 15),
+        ('six_month_change', 3, 22), ('twelve_month_change', 8, 35))}
+
+    # The overlay's own symbols lead the universe so every report section renders
+    named = list(dict.fromkeys([*EXPERT_INSIGHTS['strategic_winners'],
+                                *(s['symbol'] for s in EXPERT_INSIGHTS['stealth_ranking'].values()),
+                                *EXPERT_INSIGHTS['hidden_risks']]))
+    companies = []
+    for i in range(n):
+        symbol = named[i] if i < len(named) else f"SYN{i:06d}"
+        company = {
+            'symbol': symbol,
+            'name': f"{symbol.title()} Industries",
+            'current_price': float(price[i]),
+            'market_cap': float(market_cap[i]),
+            'pe_ratio': float(pe[i]),
+            'volume': int(avg_volume[i] * rng.uniform(0.3, 2.0)),
+            'avg_volume': int(avg_volume[i]),
+            'fifty_two_week_high': float(high[i]),
+            'fifty_two_week_low': float(low[i]),
+            'debt_to_equity': float(debt[i]),
+            'institutional_value': float(market_cap[i] * rng.beta(2, 10)),
+            'mutual_fund_value': float(mf_value[i]),
+            'mf_percentage': float(mf_value[i] / market_cap[i] * 100),
+            'beta': float(rng.normal(1.0, 0.3)),
+            'distance_from_low_pct': float((price[i] - low[i]) / low[i] * 100),
+            **{name: float(values[i]) for name, values in changes.items()},
+        }
+        if symbol in EXPERT_INSIGHTS['strategic_winners']:
+            expert = EXPERT_INSIGHTS['strategic_winners'][symbol]
+            company['expert_catalyst'] = expert.get('catalyst', '')
+            company['expert_warning'] = expert.get('warning', '')
+            company['geopolitical_risk'] = expert.get('geopolitical_risk', '')
+        for rank, stealth in EXPERT_INSIGHTS['stealth_ranking'].items():
+            if stealth['symbol'] == symbol:
+                company['stealth_rank'] = rank
+                company['stealth_score'] = stealth['score']
+        if symbol in EXPERT_INSIGHTS['hidden_risks']:
+            company['hidden_risks'] = EXPERT_INSIGHTS['hidden_risks'][symbol]
+        companies.append(company)
+    return companies
+
+
+def best_of(call: Callable[[], Any], repeat: int) -> float:
+    """Fastest of ``repeat`` timed calls, with the case's own printing silenced"""
+    timings = []
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            started = time.perf_counter()
+            call()
+            timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def run_cases(n: int, repeat: int, workdir: Path) -> Dict[str, float]:
+    companies = synthetic_companies(n)
+    with contextlib.redirect_stdout(io.StringIO()):
+        asymmetry = analyze_expert_validated_asymmetry(companies)
+    run_data = run_record(asymmetry, datetime(2026, 3, 2, 9, 30))
+
+    readme = workdir / "README.md"
+    shutil.copy(ROOT_DIR / "README.md", readme)
+    report_path = workdir / "report.md"
+
+    def persist():
+        with RunStore(workdir / f"runs-{n}.sqlite") as store:
+            store.append_run(run_data)
+        with open(report_path, 'w', encoding='utf-8') as f:
+            render_report(companies, asymmetry, EXPERT_INSIGHTS, out=f, fmt='markdown')
+
+    def update_readme():
+        updater = ReadmeUpdater()
+        updater.readme_path = readme
+        updater.track_record = TrackRecord(workdir / f"track-{n}.jsonl")
+        updater.update_readme(analysis=run_data)
+
+    return {
+        'score': best_of(lambda: analyze_expert_validated_asymmetry(companies), repeat),
+        'report': best_of(lambda: generate_expert_report(companies, asymmetry, fmt='plain'), repeat),
+        'persist': best_of(persist, repeat),
+        'readme': best_of(update_readme, repeat),
+    }
+
+
+def run_benchmarks(sizes=DEFAULT_SIZES, repeat: int = 3) -> Dict[str, float]:
+    """``{'<case>/<size>': seconds}`` for every case and size"""
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in sizes:
+            for case, seconds in run_cases(n, repeat, Path(tmp)).items():
+                results[f"{case}/{n}"] = seconds
+    return results
+
+
+def load_baseline(path: Path = BASELINE_FILE) -> Optional[Dict[str, Any]]:
+    if not path.exists():
+        return None
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_baseline(results: Dict[str, float], path: Path = BASELINE_FILE,
+                  thresholds: Optional[Dict[str, float]] = None) -> Path:
+    previous = load_baseline(path) or {}
+    baseline = {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'machine': f"{platform.system()} {platform.machine()}",
+        'thresholds': thresholds or previous.get('thresholds', DEFAULT_THRESHOLDS),
+        'results': {k: round(v, 6) for k, v in results.items()},
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(baseline, f, indent=2)
+        f.write('\n')
+    return path
+
+
+def regressions(results: Dict[str, float], baseline: Dict[str, Any]) -> List[str]:
+    """Cases slower than ``max_ratio`` x their baseline (ignoring differences under ``min_seconds``)"""
+    thresholds = {**DEFAULT_THRESHOLDS, **baseline.get('thresholds', {})}
+    slow = []
+    for name, seconds in results.items():
+        reference = baseline['results'].get(name)
+        if reference is None:
+            continue
+        if seconds > reference * thresholds['max_ratio'] and seconds - reference > thresholds['min_seconds']:
+            slow.append(f"{name}: {seconds * 1000:.1f}ms vs baseline {reference * 1000:.1f}ms "
+                        f"({seconds / reference:.2f}x > {thresholds['max_ratio']}x)")
+    return slow
+
+
+def print_results(results: Dict[str, float], baseline: Optional[Dict[str, Any]] = None):
+    reference = (baseline or {}).get('results', {})
+    print(f"{'case':<20} {'seconds':>10} {'baseline':>10} {'ratio':>7}")
+    for name, seconds in results.items():
+        base = reference.get(name)
+        ratio = f"{seconds / base:.2f}x" if base else '—'
+        print(f"{name:<20} {seconds:>10.4f} {base if base is not None else float('nan'):>10.4f} {ratio:>7}")
+
+
+def main(sizes=DEFAULT_SIZES, repeat: int = 3, save: bool = False, check: bool = False) -> int:
+    baseline = load_baseline()
+    results = run_benchmarks(sizes, repeat)
+    print_results(results, baseline)
+
+    if save:
+        print(f"💾 Baseline written to {save_baseline(results)}")
+    if check:
+        if baseline is None:
+            print(f"No baseline at {BASELINE_FILE}; run with --save first")
+            return 1
+        slow = regressions(results, baseline)
+        for line in slow:
+            print(f"❌ {line}")
+        if slow:
+            return 1
+        print("✅ No regressions against the baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark scoring, rendering and publishing")
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES), help="Universe sizes")
+    parser.add_argument('--repeat', type=int, default=3, help="Runs per case (best is kept)")
+    parser.add_argument('--save', action='store_true', help="Write results to benchmarks/baseline.json")
+    parser.add_argument('--check', action='store_true', help="Exit 1 when a case regresses past the baseline threshold")
+    args = parser.parse_args()
+
+    sys.exit(main(sizes=args.sizes, repeat=args.repeat, save=args.save, check=args.check))
@@ -2,24 +2,26 @@
 
 import os
 from pathlib import Path
-from dotenv import load_dotenv
 
-# Load environment variables
-load_dotenv()
-
-# Paths
+# Paths (each writer creates the directory it needs, so importing settings touches no disk)
 ROOT_DIR = Path(__file__).parent.parent
 DATA_DIR = ROOT_DIR / "data"
 LOGS_DIR = ROOT_DIR / "logs"
 REPORTS_DIR = ROOT_DIR / "reports"
 
-# Create directories if they don't exist
-for dir_path in [DATA_DIR, LOGS_DIR, REPORTS_DIR]:
-    dir_path.mkdir(exist_ok=True)
+# API Keys (from environment variables / .env, loaded on first access)
+ENV_KEYS = ('NEWS_API_KEY', 'GEMINI_API_KEY')
+
+
+def __getattr__(name):
+    if name not in ENV_KEYS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from dotenv import load_dotenv
+    load_dotenv()
+    for key in ENV_KEYS:
+        globals()[key] = os.getenv(key, "")
+    return globals()[name]
 
-# API Keys (from environment variables)
-NEWS_API_KEY = os.getenv("NEWS_API_KEY", "")
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY", "")
 
 # Analysis settings
 PLI_SECTORS = {
@@ -36,4 +38,66 @@ VOLUME_LOW_THRESHOLD = 100000  # Low volume threshold
 
 # Buy/Sell parameters
 BUY_TRIGGER_PERCENTAGE = 1.02  # 2% above 52-week low
-STOP_LOSS_PERCENTAGE = 0.95  # 5% below 52-week low
\ No newline at end of file
+STOP_LOSS_PERCENTAGE = 0.95  # 5% below 52-week low
+
+# Market data fetching
+FETCH_MAX_WORKERS = 8  # Symbols fetched concurrently
+FETCH_TIMEOUT_SECONDS = 30  # Per-symbol timeout
+
+# On-disk cache for provider responses (TTL in seconds per data kind)
+CACHE_DIR = DATA_DIR / "cache"
+CACHE_MAX_BYTES = 200 * 1024 * 1024
+CACHE_TTLS = {
+    'info': 15 * 60,  # Quotes move; keep minutes
+    'institutional_holders': 7 * 24 * 3600,  # Holders change weekly at most
+    'mutualfund_holders': 7 * 24 * 3600,
+    'balance_sheet': 90 * 24 * 3600,  # Quarterly filings
+}
+
+# Local bulk market-data dumps (quotes/balance_sheet/holders/history as Parquet, CSV or Arrow)
+MARKET_DATA_DIR = DATA_DIR / "market"
+
+# Universe scan (optional broader NSE list: CSV with symbol[,sector] or one symbol per line)
+NSE_UNIVERSE_FILE = DATA_DIR / "nse_universe.csv"
+
+# Provider rate limiting and retries
+RATE_LIMIT_PER_SECOND = 4.0  # Sustained remote calls per second
+RATE_LIMIT_BURST = 8  # Calls allowed back to back
+FETCH_RETRIES = 3
+RETRY_BASE_DELAY = 0.5  # Seconds; doubled per attempt with full jitter
+RETRY_MAX_DELAY = 10.0
+
+# Local news article store (incremental NewsAPI fetches)
+NEWS_DB_PATH = DATA_DIR / "news.sqlite"
+
+# Scoring: reason strings are only built for the top-K reported companies
+SCORING_TOP_K = 10
+
+# Declarative scoring rules (conditions, weights and report templates)
+SCORING_RULES_FILE = ROOT_DIR / "config" / "scoring_rules.json"
+
+# Append-only store of analysis runs (one row per company per run)
+RUNS_DB_PATH = DATA_DIR / "runs.sqlite"
+
+# Append-only pick log (JSON lines) with a (date, symbol) side index next to it
+TRACK_RECORD_PATH = DATA_DIR / "track_record.jsonl"
+
+# Local daily OHLCV store; runs only download bars newer than what's stored
+PRICE_DB_PATH = DATA_DIR / "prices.sqlite"
+PRICE_STORE_BACKFILL = "2y"  # History fetched the first time a symbol is seen
+PRICE_HISTORY_PERIOD = "2y"  # History loaded for 52-week and 1m-12m statistics
+
+# Pipeline stage outputs, keyed by a hash of each stage's inputs and code (see src/pipeline.py)
+ARTIFACTS_DIR = DATA_DIR / "artifacts"
+
+# Watch mode: quote polling during NSE market hours (holidays are not skipped)
+MARKET_TIMEZONE = "Asia/Kolkata"
+MARKET_OPEN = "09:15"
+MARKET_CLOSE = "15:30"
+WATCH_POLL_SECONDS = 60
+ALERTS_FILE = LOGS_DIR / "alerts.jsonl"
+
+# Run metrics (stage timings, provider latency, cache hits, retries, peak RSS; see src/metrics.py)
+METRICS_FILE = LOGS_DIR / "metrics.json"  # Latest run
+METRICS_HISTORY_FILE = LOGS_DIR / "metrics_history.jsonl"  # One line per run
+METRICS_PROM_FILE = LOGS_DIR / "pli_alpha.prom"  # Prometheus textfile collector
@@ -10,12 +10,20 @@ As of February 23, 2026, the latest news is about iPhone exports from India
 driven by the PLI scheme.
 """
 
+import asyncio
 import json
 import urllib.request
 import urllib.parse
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any, List
+from typing import Callable, Optional, Dict, Any, List
 import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent / "src"))
+
+from news_client import AsyncNewsClient, build_news_queries
+from news_store import NewsStore
+from snapshot import Snapshot, open_snapshot
 
 # ANSI color codes for better output formatting
 class Colors:
@@ -44,17 +52,37 @@ NEWS_API_URL = "https://newsapi.org/v2/everything"
 # NEWS FETCHING FUNCTIONS
 # ============================================================================
 
-def fetch_live_headline_from_newsapi(query: str) -> Optional[Dict[str, Any]]:
+def _request_newsapi(url: str) -> Dict[str, Any]:
+    """
+    Performs one NewsAPI request and returns the raw JSON response.
+    """
+    # Create request with User-Agent header
+    req = urllib.request.Request(
+        url,
+        headers={
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+        }
+    )
+    
+    with urllib.request.urlopen(req, timeout=10) as response:
+        return json.loads(response.read().decode('utf-8'))
+
+def fetch_live_headline_from_newsapi(query: str, snapshot: Optional[Snapshot] = None,
+                                     request: Optional[Callable[[str], Dict[str, Any]]] = None) -> Optional[Dict[str, Any]]:
     """
     Fetches the latest headline from NewsAPI based on the query.
     
     Args:
         query: Search query string (e.g., "PLI Scheme")
+        snapshot: Optional snapshot to record the raw response to, or replay it from
+        request: Performs the request for a URL instead of NewsAPI
+                 (e.g. SyntheticNewsSource.request for offline runs)
     
     Returns:
         Dictionary containing headline data or None if unavailable
     """
-    if NEWS_API_KEY == "e1a3eb1a81d849449f2bff0d4f301fc7":
+    replaying = snapshot is not None and snapshot.replaying
+    if not replaying and request is None and NEWS_API_KEY == "e1a3eb1a81d849449f2bff0d4f301fc7":
         print(f"{Colors.RED}Error: Please replace 'e1a3eb1a81d849449f2bff0d4f301fc7' with your actual NewsAPI key{Colors.END}")
         return get_fallback_headline()
     
@@ -71,39 +99,37 @@ def fetch_live_headline_from_newsapi(query: str) -> Optional[Dict[str, Any]]:
     # Build the URL with parameters
     url = f"{NEWS_API_URL}?{urllib.parse.urlencode(params)}"
     
+    # Snapshot key leaves out the API key and the rolling 'from' date
+    snapshot_key = ('newsapi', query, params['pageSize'], params['sortBy'], params['language'])
+    
     try:
         print(f"{Colors.BLUE}🔍 Fetching latest '{query}' news from NewsAPI...{Colors.END}")
         
-        # Create request with User-Agent header
-        req = urllib.request.Request(
-            url,
-            headers={
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
-        )
+        request = request or _request_newsapi
+        if snapshot is not None:
+            data = snapshot.fetch(snapshot_key, lambda: request(url))
+        else:
+            data = request(url)
         
-        with urllib.request.urlopen(req, timeout=10) as response:
-            data = json.loads(response.read().decode('utf-8'))
+        if data['status'] == 'ok' and data['totalResults'] > 0:
+            article = data['articles'][0]
+            
+            # Extract and format the headline
+            headline = {
+                'title': article.get('title', 'No title available'),
+                'description': article.get('description', 'No description available'),
+                'source': article.get('source', {}).get('name', 'Unknown source'),
+                'published_at': article.get('publishedAt', '')[:10] if article.get('publishedAt') else 'Unknown',
+                'url': article.get('url', '#'),
+                'keywords': [query]
+            }
+            
+            print(f"{Colors.GREEN}✅ Successfully fetched headline from {headline['source']}{Colors.END}")
+            return headline
+        else:
+            print(f"{Colors.YELLOW}⚠️ No results found for '{query}'. Using fallback data.{Colors.END}")
+            return get_fallback_headline()
             
-            if data['status'] == 'ok' and data['totalResults'] > 0:
-                article = data['articles'][0]
-                
-                # Extract and format the headline
-                headline = {
-                    'title': article.get('title', 'No title available'),
-                    'description': article.get('description', 'No description available'),
-                    'source': article.get('source', {}).get('name', 'Unknown source'),
-                    'published_at': article.get('publishedAt', '')[:10] if article.get('publishedAt') else 'Unknown',
-                    'url': article.get('url', '#'),
-                    'keywords': [query]
-                }
-                
-                print(f"{Colors.GREEN}✅ Successfully fetched headline from {headline['source']}{Colors.END}")
-                return headline
-            else:
-                print(f"{Colors.YELLOW}⚠️ No results found for '{query}'. Using fallback data.{Colors.END}")
-                return get_fallback_headline()
-                
     except urllib.error.HTTPError as e:
         print(f"{Colors.RED}❌ HTTP Error: {e.code} - {e.reason}{Colors.END}")
         if e.code == 401:
@@ -113,6 +139,82 @@ def fetch_live_headline_from_newsapi(query: str) -> Optional[Dict[str, Any]]:
         print(f"{Colors.RED}❌ Error fetching news: {e}{Colors.END}")
         return get_fallback_headline()
 
+def fetch_pli_news_coverage(companies: List[Dict[str, Any]],
+                            snapshot: Optional[Snapshot] = None,
+                            store: Optional[NewsStore] = None) -> List[Dict[str, Any]]:
+    """
+    Fetches recent articles for every company, sector and PLI keyword at once.
+    
+    Live runs are incremental: each query only asks for articles newer than
+    its cursor in the local news store, and articles already stored are dropped.
+    
+    Args:
+        companies: Company dictionaries (names and sectors become queries)
+        snapshot: Optional snapshot to record raw pages to, or replay them from
+        store: Local article store (defaults to settings.NEWS_DB_PATH; unused when replaying)
+    
+    Returns:
+        List of new raw NewsAPI articles, each tagged with the query that found it
+    """
+    replaying = snapshot is not None and snapshot.replaying
+    if not replaying and NEWS_API_KEY == "e1a3eb1a81d849449f2bff0d4f301fc7":
+        return []
+    
+    queries = build_news_queries(
+        companies=[c['name'] for c in companies],
+        sectors=list(dict.fromkeys(c['sector'] for c in companies if 'sector' in c)),
+    )
+    since = (datetime.now() - timedelta(days=7)).strftime('%Y-%m-%d')
+    
+    # Replays stay deterministic: no cursors, nothing persisted
+    own_store = store is None and not replaying
+    if own_store:
+        store = NewsStore()
+    
+    async def collect() -> List[Dict[str, Any]]:
+        async with AsyncNewsClient(NEWS_API_KEY, base_url=NEWS_API_URL, snapshot=snapshot) as client:
+            articles = []
+            stream = client.stream(queries, since=since) if store is None else store.sync(client, queries)
+            async for article in stream:
+                articles.append(article)
+            for query, error in client.errors.items():
+                print(f"{Colors.YELLOW}⚠️ News query '{query}' stopped early: {error}{Colors.END}")
+            return articles
+    
+    print(f"{Colors.BLUE}🔍 Fetching news coverage for {len(queries)} queries...{Colors.END}")
+    try:
+        articles = asyncio.run(collect())
+        print(f"{Colors.GREEN}✅ Collected {len(articles)} new articles across {len(queries)} queries{Colors.END}")
+        if store is not None:
+            print(f"{Colors.BLUE}   News store now holds {store.count()} articles ({store.path}){Colors.END}")
+    finally:
+        if own_store:
+            store.close()
+    return articles
+
+def attach_news_coverage(companies: List[Dict[str, Any]], articles: List[Dict[str, Any]]) -> Dict[str, int]:
+    """
+    Tags each company with the articles its own name query found.
+    
+    Sets ``news_articles`` (count) and ``latest_news`` (newest title, or None)
+    on every company dictionary.
+    
+    Returns:
+        ``{company name: article count}``
+    """
+    by_query: Dict[str, List[Dict[str, Any]]] = {}
+    for article in articles:
+        by_query.setdefault(article.get('query'), []).append(article)
+    
+    coverage = {}
+    for company in companies:
+        found = by_query.get(company['name'], [])
+        newest = max(found, key=lambda a: a.get('publishedAt') or '', default=None)
+        company['news_articles'] = len(found)
+        company['latest_news'] = newest.get('title') if newest else None
+        coverage[company['name']] = len(found)
+    return coverage
+
 def get_fallback_headline() -> Dict[str, Any]:
     """
     Returns a fallback headline when the API is unavailable.
@@ -525,20 +627,27 @@ def generate_quant_analyst_report(headline: Dict[str, Any], asymmetry_analysis:
 # MAIN FUNCTION
 # ============================================================================
 
-def main():
+def main(record: Optional[str] = None, replay: Optional[str] = None):
     """
     Main function to fetch news and generate Quant Macro Analyst report.
+    
+    Args:
+        record: Save the raw NewsAPI response to this snapshot file
+        replay: Serve the NewsAPI response from this snapshot file (no network)
     """
     print(f"{Colors.BOLD}{Colors.HEADER}🔍 PLI SCHEME QUANT MACRO ANALYZER{Colors.END}")
     print(f"{Colors.BOLD}{Colors.HEADER}{'='*70}{Colors.END}\n")
     
+    snapshot = open_snapshot(record=record, replay=replay)
+    
     # Check for API key
-    if NEWS_API_KEY == "e1a3eb1a81d849449f2bff0d4f301fc7":
+    replaying = snapshot is not None and snapshot.replaying
+    if not replaying and NEWS_API_KEY == "e1a3eb1a81d849449f2bff0d4f301fc7":
         print(f"{Colors.YELLOW}⚠️  NewsAPI key not configured. Using fallback headline data.{Colors.END}")
         print(f"{Colors.YELLOW}   To use live news, replace 'e1a3eb1a81d849449f2bff0d4f301fc7' with your actual key.{Colors.END}\n")
     
     # Fetch the latest PLI scheme headline
-    headline = fetch_live_headline_from_newsapi("PLI Scheme OR iPhone exports India")
+    headline = fetch_live_headline_from_newsapi("PLI Scheme OR iPhone exports India", snapshot=snapshot)
     
     if not headline:
         print(f"{Colors.RED}Failed to fetch headline. Exiting.{Colors.END}")
@@ -549,6 +658,18 @@ def main():
     companies = get_pli_supplier_companies()
     print(f"{Colors.GREEN}✅ Found {len(companies)} relevant supplier companies{Colors.END}\n")
     
+    # Broader coverage: every company, sector and PLI keyword in one fan-out
+    articles = fetch_pli_news_coverage(companies, snapshot=snapshot)
+    attach_news_coverage(companies, articles)
+    for company in companies:
+        latest = f" — latest: {company['latest_news']}" if company['latest_news'] else ""
+        print(f"{Colors.BLUE}   📰 {company['name']}: {company['news_articles']} new articles{latest}{Colors.END}")
+    print()
+    
+    if snapshot is not None and not snapshot.replaying:
+        saved = snapshot.save()
+        print(f"{Colors.BLUE}💾 Recorded {len(snapshot)} NewsAPI responses to {saved}{Colors.END}")
+    
     # Analyze information asymmetry
     asymmetry_analysis = analyze_information_asymmetry(companies, headline)
     
@@ -578,6 +699,14 @@ def test_without_api_key():
     print(report)
 
 if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="PLI Scheme Quant Macro Analyzer")
+    snapshot_group = parser.add_mutually_exclusive_group()
+    snapshot_group.add_argument('--record', metavar='PATH', help="Record the raw NewsAPI response to a snapshot file")
+    snapshot_group.add_argument('--replay', metavar='PATH', help="Replay the NewsAPI response from a snapshot file")
+    args = parser.parse_args()
+    
     # Uncomment the appropriate line:
-    main()  # Use this for live API (requires API key)
+    main(record=args.record, replay=args.replay)  # Use this for live API (requires API key)
     # test_without_api_key()  # Use this for testing without API key 
\ No newline at end of file
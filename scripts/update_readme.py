@@ -2,9 +2,13 @@
 """
 Auto-update README with latest analysis results
 Run this after each analysis to keep README current
+
+Rendering only reads the run store and the track record. Live prices are
+opt-in (``--mark``), and pick statuses are owned by ``backtest.py --write``.
 """
 
 import json
+import math
 import sys
 from pathlib import Path
 from datetime import datetime
@@ -13,23 +17,23 @@ import re
 # Add src to path
 sys.path.append(str(Path(__file__).parent.parent / "src"))
 
+from mark_to_market import mark_track_record
+from run_store import RunStore
+from track_record import TrackRecord
+
 class ReadmeUpdater:
     def __init__(self):
         self.readme_path = Path(__file__).parent.parent / "README.md"
-        self.reports_dir = Path(__file__).parent.parent / "reports"
-        self.reports_dir.mkdir(exist_ok=True)
-        self.track_record = []
+        self.track_record = TrackRecord()
+        self.marks = {}
         
     def load_latest_analysis(self):
-        """Find and load the most recent analysis report"""
-        report_files = list(self.reports_dir.glob("analysis_*.json"))
-        if not report_files:
-            print("No analysis reports found")
-            return None
-        
-        latest_report = max(report_files, key=lambda p: p.stat().st_mtime)
-        with open(latest_report, 'r') as f:
-            return json.load(f)
+        """Load the most recent run from the run store"""
+        with RunStore() as store:
+            analysis = store.latest_run()
+        if not analysis:
+            print("No analysis runs found")
+        return analysis
     
     def update_track_record(self, analysis):
         """Update track record with new analysis"""
@@ -46,41 +50,52 @@ class ReadmeUpdater:
             'status': 'Active'
         }
         
-        # Load existing track record
-        track_file = Path(__file__).parent.parent / "data" / "track_record.json"
-        if track_file.exists():
-            with open(track_file, 'r') as f:
-                self.track_record = json.load(f)
-        
-        # Add new entry (avoid duplicates)
-        if not any(e['date'] == new_entry['date'] for e in self.track_record):
+        # Append new entry (one pick per date)
+        if not self.track_record.has_date(new_entry['date']):
             self.track_record.append(new_entry)
-        
-        # Save updated track record
-        with open(track_file, 'w') as f:
-            json.dump(self.track_record, f, indent=2)
+    
+    def mark_to_market(self):
+        """Mark every pick to market in one batched price call (for the Current/P&L columns)"""
+        try:
+            marked = mark_track_record(self.track_record)
+        except Exception as e:
+            print(f"⚠️ Mark-to-market skipped: {e}")
+            return
+        self.marks = {(row.date, row.symbol): row for row in marked.itertuples()}
     
     def generate_track_record_table(self):
         """Generate markdown table from track record"""
         if not self.track_record:
             return "No track record yet. Run analysis first!"
         
-        table = "| Date | Pick | Entry | Target | Status |\n"
-        table += "|------|------|-------|--------|--------|\n"
+        table = "| Date | Pick | Entry | Target | Current | P&L | To Target | Status |\n"
+        table += "|------|------|-------|--------|---------|-----|-----------|--------|\n"
         
-        for entry in self.track_record[-10:]:  # Last 10 entries
-            table += f"| {entry['date']} | {entry['symbol']} | ₹{entry['price']:.0f} | ₹{entry['target']:.0f} | {entry['status']} |\n"
+        for entry in self.track_record.tail(10):  # Last 10 entries
+            mark = self.marks.get((entry['date'], entry['symbol']))
+            if mark is not None and not math.isnan(mark.current_price):
+                current = f"₹{mark.current_price:.0f} | {mark.unrealized_pnl_pct:+.1f}% | {mark.to_target_pct:+.1f}%"
+            else:
+                current = "— | — | —"
+            table += f"| {entry['date']} | {entry['symbol']} | ₹{entry['price']:.0f} | ₹{entry['target']:.0f} | {current} | {entry['status']} |\n"
         
         return table
     
-    def update_readme(self):
-        """Update README with latest data"""
+    def update_readme(self, analysis=None, mark=False):
+        """
+        Update README with latest data (the latest stored run unless ``analysis`` is given)
+        
+        Only ``mark`` fetches prices; without it the Current/P&L columns show dashes.
+        """
         print(f"📝 Updating README at {self.readme_path}")
         
         # Load latest analysis
-        analysis = self.load_latest_analysis()
+        if analysis is None:
+            analysis = self.load_latest_analysis()
         if analysis:
             self.update_track_record(analysis)
+        if mark:
+            self.mark_to_market()
         
         # Read current README
         with open(self.readme_path, 'r') as f:
@@ -132,5 +147,11 @@ class ReadmeUpdater:
         print(self.generate_track_record_table())
 
 if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Update the README from the latest stored run")
+    parser.add_argument('--mark', action='store_true', help="Fill the Current/P&L columns with live prices")
+    args = parser.parse_args()
+    
     updater = ReadmeUpdater()
-    updater.update_readme()
+    updater.update_readme(mark=args.mark)
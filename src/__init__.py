@@ -1 +1 @@
-"""PLI Alpha Generator - Quant Analysis System"""
\ No newline at end of file
+"""PLI Alpha Generator - Quant Analysis System"""
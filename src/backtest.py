@@ -0,0 +1,324 @@
+"""
+Backtest of every historical pick.
+
+Picks come from the top pick of every stored run (see run_store.py) and
+the track record (see track_record.py). The price paths that followed are read from
+the local price store (see price_store.py), then target hits, stop hits and time in trade are
+evaluated for all picks at once on a ``(pick, trading day)`` matrix.
+
+A pick enters at its reported price at the close of its pick date. The target
+is the 52-week high at the time. The stop is ``STOP_LOSS_PERCENTAGE`` below
+the 52-week low, or below the entry when the low is unknown. When target and
+stop are both touched on the same bar, the pick counts as stopped out.
+"""
+
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config import settings
+from price_history import price_field
+from price_store import PriceStore, load_history
+from providers import MarketDataProvider, call_provider, get_default_provider
+from run_store import RunStore
+from track_record import TrackRecord
+from universe import nse_symbol
+
+STATUS_TARGET = 'Target Hit'
+STATUS_STOPPED = 'Stopped Out'
+STATUS_ACTIVE = 'Active'
+STATUS_NO_DATA = 'No Data'
+
+
+def load_picks(runs_db: Optional[Path] = None, track_file: Optional[Path] = None) -> pd.DataFrame:
+    """
+    Every historical top pick, one row per (date, symbol).
+
+    Stored runs carry the 52-week low, so they win over the track record for
+    the same pick; with several runs on one day the latest run counts.
+    """
+    rows: List[Dict[str, Any]] = []
+    with RunStore(runs_db) as store:
+        for top in reversed(list(store.top_picks())):
+            rows.append(
+                {
+                    'date': top['timestamp'][:10],
+                    'symbol': top['symbol'],
+                    'name': top['name'],
+                    'entry': top['price'],
+                    'target': top['fifty_two_week_high'],
+                    'low': top['fifty_two_week_low'],
+                }
+            )
+    for entry in TrackRecord(track_file):
+        rows.append(
+            {
+                'date': entry['date'],
+                'symbol': entry['symbol'],
+                'name': entry.get('company'),
+                'entry': entry.get('price'),
+                'target': entry.get('target'),
+                'low': None,
+            }
+        )
+
+    columns = ['date', 'symbol', 'name', 'entry', 'target', 'low']
+    if not rows:
+        return pd.DataFrame(columns=columns + ['stop'])
+    # first() takes the first non-null value per column, so report fields fill track-record gaps
+    picks = pd.DataFrame(rows, columns=columns).groupby(['date', 'symbol'], sort=True).first().reset_index()
+    for column in ('entry', 'target', 'low'):
+        picks[column] = picks[column].astype(float)
+    picks['stop'] = picks['low'].fillna(picks['entry']) * settings.STOP_LOSS_PERCENTAGE
+    return picks
+
+
+def fetch_pick_history(
+    picks: pd.DataFrame,
+    provider: Optional[MarketDataProvider] = None,
+    snapshot=None,
+    store: Optional[PriceStore] = None,
+) -> pd.DataFrame:
+    """
+    OHLCV for every pick from its entry date onwards.
+
+    Served from the price store, which downloads only bars it doesn't have.
+    Snapshot runs make one bulk download instead, so record/replay stays
+    deterministic.
+    """
+    provider = provider or get_default_provider()
+    symbols = sorted({nse_symbol(s) for s in picks['symbol']})
+    start = picks['date'].min() if len(picks) else None
+
+    def download() -> pd.DataFrame:
+        return call_provider(provider, lambda p: p.history(symbols, period=None, start=start))
+
+    if snapshot is None:
+        return load_history(symbols, provider, store=store, start=start)[0]
+    return snapshot.fetch(('market', 'history', tuple(symbols), 'since', start), download)
+
+
+def simulate_trades(
+    start: np.ndarray,
+    target: np.ndarray,
+    stop: np.ndarray,
+    close_paths: np.ndarray,
+    high_paths: np.ndarray,
+    low_paths: np.ndarray,
+    end: Optional[np.ndarray] = None,
+) -> Dict[str, np.ndarray]:
+    """
+    Target/stop exits for many trades at once.
+
+    Each trade is a row of the ``(trade, day)`` price paths, live on bars
+    ``start <= day < end`` where it has a close. Returns per-trade arrays:
+    ``traded``, ``stopped``, ``hit``, ``exit_bar``, ``exit_price`` (target,
+    stop, or the last close for open trades), ``trough`` (lowest price held)
+    and ``days`` (bars held).
+    """
+    n, t = close_paths.shape
+    days = np.arange(t)
+    in_trade = (days >= start[:, None]) & ~np.isnan(close_paths)
+    if end is not None:
+        in_trade &= days < end[:, None]
+    with np.errstate(invalid='ignore'):
+        target_bars = in_trade & (high_paths >= target[:, None])
+        stop_bars = in_trade & (low_paths <= stop[:, None])
+
+    first_target = np.where(target_bars.any(axis=1), target_bars.argmax(axis=1), t)
+    first_stop = np.where(stop_bars.any(axis=1), stop_bars.argmax(axis=1), t)
+    stopped = (first_stop < t) & (first_stop <= first_target)
+    hit = (first_target < t) & ~stopped
+    traded = in_trade.any(axis=1)
+
+    last_bar = t - 1 - in_trade[:, ::-1].argmax(axis=1)
+    exit_bar = np.where(stopped, first_stop, np.where(hit, first_target, last_bar))
+    last_close = close_paths[np.arange(n), exit_bar]
+    exit_price = np.where(stopped, stop, np.where(hit, target, last_close))
+
+    window = in_trade & (days <= exit_bar[:, None])
+    # A closed trade is out at its exit price, not the rest of that bar's range
+    held = window & ~((stopped | hit)[:, None] & (days == exit_bar[:, None]))
+    trough = np.where(held & ~np.isnan(low_paths), low_paths, np.inf).min(axis=1)
+    trough = np.minimum(trough, exit_price)
+
+    return {
+        'traded': traded,
+        'stopped': stopped,
+        'hit': hit,
+        'exit_bar': exit_bar,
+        'exit_price': exit_price,
+        'trough': trough,
+        'days': window.sum(axis=1),
+    }
+
+
+def evaluate_picks(picks: pd.DataFrame, history: pd.DataFrame) -> pd.DataFrame:
+    """
+    Outcome of every pick, computed as whole-matrix operations.
+
+    Adds ``status``, ``exit_date``, ``exit_price``, ``return_pct``,
+    ``max_drawdown_pct`` and ``days_in_trade`` (trading days) columns.
+    """
+    results = picks.copy()
+    n = len(picks)
+    if n == 0 or history.empty:
+        for column in ('exit_date', 'exit_price', 'return_pct', 'max_drawdown_pct', 'days_in_trade'):
+            results[column] = np.nan
+        results['status'] = STATUS_NO_DATA
+        return results
+
+    close = price_field(history, 'Close')
+    dates = history.index.to_numpy(dtype='datetime64[ns]')
+    columns = close.columns.get_indexer([nse_symbol(s) for s in picks['symbol']])
+    has_column = columns >= 0
+    take = np.where(has_column, columns, 0)
+
+    # (pick, day) price paths
+    close_paths = close.to_numpy(dtype=float).T[take]
+    high_paths = price_field(history, 'High').to_numpy(dtype=float).T[take]
+    low_paths = price_field(history, 'Low').to_numpy(dtype=float).T[take]
+
+    entry = results['entry'].to_numpy(dtype=float)
+    start = np.searchsorted(dates, pd.to_datetime(results['date']).to_numpy(dtype='datetime64[ns]'), side='right')
+    close_paths[~has_column] = np.nan
+
+    trades = simulate_trades(
+        start,
+        results['target'].to_numpy(dtype=float),
+        results['stop'].to_numpy(dtype=float),
+        close_paths,
+        high_paths,
+        low_paths,
+    )
+    traded, stopped, hit = trades['traded'], trades['stopped'], trades['hit']
+    exit_price = trades['exit_price']
+
+    results['status'] = np.select(
+        [~traded, stopped, hit], [STATUS_NO_DATA, STATUS_STOPPED, STATUS_TARGET], STATUS_ACTIVE
+    )
+    results['exit_date'] = np.where(traded, pd.DatetimeIndex(dates[trades['exit_bar']]).strftime('%Y-%m-%d'), None)
+    results['exit_price'] = np.where(traded, exit_price, np.nan)
+    results['return_pct'] = np.where(traded, (exit_price / entry - 1) * 100, np.nan)
+    results['max_drawdown_pct'] = np.where(traded, (trades['trough'] / entry - 1) * 100, np.nan)
+    results['days_in_trade'] = np.where(traded, trades['days'], np.nan)
+    return results
+
+
+def summarize(results: pd.DataFrame) -> Dict[str, Any]:
+    """
+    Hit rate and return/drawdown distributions, overall and per symbol.
+
+    Hit rate counts target hits over closed picks; open picks are marked to
+    their last close for the return distribution.
+    """
+    traded = results[results['status'] != STATUS_NO_DATA]
+    closed = traded['status'].isin([STATUS_TARGET, STATUS_STOPPED])
+    target_hit = traded['status'] == STATUS_TARGET
+
+    per_symbol = (
+        pd.DataFrame(
+            {
+                'symbol': traded['symbol'],
+                'closed': closed,
+                'hit': target_hit,
+                'win': traded['return_pct'] > 0,
+                'return_pct': traded['return_pct'],
+                'max_drawdown_pct': traded['max_drawdown_pct'],
+                'days_in_trade': traded['days_in_trade'],
+            }
+        )
+        .groupby('symbol')
+        .agg(
+            picks=('return_pct', 'size'),
+            closed=('closed', 'sum'),
+            targets_hit=('hit', 'sum'),
+            win_rate=('win', 'mean'),
+            mean_return_pct=('return_pct', 'mean'),
+            median_return_pct=('return_pct', 'median'),
+            worst_drawdown_pct=('max_drawdown_pct', 'min'),
+            avg_days_in_trade=('days_in_trade', 'mean'),
+        )
+    )
+    per_symbol['hit_rate'] = per_symbol['targets_hit'] / per_symbol['closed'].where(per_symbol['closed'] > 0)
+
+    quantiles = [0.05, 0.25, 0.5, 0.75, 0.95]
+    return {
+        'picks': int(len(results)),
+        'evaluated': int(len(traded)),
+        'closed': int(closed.sum()),
+        'hit_rate': float(target_hit.sum() / closed.sum()) if closed.any() else None,
+        'win_rate': float((traded['return_pct'] > 0).mean()) if len(traded) else None,
+        'status_counts': results['status'].value_counts().to_dict(),
+        'return_pct': traded['return_pct'].quantile(quantiles).round(2).to_dict() if len(traded) else {},
+        'max_drawdown_pct': traded['max_drawdown_pct'].quantile(quantiles).round(2).to_dict() if len(traded) else {},
+        'per_symbol': per_symbol,
+    }
+
+
+def update_track_record(results: pd.DataFrame, track_file: Optional[Path] = None) -> int:
+    """Record backtested statuses in the track record; returns entries changed"""
+    track_record = TrackRecord(track_file)
+    return sum(
+        track_record.set_status(r.date, r.symbol, r.status) for r in results.itertuples() if r.status != STATUS_NO_DATA
+    )
+
+
+def run_backtest(
+    provider: Optional[MarketDataProvider] = None,
+    snapshot=None,
+    runs_db: Optional[Path] = None,
+    track_file: Optional[Path] = None,
+    store: Optional[PriceStore] = None,
+) -> pd.DataFrame:
+    """Load picks, fetch their price paths once and evaluate them"""
+    picks = load_picks(runs_db, track_file)
+    if picks.empty:
+        return evaluate_picks(picks, pd.DataFrame())
+    return evaluate_picks(picks, fetch_pick_history(picks, provider, snapshot, store))
+
+
+def main(
+    record: Optional[str] = None, replay: Optional[str] = None, data_dir: Optional[str] = None, write: bool = False
+):
+    from snapshot import open_snapshot
+
+    snapshot = open_snapshot(record, replay)
+    provider = get_default_provider(Path(data_dir) if data_dir else None)
+    results = run_backtest(provider, snapshot)
+    if snapshot is not None and not snapshot.replaying:
+        snapshot.save()
+
+    summary = summarize(results)
+    print(f"📊 Backtest: {summary['evaluated']}/{summary['picks']} picks evaluated, {summary['closed']} closed")
+    if summary['hit_rate'] is not None:
+        print(f"   Hit rate: {summary['hit_rate']:.0%}")
+    if summary['win_rate'] is not None:
+        print(f"   Win rate: {summary['win_rate']:.0%}")
+    print(f"   Statuses: {summary['status_counts']}")
+    print(f"   Return % quantiles: {summary['return_pct']}")
+    print(f"   Max drawdown % quantiles: {summary['max_drawdown_pct']}")
+    if len(summary['per_symbol']):
+        print(summary['per_symbol'].round(2).to_string())
+
+    if write:
+        print(f"✅ Updated {update_track_record(results)} track record entries")
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Backtest every historical pick")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--record', metavar='FILE', help="Record the price history to a snapshot file")
+    mode.add_argument('--replay', metavar='FILE', help="Replay price history from a snapshot file")
+    parser.add_argument('--data-dir', metavar='DIR', help="Local market data dumps")
+    parser.add_argument('--write', action='store_true', help="Record statuses in the track record")
+    args = parser.parse_args()
+    main(record=args.record, replay=args.replay, data_dir=args.data_dir, write=args.write)
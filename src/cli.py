@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Single entry point for every PLI Alpha Generator tool.
+
+Commands import their modules only when they run, so the cheap paths start
+in tens of milliseconds:
+
+- ``report`` re-renders a stored run from the run store. It never loads
+  pandas, numpy or the network stack.
+- ``rescore`` re-scores and re-renders a recorded snapshot offline. It loads
+  pandas to read the snapshot but never yfinance.
+
+The other commands run the existing scripts with the remaining arguments,
+e.g. ``python src/cli.py backtest --write``.
+"""
+
+import runpy
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+SRC_DIR = Path(__file__).parent
+sys.path.append(str(SRC_DIR.parent))
+
+SCRIPTS = {
+    'analyze': ('dynamic_pli_analyzer', "Full analysis: discovery, scoring, report, run store"),
+    'pipeline': ('pipeline', "Staged run (fetch, enrich, score, render, publish) with cached artifacts"),
+    'backtest': ('backtest', "Backtest every past pick"),
+    'mark': ('mark_to_market', "Mark the track record to market"),
+    'sweep': ('param_sweep', "Parallel sweep of rule weights and trigger percentages"),
+    'watch': ('watch', "Poll quotes and alert on buy/target/stop crossings"),
+    'runs': ('run_store', "Run store summary and legacy report import"),
+    'track': ('track_record', "Track record tail and legacy migration"),
+}
+
+# Modules the fast paths must never import (checked by tests/test_cli.py)
+NETWORK_MODULES = ('yfinance', 'requests', 'urllib.request', 'aiohttp')
+HEAVY_MODULES = ('pandas', 'numpy') + NETWORK_MODULES
+
+
+def stored_companies(run: Dict[str, Any], insights: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Company dicts for the renderer from a stored run, with the expert risk overlay"""
+    companies = []
+    for row in run['all_companies']:
+        company = {
+            'symbol': row['symbol'],
+            'name': row['name'],
+            'current_price': row['price'],
+            'asymmetry_score': row['score'],
+            'fifty_two_week_low': row.get('fifty_two_week_low'),
+            'fifty_two_week_high': row.get('fifty_two_week_high'),
+        }
+        if row.get('risk_flags'):
+            company['risk_flags'] = row['risk_flags']
+        if row['symbol'] in insights['hidden_risks']:
+            company['hidden_risks'] = insights['hidden_risks'][row['symbol']]
+        companies.append(company)
+    if companies and run.get('top_company'):
+        companies[0].update(run['top_company'])
+    return companies
+
+
+def report_from_store(
+    run_id: Optional[int] = None,
+    fmt: Optional[str] = None,
+    output: Optional[str] = None,
+    runs_db: Optional[Path] = None,
+) -> bool:
+    """Re-render a stored run (the latest by default); returns False when there is none"""
+    from dynamic_pli_analyzer import EXPERT_INSIGHTS, calculate_buy_trigger
+    from report_renderer import default_format, format_for_path, render_report
+    from run_store import RunStore
+
+    with RunStore(runs_db) as store:
+        run = store.get_run(run_id) if run_id else store.latest_run()
+    if not run:
+        print("No stored runs")
+        return False
+
+    companies = stored_companies(run, EXPERT_INSIGHTS)
+    top = companies[0] if companies else None
+    asymmetry = {'top_company': top, 'all_companies': companies}
+    levels = calculate_buy_trigger(top) if top and top.get('fifty_two_week_low') else None
+    timestamp = datetime.fromisoformat(run['timestamp'])
+
+    if output:
+        with open(output, 'w', encoding='utf-8') as f:
+            render_report(
+                companies,
+                asymmetry,
+                EXPERT_INSIGHTS,
+                out=f,
+                fmt=fmt or format_for_path(output),
+                levels=levels,
+                timestamp=timestamp,
+            )
+        print(f"📄 Run {run['run_id']} written to {output}")
+    else:
+        render_report(
+            companies,
+            asymmetry,
+            EXPERT_INSIGHTS,
+            out=sys.stdout,
+            fmt=fmt or default_format(sys.stdout),
+            levels=levels,
+            timestamp=timestamp,
+        )
+    return True
+
+
+def run_script(module: str, argv: List[str]):
+    """Run a script's ``__main__`` block with ``argv`` as its arguments"""
+    sys.argv = [str(SRC_DIR / f"{module}.py"), *argv]
+    runpy.run_path(sys.argv[0], run_name='__main__')
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import argparse
+
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] in SCRIPTS:
+        run_script(SCRIPTS[argv[0]][0], argv[1:])
+        return 0
+
+    parser = argparse.ArgumentParser(description="PLI Alpha Generator (script commands pass their arguments through)")
+    commands = parser.add_subparsers(dest='command', metavar='command')
+    formats = ['ansi', 'plain', 'markdown', 'html']
+
+    report = commands.add_parser('report', help="Re-render a stored run (no pandas, no network)")
+    report.add_argument('--run', type=int, metavar='ID', help="Run id (default: latest)")
+    report.add_argument('--format', choices=formats)
+    report.add_argument('--output', metavar='FILE', help="Write to FILE (.md/.html/.txt) instead of stdout")
+    report.add_argument('--runs-db', metavar='PATH', help="Run store (default: settings.RUNS_DB_PATH)")
+
+    rescore = commands.add_parser('rescore', help="Re-score and re-render a recorded snapshot offline")
+    rescore.add_argument('--replay', metavar='PATH', required=True, help="Snapshot recorded with --record")
+    rescore.add_argument('--universe', metavar='FILE', help="Symbol list the snapshot was recorded with")
+    rescore.add_argument('--format', choices=formats)
+    rescore.add_argument('--output', metavar='FILE', help="Also write the report to FILE")
+    rescore.add_argument('--save', action='store_true', help="Append the re-scored run to the run store")
+
+    for name, (_, help_text) in SCRIPTS.items():
+        commands.add_parser(name, help=help_text, add_help=False)
+
+    args = parser.parse_args(argv)
+    if args.command == 'report':
+        ok = report_from_store(args.run, args.format, args.output, Path(args.runs_db) if args.runs_db else None)
+        return 0 if ok else 1
+    if args.command == 'rescore':
+        from dynamic_pli_analyzer import main as analyze
+
+        analyze(
+            replay=args.replay,
+            universe_file=args.universe,
+            report_format=args.format,
+            report_file=args.output,
+            save=args.save,
+        )
+        return 0
+    parser.print_help()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
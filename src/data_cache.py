@@ -0,0 +1,163 @@
+"""
+Persistent on-disk cache for provider responses.
+
+Entries are keyed by symbol and data kind (``info``, ``balance_sheet``, ...)
+and each kind has its own TTL: quotes go stale in minutes while holder tables
+and balance sheets only change weekly or quarterly. The cache directory is
+size bounded; least recently used entries are evicted first.
+"""
+
+import os
+import pickle
+import re
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config import settings
+
+# Returned by DataCache.get() when there is no usable entry
+MISSING = object()
+
+
+class DataCache:
+    """Thread-safe pickle cache under ``config.settings.CACHE_DIR``"""
+
+    def __init__(
+        self, root: Optional[Path] = None, ttls: Optional[Dict[str, float]] = None, max_bytes: Optional[int] = None
+    ):
+        self.root = Path(root or settings.CACHE_DIR)
+        self.ttls = dict(settings.CACHE_TTLS if ttls is None else ttls)
+        self.max_bytes = settings.CACHE_MAX_BYTES if max_bytes is None else max_bytes
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'expired': 0,
+            'writes': 0,
+            'evictions': 0,
+            'bytes_read': 0,
+            'bytes_written': 0,
+        }
+        self._lock = threading.Lock()
+        self._sizes: Optional[Dict[Path, int]] = None
+
+    def _path(self, symbol: str, kind: str) -> Path:
+        safe = re.sub(r'[^A-Za-z0-9._-]', '_', symbol)
+        return self.root / kind / f"{safe}.pkl"
+
+    def _count(self, key: str, amount: int = 1):
+        with self._lock:
+            self.stats[key] += amount
+
+    def get(self, symbol: str, kind: str) -> Any:
+        """Return the cached value, or MISSING if absent or past its TTL"""
+        ttl = self.ttls.get(kind)
+        path = self._path(symbol, kind)
+        if not ttl or not path.exists():
+            self._count('misses')
+            return MISSING
+
+        try:
+            raw = path.read_bytes()
+            stored_at, value = pickle.loads(raw)
+        except Exception:
+            self._count('misses')
+            return MISSING
+
+        if time.time() - stored_at > ttl:
+            self._count('expired')
+            self._count('misses')
+            return MISSING
+
+        # Touch for LRU ordering; freshness lives inside the payload
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self._count('hits')
+        self._count('bytes_read', len(raw))
+        return value
+
+    def set(self, symbol: str, kind: str, value: Any):
+        """Store a value; kinds without a TTL are never cached"""
+        if not self.ttls.get(kind):
+            return
+
+        path = self._path(symbol, kind)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        raw = pickle.dumps((time.time(), value), protocol=pickle.HIGHEST_PROTOCOL)
+
+        # Write-then-rename so concurrent readers never see a partial file
+        tmp = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(raw)
+        os.replace(tmp, path)
+
+        with self._lock:
+            self.stats['writes'] += 1
+            self.stats['bytes_written'] += len(raw)
+            sizes = self._load_sizes()
+            sizes[path] = len(raw)
+            if sum(sizes.values()) > self.max_bytes:
+                self._evict(sizes)
+
+    def get_or_fetch(self, symbol: str, kind: str, fetch: Callable[[], Any]) -> Any:
+        """Serve from cache, falling back to ``fetch()`` and storing its result"""
+        value = self.get(symbol, kind)
+        if value is MISSING:
+            value = fetch()
+            self.set(symbol, kind, value)
+        return value
+
+    def _load_sizes(self) -> Dict[Path, int]:
+        if self._sizes is None:
+            self._sizes = {p: p.stat().st_size for p in self.root.glob('*/*.pkl')}
+        return self._sizes
+
+    def _evict(self, sizes: Dict[Path, int]):
+        """Drop least recently used entries until under 90% of max_bytes"""
+        target = self.max_bytes * 0.9
+        total = sum(sizes.values())
+
+        def last_used(path: Path) -> float:
+            try:
+                return path.stat().st_mtime
+            except OSError:
+                return 0.0
+
+        for path in sorted(sizes, key=last_used):
+            if total <= target:
+                break
+            total -= sizes.pop(path)
+            try:
+                path.unlink()
+            except OSError:
+                pass
+            self.stats['evictions'] += 1
+
+    def clear(self):
+        """Remove every cached entry"""
+        with self._lock:
+            for path in self._load_sizes():
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+            self._sizes = {}
+
+    def hit_rate(self) -> float:
+        lookups = self.stats['hits'] + self.stats['misses']
+        return self.stats['hits'] / lookups if lookups else 0.0
+
+    def summary(self) -> str:
+        """One-line stats for run logs"""
+        return (
+            f"{self.stats['hits']} hits, {self.stats['misses']} misses "
+            f"({self.hit_rate():.0%} hit rate), "
+            f"{self.stats['bytes_read'] / 1024:.1f} KB read, "
+            f"{self.stats['bytes_written'] / 1024:.1f} KB written, "
+            f"{self.stats['evictions']} evicted"
+        )
@@ -4,15 +4,34 @@ PROFESSIONAL PLI ALPHA GENERATOR v2.0
 Now with Expert-Validated Risk Factors & Institutional Stealth Tracking
 """
 
-import json
-import urllib.request
-import urllib.parse
-from datetime import datetime, timedelta
-from typing import Optional, Dict, Any, List
+from __future__ import annotations
+
+import io
+from datetime import datetime
+from typing import TYPE_CHECKING, Optional, Dict, Any, List
 import sys
-import yfinance as yf
 from pathlib import Path
 
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config import settings
+from data_cache import DataCache
+from metrics import shared_metrics
+from rate_limit import TokenBucket
+from report_renderer import default_format, format_for_path, render_report
+from run_store import RunStore
+from snapshot import Snapshot, open_snapshot
+from universe import ScanProgress, build_universe, sector_map
+
+# pandas/numpy (and yfinance behind the providers) are imported by the stages
+# that use them, so re-rendering and tests that only need the insights or the
+# scoring entry point start fast
+if TYPE_CHECKING:
+    import pandas as pd
+    from price_store import PriceStore
+    from providers import MarketDataProvider
+
+
 # ANSI color codes
 class Colors:
     HEADER = '\033[95m'
@@ -25,6 +44,7 @@ class Colors:
     BOLD = '\033[1m'
     END = '\033[0m'
 
+
 # ============================================================
 # CONFIGURATION
 # ============================================================
@@ -42,359 +62,545 @@ EXPERT_INSIGHTS = {
             'reason': 'IT Hardware division scaling from ₹1,500 Cr to ₹4,000 Cr+',
             'catalyst': 'Display and camera module JVs for backward integration',
             'warning': 'Mobile PLI allocation slashed from ₹9,000 Cr to ₹1,527 Cr',
-            'geopolitical_risk': '49% Chinese ownership in Kunshan Q Tech JV - vulnerable to Press Note 3'
+            'geopolitical_risk': '49% Chinese ownership in Kunshan Q Tech JV - vulnerable to Press Note 3',
         },
         'SYRMA': {
             'reason': 'Golden Trio: Telecom (5G/6G), Med-Tech, Automotive',
             'catalyst': '₹40,000 Cr component PLI boost, 45% sales growth',
             'warning': 'Debt-to-Equity 0.35 vs industry avg 0.12 - capital intensive',
-            'stealth': 'MF holdings jumped 4% → 10% in one year'
+            'stealth': 'MF holdings jumped 4% → 10% in one year',
         },
         'AMBER': {
             'reason': 'Pivoted from AC assembler to EMS powerhouse',
             'catalyst': 'PCB/PCBA manufacturing targeting $1B revenue',
             'warning': 'P/E 166 - extremely high expectations priced in',
-            'risk': 'Highly sensitive to quarterly misses'
-        }
+            'risk': 'Highly sensitive to quarterly misses',
+        },
     },
     'stealth_ranking': {
-        1: {'symbol': 'SYRMA', 'name': 'Syrma SGS', 'score': 'High Alpha', 
-            'detail': 'MF holdings 4%→10%, retail cautious'},
-        2: {'symbol': 'TCIEXP', 'name': 'TCI Express', 'score': 'Quiet Accumulation',
-            'detail': 'B2B logistics proxy, under-the-radar buying'},
-        3: {'symbol': 'BLUEDART', 'name': 'Blue Dart', 'score': 'Moderate',
-            'detail': 'Stealth phase ending, hitting social media'},
-        4: {'symbol': 'DIXON', 'name': 'Dixon Tech', 'score': 'Crowded/Testing',
-            'detail': '27% price drop but consensus long, institutions trimming'},
-        5: {'symbol': 'AMBER', 'name': 'Amber Ent', 'score': 'High Hype',
-            'detail': 'P/E 166, retail/momentum priced in 3 years'}
+        1: {
+            'symbol': 'SYRMA',
+            'name': 'Syrma SGS',
+            'score': 'High Alpha',
+            'detail': 'MF holdings 4%→10%, retail cautious',
+        },
+        2: {
+            'symbol': 'TCIEXP',
+            'name': 'TCI Express',
+            'score': 'Quiet Accumulation',
+            'detail': 'B2B logistics proxy, under-the-radar buying',
+        },
+        3: {
+            'symbol': 'BLUEDART',
+            'name': 'Blue Dart',
+            'score': 'Moderate',
+            'detail': 'Stealth phase ending, hitting social media',
+        },
+        4: {
+            'symbol': 'DIXON',
+            'name': 'Dixon Tech',
+            'score': 'Crowded/Testing',
+            'detail': '27% price drop but consensus long, institutions trimming',
+        },
+        5: {
+            'symbol': 'AMBER',
+            'name': 'Amber Ent',
+            'score': 'High Hype',
+            'detail': 'P/E 166, retail/momentum priced in 3 years',
+        },
     },
     'hidden_risks': {
         'DIXON': ['PLI allocation cut 9,000→1,527 Cr', '49% Chinese JV ownership'],
         'SYRMA': ['Debt-to-Equity 3x industry avg', 'High capital intensity'],
-        'AMBER': ['P/E 166 extremely stretched', 'Momentum crowded']
+        'AMBER': ['P/E 166 extremely stretched', 'Momentum crowded'],
     },
     'industry_metrics': {
         'avg_debt_equity': 0.12,
         'component_pli_size': 40000,  # ₹40,000 Cr
         'dixon_it_hardware_target': 4000,  # ₹4,000 Cr
-        'amber_pcb_target': 1e9  # $1B
-    }
+        'amber_pcb_target': 1e9,  # $1B
+    },
 }
 
 # ============================================================
 # ENHANCED COMPANY DISCOVERY WITH EXPERT VALIDATION
 # ============================================================
 
-def discover_companies_with_expert_insights() -> List[Dict[str, Any]]:
-    """Fetch live data and overlay expert insights"""
-    
-    # Core companies from expert analysis
-    target_symbols = ['DIXON.NS', 'SYRMA.NS', 'AMBER.NS', 'TCIEXP.NS', 'BLUEDART.NS']
+
+def fetch_price_history(
+    symbols: List[str],
+    period: str = "3mo",
+    snapshot: Optional[Snapshot] = None,
+    provider: Optional[MarketDataProvider] = None,
+) -> pd.DataFrame:
+    """Batched history download, recorded to / replayed from a snapshot if given"""
+    from providers import call_provider, get_default_provider
+
+    provider = provider or get_default_provider()
+
+    def download() -> pd.DataFrame:
+        return call_provider(provider, lambda p: p.history(symbols, period=period))
+
+    if snapshot is None:
+        return download()
+    return snapshot.fetch(('market', 'history', tuple(symbols), period), download)
+
+
+def load_price_history(
+    symbols: List[str],
+    period: str = "3mo",
+    snapshot: Optional[Snapshot] = None,
+    provider: Optional[MarketDataProvider] = None,
+    store: Optional[PriceStore] = None,
+) -> pd.DataFrame:
+    """
+    History for discovery and analytics, served from the local price store
+
+    Only bars newer than each symbol's last stored date are downloaded.
+    Snapshot runs bypass the store so record/replay stays deterministic.
+    """
+    if snapshot is not None:
+        return fetch_price_history(symbols, period=period, snapshot=snapshot, provider=provider)
+
+    from price_store import load_history
+    from providers import get_default_provider
+
+    history, stats = load_history(symbols, provider or get_default_provider(), store=store, period=period)
+    print(
+        f"{Colors.BLUE}  Price store: {stats['bars']} bars in {stats['requests']} requests "
+        f"({stats['backfilled']} backfilled, {stats['updated']} updated){Colors.END}"
+    )
+    return history
+
+
+def _build_company(symbol: str, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Turn raw endpoint data for one symbol into a company record"""
+    info = data['info']
+    if not info or 'longName' not in info:
+        return None
+
+    # Get debt-to-equity from balance sheet
+    balance_sheet = data['balance_sheet']
+    debt_to_equity = None
+    if balance_sheet is not None and not balance_sheet.empty:
+        try:
+            total_debt = balance_sheet.loc['Total Debt'] if 'Total Debt' in balance_sheet.index else 0
+            total_equity = (
+                balance_sheet.loc['Total Equity Gross Minority Interest']
+                if 'Total Equity Gross Minority Interest' in balance_sheet.index
+                else 1
+            )
+            if total_equity != 0:
+                debt_to_equity = total_debt.iloc[0] / total_equity.iloc[0]
+        except:
+            pass
+
+    # Get institutional holdings
+    institutional_holders = data['institutional_holders']
+    institutional_value = 0
+    if institutional_holders is not None and not institutional_holders.empty:
+        institutional_value = institutional_holders['Value'].sum() if 'Value' in institutional_holders.columns else 0
+
+    # Get mutual fund holdings
+    mutual_fund_holders = data['mutualfund_holders']
+    mf_value = 0
+    if mutual_fund_holders is not None and not mutual_fund_holders.empty:
+        mf_value = mutual_fund_holders['Value'].sum() if 'Value' in mutual_fund_holders.columns else 0
+
+    # Calculate MF holding percentage (rough estimate)
+    market_cap = info.get('marketCap', 1)
+    mf_percentage = (mf_value / market_cap * 100) if market_cap > 0 else 0
+
+    # Base company data
+    company = {
+        'symbol': symbol.replace('.NS', ''),
+        'name': info.get('longName', 'Unknown'),
+        'current_price': info.get('currentPrice', info.get('regularMarketPrice', 0)),
+        'market_cap': market_cap,
+        'pe_ratio': info.get('trailingPE', 0),
+        'volume': info.get('volume', 0),
+        'avg_volume': info.get('averageVolume'),  # Missing stays None so no liquidity rule fires
+        'fifty_two_week_high': info.get('fiftyTwoWeekHigh', 0),
+        'fifty_two_week_low': info.get('fiftyTwoWeekLow', 0),
+        'debt_to_equity': debt_to_equity,
+        'institutional_value': institutional_value,
+        'mutual_fund_value': mf_value,
+        'mf_percentage': mf_percentage,
+        'beta': info.get('beta', 0),
+    }
+
+    # Add expert insights if available
+    if company['symbol'] in EXPERT_INSIGHTS['strategic_winners']:
+        expert = EXPERT_INSIGHTS['strategic_winners'][company['symbol']]
+        company['expert_catalyst'] = expert.get('catalyst', '')
+        company['expert_warning'] = expert.get('warning', '')
+        company['geopolitical_risk'] = expert.get('geopolitical_risk', '')
+
+    # Add stealth ranking
+    for rank, stealth in EXPERT_INSIGHTS['stealth_ranking'].items():
+        if stealth['symbol'] == company['symbol']:
+            company['stealth_rank'] = rank
+            company['stealth_score'] = stealth['score']
+            company['stealth_detail'] = stealth['detail']
+
+    # Add hidden risks
+    if company['symbol'] in EXPERT_INSIGHTS['hidden_risks']:
+        company['hidden_risks'] = EXPERT_INSIGHTS['hidden_risks'][company['symbol']]
+
+    return company
+
+
+def fetch_company_data(
+    symbols: List[str],
+    max_workers: int = settings.FETCH_MAX_WORKERS,
+    timeout: Optional[float] = settings.FETCH_TIMEOUT_SECONDS,
+    cache: Optional[DataCache] = None,
+    snapshot: Optional[Snapshot] = None,
+    provider: Optional[MarketDataProvider] = None,
+    sectors: Optional[Dict[str, str]] = None,
+    limiter: Optional[TokenBucket] = None,
+) -> List[Optional[Dict[str, Any]]]:
+    """Raw endpoint data per symbol (None where fetching failed), in input order"""
+    from fetch_engine import fetch_universe
+    from providers import call_provider, get_default_provider
+
+    sectors = sectors or {}
+    cache = cache if cache is not None else DataCache()
+    provider = provider or get_default_provider()
+
+    def report_failure(symbol: str, error: Exception):
+        print(f"{Colors.YELLOW}  ⚠️ Could not fetch {symbol}: {error}{Colors.END}")
+
+    def fetch_cached(symbol: str, kind: str) -> Any:
+        # Only the remote member of a provider chain is cached; local dumps are read fresh at disk speed
+        return call_provider(
+            provider, lambda p: p.fetch(symbol, kind), limiter, endpoint=kind, symbol=symbol, cache=cache
+        )
+
+    def fetch(symbol: str, kind: str) -> Any:
+        # Snapshot sits outside the cache so recordings capture every response
+        if snapshot is None:
+            return fetch_cached(symbol, kind)
+        return snapshot.fetch(('market', symbol, kind), lambda: fetch_cached(symbol, kind))
+
+    hits, misses = cache.stats['hits'], cache.stats['misses']
+    progress = ScanProgress(
+        {s: sectors.get(s, 'custom') for s in symbols}, report=lambda line: print(f"{Colors.BLUE}{line}{Colors.END}")
+    )
+
+    # All endpoints for all symbols run concurrently; results keep input order
+    raw = fetch_universe(
+        list(symbols),
+        fetch,
+        max_workers=max_workers,
+        timeout=timeout,
+        on_error=report_failure,
+        on_done=progress.update,
+    )
+
+    print(f"{Colors.BLUE}  Scanned {progress.summary()}{Colors.END}")
+    print(f"{Colors.BLUE}  Cache: {cache.summary()}{Colors.END}")
+    shared_metrics().count_cache('responses', cache.stats['hits'] - hits, cache.stats['misses'] - misses)
+    return raw
+
+
+def build_companies(
+    symbols: List[str],
+    raw: List[Optional[Dict[str, Any]]],
+    history: pd.DataFrame,
+    sectors: Optional[Dict[str, str]] = None,
+) -> List[Dict[str, Any]]:
+    """Company records with the expert overlay and price statistics from fetched data"""
+    from price_analytics import merge_price_stats, price_stats
+
+    sectors = sectors or {}
     companies = []
-    
-    print(f"{Colors.BLUE}🔍 Mining companies with expert-validated factors...{Colors.END}")
-    
-    for symbol in target_symbols:
+    for symbol, data in zip(symbols, raw):
+        if data is None:
+            continue
         try:
-            ticker = yf.Ticker(symbol)
-            info = ticker.info
-            
-            if info and 'longName' in info:
-                # Get debt-to-equity from balance sheet
-                balance_sheet = ticker.balance_sheet
-                debt_to_equity = None
-                if balance_sheet is not None and not balance_sheet.empty:
-                    try:
-                        total_debt = balance_sheet.loc['Total Debt'] if 'Total Debt' in balance_sheet.index else 0
-                        total_equity = balance_sheet.loc['Total Equity Gross Minority Interest'] if 'Total Equity Gross Minority Interest' in balance_sheet.index else 1
-                        if total_equity != 0:
-                            debt_to_equity = total_debt.iloc[0] / total_equity.iloc[0]
-                    except:
-                        pass
-                
-                # Get institutional holdings
-                institutional_holders = ticker.institutional_holders
-                institutional_value = 0
-                if institutional_holders is not None and not institutional_holders.empty:
-                    institutional_value = institutional_holders['Value'].sum() if 'Value' in institutional_holders.columns else 0
-                
-                # Get mutual fund holdings
-                mutual_fund_holders = ticker.mutualfund_holders
-                mf_value = 0
-                if mutual_fund_holders is not None and not mutual_fund_holders.empty:
-                    mf_value = mutual_fund_holders['Value'].sum() if 'Value' in mutual_fund_holders.columns else 0
-                
-                # Calculate MF holding percentage (rough estimate)
-                market_cap = info.get('marketCap', 1)
-                mf_percentage = (mf_value / market_cap * 100) if market_cap > 0 else 0
-                
-                # Base company data
-                company = {
-                    'symbol': symbol.replace('.NS', ''),
-                    'name': info.get('longName', 'Unknown'),
-                    'current_price': info.get('currentPrice', info.get('regularMarketPrice', 0)),
-                    'market_cap': market_cap,
-                    'pe_ratio': info.get('trailingPE', 0),
-                    'volume': info.get('volume', 0),
-                    'avg_volume': info.get('averageVolume', 0),
-                    'fifty_two_week_high': info.get('fiftyTwoWeekHigh', 0),
-                    'fifty_two_week_low': info.get('fiftyTwoWeekLow', 0),
-                    'debt_to_equity': debt_to_equity,
-                    'institutional_value': institutional_value,
-                    'mutual_fund_value': mf_value,
-                    'mf_percentage': mf_percentage,
-                    'beta': info.get('beta', 0),
-                }
-                
-                # Add expert insights if available
-                if company['symbol'] in EXPERT_INSIGHTS['strategic_winners']:
-                    expert = EXPERT_INSIGHTS['strategic_winners'][company['symbol']]
-                    company['expert_catalyst'] = expert.get('catalyst', '')
-                    company['expert_warning'] = expert.get('warning', '')
-                    company['geopolitical_risk'] = expert.get('geopolitical_risk', '')
-                
-                # Add stealth ranking
-                for rank, data in EXPERT_INSIGHTS['stealth_ranking'].items():
-                    if data['symbol'] == company['symbol']:
-                        company['stealth_rank'] = rank
-                        company['stealth_score'] = data['score']
-                        company['stealth_detail'] = data['detail']
-                
-                # Add hidden risks
-                if company['symbol'] in EXPERT_INSIGHTS['hidden_risks']:
-                    company['hidden_risks'] = EXPERT_INSIGHTS['hidden_risks'][company['symbol']]
-                
-                # Get recent performance
-                hist = ticker.history(period="3mo")
-                if not hist.empty:
-                    company['three_month_change'] = ((hist['Close'].iloc[-1] - hist['Close'].iloc[0]) / hist['Close'].iloc[0] * 100)
-                
-                companies.append(company)
-                print(f"{Colors.GREEN}  ✓ Analyzed: {company['name']} ({company['symbol']}){Colors.END}")
-                
+            company = _build_company(symbol, data)
         except Exception as e:
             print(f"{Colors.YELLOW}  ⚠️ Could not fetch {symbol}: {e}{Colors.END}")
-    
-    return companies
+            continue
+        if company:
+            if symbol in sectors:
+                company['sector'] = sectors[symbol]
+            companies.append(company)
+            print(f"{Colors.GREEN}  ✓ Analyzed: {company['name']} ({company['symbol']}){Colors.END}")
+
+    # Locally computed 52-week range and returns replace the quote's fields
+    return merge_price_stats(companies, price_stats(history))
+
+
+def discover_companies_with_expert_insights(
+    symbols: Optional[List[str]] = None,
+    history: Optional[pd.DataFrame] = None,
+    max_workers: int = settings.FETCH_MAX_WORKERS,
+    timeout: Optional[float] = settings.FETCH_TIMEOUT_SECONDS,
+    cache: Optional[DataCache] = None,
+    snapshot: Optional[Snapshot] = None,
+    provider: Optional[MarketDataProvider] = None,
+    sectors: Optional[Dict[str, str]] = None,
+    limiter: Optional[TokenBucket] = None,
+    store: Optional[PriceStore] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Fetch live data and overlay expert insights
+
+    Args:
+        symbols: Yahoo symbols to analyze (defaults to every symbol in settings.PLI_SECTORS)
+        history: Pre-fetched history from load_price_history(); loaded the
+                 same way when omitted. 52-week range and 1m-12m returns are
+                 computed from it (see price_analytics.py)
+        cache: On-disk response cache; a default DataCache is used when omitted
+        snapshot: Record raw responses to, or replay them from, a Snapshot
+        provider: Market-data source; local dumps with yfinance fallback by default
+        sectors: ``{symbol: sector}`` for progress reporting and the company record
+        limiter: Token bucket for remote calls (process-wide limiter by default)
+        store: Price store for the history (the default store when omitted)
+    """
+    from providers import get_default_provider
+
+    if symbols is None:
+        universe = build_universe()
+        symbols = [s for sector_symbols in universe.values() for s in sector_symbols]
+        sectors = sector_map(universe)
+    target_symbols = list(symbols)
+    provider = provider or get_default_provider()
+
+    print(f"{Colors.BLUE}🔍 Mining companies with expert-validated factors...{Colors.END}")
+
+    # Only bars newer than the local price store are downloaded
+    if history is None:
+        history = load_price_history(
+            target_symbols, period=settings.PRICE_HISTORY_PERIOD, snapshot=snapshot, provider=provider, store=store
+        )
+
+    raw = fetch_company_data(
+        target_symbols,
+        max_workers=max_workers,
+        timeout=timeout,
+        cache=cache,
+        snapshot=snapshot,
+        provider=provider,
+        sectors=sectors,
+        limiter=limiter,
+    )
+    return build_companies(target_symbols, raw, history, sectors)
+
 
 # ============================================================
 # ENHANCED ASYMMETRY WITH EXPERT WEIGHTS
 # ============================================================
 
-def analyze_expert_validated_asymmetry(companies: List[Dict[str, Any]]) -> Dict[str, Any]:
+
+def analyze_expert_validated_asymmetry(
+    companies: List[Dict[str, Any]], top_k: Optional[int] = settings.SCORING_TOP_K
+) -> Dict[str, Any]:
     """
     Asymmetry analysis that incorporates expert insights
+
+    Factors are declarative rules (config/scoring_rules.json) scored as
+    vectorized columns over the whole universe (see scoring.py); reason
+    strings are only built for the top_k reported rows. Price statistics
+    from price_analytics.py (distance_from_low_pct, one_month_change ..
+    twelve_month_change) are available to rules as columns.
     """
-    
+
+    from scoring import score_companies
+
     print(f"{Colors.CYAN}🔬 Running expert-validated asymmetry analysis...{Colors.END}")
-    
-    for company in companies:
-        asymmetry_score = 0
-        reasons = []
-        risk_flags = []
-        
-        # Price-based factors
-        if company['current_price'] < company['fifty_two_week_low'] * 1.1:
-            asymmetry_score += 3
-            reasons.append(f"Near 52-week low (₹{company['fifty_two_week_low']:.2f})")
-        
-        if company.get('three_month_change', 0) < -5:
-            asymmetry_score += 2
-            reasons.append(f"Down {company['three_month_change']:.1f}% in 3 months")
-        
-        # Expert catalyst check
-        if 'expert_catalyst' in company:
-            asymmetry_score += 4  # Big boost for expert-identified catalysts
-            reasons.append(f"Expert catalyst: {company['expert_catalyst'][:50]}...")
-        
-        # Stealth factor (lower rank = higher stealth opportunity)
-        stealth_rank = company.get('stealth_rank', 5)
-        if stealth_rank <= 2:
-            asymmetry_score += 5
-            reasons.append(f"High stealth (Rank {stealth_rank}): {company.get('stealth_detail', '')}")
-        elif stealth_rank <= 3:
-            asymmetry_score += 2
-            reasons.append(f"Moderate stealth (Rank {stealth_rank})")
-        
-        # Debt risk (expert identified)
-        if company['symbol'] == 'SYRMA':
-            d_e = company.get('debt_to_equity', 0)
-            industry_avg = EXPERT_INSIGHTS['industry_metrics']['avg_debt_equity']
-            if d_e and d_e > industry_avg * 2:
-                risk_flags.append(f"⚠️ High debt: {d_e:.2f} vs industry {industry_avg:.2f}")
-                asymmetry_score -= 2
-        
-        # Geopolitical risk (expert identified)
-        if 'geopolitical_risk' in company:
-            risk_flags.append(f"⚠️ Geopolitical: {company['geopolitical_risk']}")
-            asymmetry_score -= 3
-        
-        # High P/E warning (expert identified)
-        if company['symbol'] == 'AMBER' and company.get('pe_ratio', 0) > 150:
-            risk_flags.append("⚠️ Extreme P/E: 166 (3 years growth priced in)")
-            asymmetry_score -= 4
-        
-        company['asymmetry_score'] = asymmetry_score
-        company['asymmetry_reasons'] = reasons
-        company['risk_flags'] = risk_flags
-    
-    # Sort by asymmetry score
-    sorted_companies = sorted(companies, key=lambda x: x.get('asymmetry_score', 0), reverse=True)
-    
+
+    return score_companies(companies, top_k=top_k)
+
+
+def calculate_buy_trigger(company: Dict[str, Any]) -> Dict[str, float]:
+    """Buy, target and stop levels from the 52-week range"""
+
+    low = company['fifty_two_week_low']
     return {
-        'top_company': sorted_companies[0] if sorted_companies else None,
-        'all_companies': sorted_companies
+        'buy_trigger': low * settings.BUY_TRIGGER_PERCENTAGE,
+        'target': company['fifty_two_week_high'],
+        'stop': low * settings.STOP_LOSS_PERCENTAGE,
     }
 
+
 # ============================================================
 # GENERATE EXPERT-VALIDATED REPORT
 # ============================================================
 
-def generate_expert_report(companies: List[Dict[str, Any]], asymmetry: Dict[str, Any]) -> str:
-    """Generate report blending live data with expert insights"""
-    
-    report = []
-    report.append(f"\n{Colors.BOLD}{Colors.HEADER}{'='*100}{Colors.END}")
-    report.append(f"{Colors.BOLD}{Colors.HEADER}🚀 AUTONOMOUS PLI ALPHA GENERATOR v2.0{Colors.END}")
-    report.append(f"{Colors.BOLD}{Colors.HEADER}   Expert-Validated Supply Chain Intelligence{Colors.END}")
-    report.append(f"{Colors.BOLD}{Colors.HEADER}{'='*100}{Colors.END}\n")
-    report.append(f"{Colors.BLUE}Analysis Timestamp:{Colors.END} {datetime.now().strftime('%Y-%m-%d %H:%M:%S IST')}")
-    report.append(f"{Colors.BLUE}Expert Insights Date:{Colors.END} February 23, 2026 (Gemini Analysis)\n")
-    
-    # Expert Summary
-    report.append(f"{Colors.BOLD}{Colors.YELLOW}📊 EXPERT MACRO VIEW{Colors.END}")
-    report.append(f"• PLI disbursed: ₹28,748 crore (as of late 2025)")
-    report.append(f"• Component PLI boost: ₹{EXPERT_INSIGHTS['industry_metrics']['component_pli_size']:,} Cr")
-    report.append(f"• Shift: 'Screw-Driver Technology' → Core Component Manufacturing\n")
-    
-    # Strategic Winners (Expert identified)
-    report.append(f"{Colors.BOLD}{Colors.CYAN}🏭 STRATEGIC CORRELATION: 20%+ Utilization Candidates{Colors.END}")
-    for sym, data in EXPERT_INSIGHTS['strategic_winners'].items():
-        # Find live price if available
-        live_price = next((c['current_price'] for c in companies if c['symbol'] == sym), 'N/A')
-        report.append(f"\n{Colors.BOLD}{sym}{Colors.END} - ₹{live_price if live_price != 'N/A' else 'N/A'}")
-        report.append(f"  • {Colors.GREEN}Catalyst:{Colors.END} {data['catalyst']}")
-        report.append(f"  • {Colors.YELLOW}Warning:{Colors.END} {data.get('warning', 'None')}")
-        if 'geopolitical_risk' in data:
-            report.append(f"  • {Colors.RED}Geo Risk:{Colors.END} {data['geopolitical_risk']}")
-    
-    # Stealth Ranking (Expert validated)
-    report.append(f"\n{Colors.BOLD}{Colors.MAGENTA}🕵️ INSTITUTIONAL STEALTH RANKING{Colors.END}")
-    report.append(f"{'Rank':<6} {'Company':<20} {'Score':<18} {'Live MF %':<10} {'Current':<10}")
-    report.append("-" * 70)
-    
-    for rank in range(1, 6):
-        data = EXPERT_INSIGHTS['stealth_ranking'][rank]
-        company = next((c for c in companies if c['symbol'] == data['symbol']), None)
-        if company:
-            mf_pct = f"{company.get('mf_percentage', 0):.1f}%"
-            price = f"₹{company['current_price']:.2f}"
-            report.append(f"{rank:<6} {company['name'][:18]:<20} {data['score']:<18} {mf_pct:<10} {price:<10}")
-    
-    # Hidden Risks Matrix
-    report.append(f"\n{Colors.BOLD}{Colors.RED}⚠️ HIDDEN RISKS MATRIX{Colors.END}")
-    for company in companies:
-        if 'hidden_risks' in company or 'risk_flags' in company:
-            report.append(f"\n{Colors.BOLD}{company['symbol']}{Colors.END}")
-            if 'hidden_risks' in company:
-                for risk in company['hidden_risks']:
-                    report.append(f"  • {risk}")
-            if 'risk_flags' in company:
-                for risk in company['risk_flags']:
-                    report.append(f"  • {risk}")
-    
-    # Current Asymmetry Opportunity (Live data + Expert overlay)
+
+def generate_expert_report(companies: List[Dict[str, Any]], asymmetry: Dict[str, Any], fmt: str = 'ansi') -> str:
+    """Generate report blending live data with expert insights (see report_renderer.py)"""
+
+    top = asymmetry.get('top_company')
+    buffer = io.StringIO()
+    render_report(
+        companies, asymmetry, EXPERT_INSIGHTS, out=buffer, fmt=fmt, levels=calculate_buy_trigger(top) if top else None
+    )
+    return buffer.getvalue().rstrip('\n')
+
+
+def run_record(asymmetry: Dict[str, Any], timestamp: datetime) -> Dict[str, Any]:
+    """The run as stored in the run store and read back by the README update"""
+
     top = asymmetry['top_company']
-    if top:
-        report.append(f"\n{Colors.BOLD}{Colors.GREEN}🎯 CURRENT HIGHEST ASYMMETRY OPPORTUNITY{Colors.END}")
-        report.append(f"{Colors.BOLD}{top['name']} ({top['symbol']}){Colors.END}")
-        report.append(f"{Colors.BLUE}Asymmetry Score:{Colors.END} {top['asymmetry_score']}/10")
-        report.append(f"{Colors.BLUE}Live Price:{Colors.END} ₹{top['current_price']:.2f}")
-        report.append(f"{Colors.BLUE}52-Week Range:{Colors.END} ₹{top['fifty_two_week_low']:.2f} - ₹{top['fifty_two_week_high']:.2f}")
-        
-        if top['asymmetry_reasons']:
-            report.append(f"{Colors.BLUE}Asymmetry Drivers:{Colors.END}")
-            for reason in top['asymmetry_reasons']:
-                report.append(f"  • {reason}")
-        
-        # Buy trigger calculation
-        buy_trigger = top['fifty_two_week_low'] * 1.02
-        report.append(f"\n{Colors.BOLD}{Colors.GREEN}💰 BUY TRIGGER (Live){Colors.END}")
-        report.append(f"   Buy at: ₹{buy_trigger:.2f}")
-        report.append(f"   Target: ₹{top['fifty_two_week_high']:.2f}")
-        report.append(f"   Stop: ₹{top['fifty_two_week_low'] * 0.95:.2f}")
-    
-    report.append(f"\n{Colors.BOLD}{Colors.HEADER}{'='*100}{Colors.END}")
-    report.append(f"{Colors.YELLOW}⚠️  DISCLAIMER: Expert insights from Feb 23, 2026. Prices are live.{Colors.END}")
-    report.append(f"{Colors.YELLOW}   Always validate with current fundamentals.{Colors.END}")
-    
-    return "\n".join(report)
+    return {
+        'timestamp': timestamp.isoformat(),
+        'top_company': {
+            'name': top['name'],
+            'symbol': top['symbol'],
+            'current_price': top['current_price'],
+            'fifty_two_week_low': top['fifty_two_week_low'],
+            'fifty_two_week_high': top['fifty_two_week_high'],
+            'asymmetry_score': top['asymmetry_score'],
+            'asymmetry_reasons': top['asymmetry_reasons'],
+            'risk_flags': top.get('risk_flags', []),
+        },
+        'all_companies': [
+            {
+                'symbol': c['symbol'],
+                'name': c['name'],
+                'price': c['current_price'],
+                'score': c['asymmetry_score'],
+                'fifty_two_week_low': c['fifty_two_week_low'],
+                'fifty_two_week_high': c['fifty_two_week_high'],
+                'risk_flags': c.get('risk_flags', []),
+            }
+            for c in asymmetry['all_companies']
+        ],
+    }
+
 
 # ============================================================
 # MAIN EXECUTION
 # ============================================================
 
-def main():
-    """Run expert-validated analysis pipeline"""
-    
+
+def main(
+    record: Optional[str] = None,
+    replay: Optional[str] = None,
+    data_dir: Optional[str] = None,
+    universe_file: Optional[str] = None,
+    report_format: Optional[str] = None,
+    report_file: Optional[str] = None,
+    save: bool = True,
+):
+    """
+    Run expert-validated analysis pipeline
+
+    Args:
+        record: Save every raw provider response to this snapshot file
+        replay: Serve provider responses from this snapshot file (no network)
+        data_dir: Directory of local market-data dumps (defaults to settings.MARKET_DATA_DIR)
+        universe_file: Extra NSE symbol list scanned after settings.PLI_SECTORS
+        report_format: Console report format (colors on a terminal, plain text otherwise)
+        report_file: Also write the report here; .md/.html select Markdown/HTML
+        save: Append the run to the run store
+    """
+
+    from providers import get_default_provider
+
+    snapshot = open_snapshot(record=record, replay=replay)
+    provider = get_default_provider(Path(data_dir) if data_dir else None)
+    if snapshot is not None and snapshot.replaying:
+        print(f"{Colors.BLUE}⏪ Replaying snapshot {snapshot.path} (recorded {snapshot.created}){Colors.END}")
+
     print(f"{Colors.BOLD}{Colors.HEADER}{'='*100}{Colors.END}")
     print(f"{Colors.BOLD}{Colors.HEADER}🚀 AUTONOMOUS PLI ALPHA GENERATOR v2.0{Colors.END}")
     print(f"{Colors.BOLD}{Colors.HEADER}   Expert-Validated Intelligence Engine{Colors.END}")
     print(f"{Colors.BOLD}{Colors.HEADER}{'='*100}{Colors.END}\n")
-    
-    # Fetch live company data
-    companies = discover_companies_with_expert_insights()
+
+    # Fetch the universe's price matrix once, then live company data
+    universe = build_universe(symbols_file=Path(universe_file) if universe_file else None)
+    symbols = [s for sector_symbols in universe.values() for s in sector_symbols]
+    print(f"{Colors.BLUE}🌐 Universe: {len(symbols)} symbols across {len(universe)} sectors{Colors.END}")
+
+    metrics = shared_metrics()
+    with metrics.stage('fetch'):
+        history = load_price_history(
+            symbols, period=settings.PRICE_HISTORY_PERIOD, snapshot=snapshot, provider=provider
+        )
+        companies = discover_companies_with_expert_insights(
+            symbols, history=history, snapshot=snapshot, provider=provider, sectors=sector_map(universe)
+        )
+
+    if snapshot is not None and not snapshot.replaying:
+        saved = snapshot.save()
+        print(f"{Colors.BLUE}💾 Recorded {len(snapshot)} provider responses to {saved}{Colors.END}")
+
     if not companies:
         print(f"{Colors.RED}❌ No companies found.{Colors.END}")
         return
-    
+
     # Run expert-validated asymmetry analysis
-    asymmetry = analyze_expert_validated_asymmetry(companies)
-    
+    with metrics.stage('score'):
+        asymmetry = analyze_expert_validated_asymmetry(companies)
+
     # Generate enhanced report
-    report = generate_expert_report(companies, asymmetry)
-    print(report)
-    
-    # Save results to JSON for README update
-    reports_dir = Path(__file__).parent.parent / "reports"
-    reports_dir.mkdir(exist_ok=True)
-    
-    report_file = reports_dir / f"analysis_{datetime.now().strftime('%Y%m%d_%H%M')}.json"
-    
-    # Prepare data for JSON
-    json_data = {
-        'timestamp': datetime.now().isoformat(),
-        'top_company': {
-            'name': asymmetry['top_company']['name'],
-            'symbol': asymmetry['top_company']['symbol'],
-            'current_price': asymmetry['top_company']['current_price'],
-            'fifty_two_week_low': asymmetry['top_company']['fifty_two_week_low'],
-            'fifty_two_week_high': asymmetry['top_company']['fifty_two_week_high'],
-            'asymmetry_score': asymmetry['top_company']['asymmetry_score'],
-            'asymmetry_reasons': asymmetry['top_company']['asymmetry_reasons'],
-            'risk_flags': asymmetry['top_company'].get('risk_flags', [])
-        },
-        'all_companies': [
-            {
-                'symbol': c['symbol'],
-                'name': c['name'],
-                'price': c['current_price'],
-                'score': c['asymmetry_score']
-            }
-            for c in asymmetry['all_companies']
-        ]
-    }
-    
-    with open(report_file, 'w') as f:
-        json.dump(json_data, f, indent=2)
-    
-    print(f"{Colors.GREEN}✅ Analysis saved to {report_file}{Colors.END}")
-    print(f"{Colors.GREEN}✅ File exists: {report_file.exists()}{Colors.END}")
-    print(f"{Colors.GREEN}✅ Reports folder contents: {list(reports_dir.glob('*.json'))}{Colors.END}")
-    
+    top = asymmetry['top_company']
+    levels = calculate_buy_trigger(top)
+    with metrics.stage('render'):
+        render_report(
+            companies,
+            asymmetry,
+            EXPERT_INSIGHTS,
+            out=sys.stdout,
+            fmt=report_format or default_format(sys.stdout),
+            levels=levels,
+        )
+        if report_file:
+            with open(report_file, 'w', encoding='utf-8') as f:
+                render_report(
+                    companies, asymmetry, EXPERT_INSIGHTS, out=f, fmt=format_for_path(report_file), levels=levels
+                )
+            print(f"{Colors.GREEN}📄 Report written to {report_file}{Colors.END}")
+
+    # Append the run to the run store for the README update
+    run_data = run_record(asymmetry, datetime.now())
+
+    if save:
+        with metrics.stage('publish'), RunStore() as store:
+            run_id = store.append_run(run_data)
+            print(f"{Colors.GREEN}✅ Run {run_id} saved to {store.path} ({store.count()} runs stored){Colors.END}")
+
+    paths = metrics.write()
+    print(f"{Colors.BLUE}📈 Metrics written to {paths['json']} and {paths['prometheus']}{Colors.END}")
+
     print(f"\n{Colors.GREEN}{Colors.BOLD}✅ Analysis Complete!{Colors.END}")
     print(f"{Colors.YELLOW}📋 Next iteration: Feed latest news back to Gemini for updated insights{Colors.END}")
 
+
 if __name__ == "__main__":
-    main()
+    import argparse
+
+    parser = argparse.ArgumentParser(description="PLI Alpha Generator")
+    snapshot_group = parser.add_mutually_exclusive_group()
+    snapshot_group.add_argument('--record', metavar='PATH', help="Record raw provider responses to a snapshot file")
+    snapshot_group.add_argument('--replay', metavar='PATH', help="Replay provider responses from a snapshot file")
+    parser.add_argument('--data-dir', metavar='DIR', help="Read market data from local Parquet/CSV/Arrow dumps first")
+    parser.add_argument(
+        '--universe',
+        metavar='FILE',
+        nargs='?',
+        const=str(settings.NSE_UNIVERSE_FILE),
+        help="Also scan a broader NSE symbol list " f"(bare flag: {settings.NSE_UNIVERSE_FILE}, not shipped)",
+    )
+    parser.add_argument(
+        '--format',
+        choices=['ansi', 'plain', 'markdown', 'html'],
+        help="Console report format (default: colors on a terminal, plain otherwise)",
+    )
+    parser.add_argument('--report', metavar='FILE', help="Also write the report to FILE (.md/.html/.txt)")
+    # Other flags (e.g. --output from CI) are ignored, as before
+    args, _ = parser.parse_known_args()
+
+    main(
+        record=args.record,
+        replay=args.replay,
+        data_dir=args.data_dir,
+        universe_file=args.universe,
+        report_format=args.format,
+        report_file=args.report,
+    )
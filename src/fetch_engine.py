@@ -0,0 +1,151 @@
+"""
+Concurrent fetch engine for per-symbol market data.
+
+Each symbol needs several independent provider calls (info, balance sheet,
+holders, ...). The engine runs symbols on a bounded worker pool and fans the
+per-symbol endpoint calls out onto a second pool, so one slow endpoint does not
+serialise the rest. Results come back in the same order as the input symbols.
+
+A running thread can't be cancelled, so an endpoint call that outlives its
+symbol's timeout keeps its worker. When that happens the endpoint pool is
+replaced for the symbols that follow, and hung calls can never starve the rest
+of the universe.
+"""
+
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+# Endpoints fetched for every symbol during discovery
+DEFAULT_ENDPOINTS = ('info', 'balance_sheet', 'institutional_holders', 'mutualfund_holders')
+
+
+class SymbolFetchError(Exception):
+    """Raised when a symbol could not be fetched completely"""
+
+    def __init__(self, symbol: str, message: str):
+        super().__init__(f"{symbol}: {message}")
+        self.symbol = symbol
+
+
+class _EndpointPool:
+    """Endpoint executor that is swapped for a fresh one when its workers get stuck"""
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self.generation = 0
+        self._lock = threading.Lock()
+        self._executor = self._new_executor()
+        self._retired: List[ThreadPoolExecutor] = []
+
+    def _new_executor(self) -> ThreadPoolExecutor:
+        return ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='fetch-endpoint')
+
+    def submit(
+        self, fetch_endpoint: Callable[[str, str], Any], symbol: str, endpoints: Sequence[str]
+    ) -> Tuple[Dict[str, Future], int]:
+        """Submit every endpoint call for ``symbol``; returns the futures and the executor generation"""
+        with self._lock:
+            futures = {kind: self._executor.submit(fetch_endpoint, symbol, kind) for kind in endpoints}
+            return futures, self.generation
+
+    def recycle(self, generation: int):
+        """Send new calls to a fresh executor, unless ``generation`` was already replaced"""
+        with self._lock:
+            if generation != self.generation:
+                return
+            # Calls already queued on the old executor still run; its threads exit once their calls return
+            self._executor.shutdown(wait=False)
+            self._retired.append(self._executor)
+            self._executor = self._new_executor()
+            self.generation += 1
+
+    def shutdown(self):
+        with self._lock:
+            for executor in (*self._retired, self._executor):
+                # Don't block on endpoint calls that already timed out
+                executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _fetch_symbol(
+    symbol: str,
+    fetch_endpoint: Callable[[str, str], Any],
+    endpoints: Sequence[str],
+    endpoint_pool: _EndpointPool,
+    timeout: Optional[float],
+) -> Dict[str, Any]:
+    """Fan out all endpoint calls for one symbol and wait for them together"""
+    futures, generation = endpoint_pool.submit(fetch_endpoint, symbol, endpoints)
+    done, pending = wait(futures.values(), timeout=timeout)
+
+    if pending:
+        # Cancel every queued call (a list, not a short-circuiting generator); running calls keep their workers
+        if not all([future.cancel() for future in pending]):
+            endpoint_pool.recycle(generation)
+        missing = [kind for kind, future in futures.items() if future in pending]
+        raise SymbolFetchError(symbol, f"timed out after {timeout}s waiting for {', '.join(missing)}")
+
+    # Re-raises the first endpoint error, if any
+    return {kind: future.result() for kind, future in futures.items()}
+
+
+def fetch_universe(
+    symbols: Sequence[str],
+    fetch_endpoint: Callable[[str, str], Any],
+    endpoints: Sequence[str] = DEFAULT_ENDPOINTS,
+    max_workers: int = 8,
+    timeout: Optional[float] = 30.0,
+    on_error: Optional[Callable[[str, Exception], None]] = None,
+    on_done: Optional[Callable[[str, bool], None]] = None,
+) -> List[Optional[Dict[str, Any]]]:
+    """
+    Fetch every endpoint for every symbol concurrently.
+
+    Args:
+        symbols: Symbols to fetch, in the order results should be returned
+        fetch_endpoint: Callable ``(symbol, kind) -> data`` doing one provider call
+        endpoints: Endpoint kinds to fetch per symbol
+        max_workers: Maximum number of symbols in flight at once
+        timeout: Per-symbol timeout in seconds (None waits forever)
+        on_error: Optional callback invoked with ``(symbol, exception)`` on failure
+        on_done: Optional callback invoked with ``(symbol, ok)`` as each symbol
+                 finishes, in completion order (called from worker threads)
+
+    Returns:
+        One ``{kind: data}`` dict per input symbol, or None where the fetch failed
+    """
+    if not symbols:
+        return []
+
+    max_workers = max(1, min(max_workers, len(symbols)))
+    results: List[Optional[Dict[str, Any]]] = []
+
+    def run(symbol: str) -> Dict[str, Any]:
+        try:
+            data = _fetch_symbol(symbol, fetch_endpoint, endpoints, endpoint_pool, timeout)
+        except Exception:
+            if on_done:
+                on_done(symbol, False)
+            raise
+        if on_done:
+            on_done(symbol, True)
+        return data
+
+    # Two pools: symbol workers block on their endpoint futures, so sharing a
+    # single pool could deadlock once every worker is waiting.
+    endpoint_pool = _EndpointPool(max_workers * len(endpoints))
+    symbol_pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='fetch-symbol')
+    try:
+        futures = [symbol_pool.submit(run, symbol) for symbol in symbols]
+        for symbol, future in zip(symbols, futures):
+            try:
+                results.append(future.result())
+            except Exception as e:
+                results.append(None)
+                if on_error:
+                    on_error(symbol, e)
+    finally:
+        symbol_pool.shutdown(wait=True)
+        endpoint_pool.shutdown()
+
+    return results
@@ -0,0 +1,145 @@
+"""
+Mark every track-record pick to market.
+
+Current prices for all distinct symbols are the last closes in the local
+price store, synced first so only new bars are downloaded.
+Unrealized P&L, distance to target and target/stop status are then computed
+for every pick at once. Target and stop levels follow the backtest: the
+52-week high, and ``STOP_LOSS_PERCENTAGE`` below the 52-week low (or below
+the entry when the low is unknown). Once a pick has hit its target or stop,
+it keeps that status.
+
+Marks are for display only. The recorded ``status`` in the track record is
+owned by ``backtest.py --write``, which checks every bar since entry rather
+than just the last price.
+"""
+
+import sys
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from backtest import STATUS_ACTIVE, STATUS_STOPPED, STATUS_TARGET, load_picks
+from price_store import PriceStore, load_history
+from providers import MarketDataProvider, call_provider, get_default_provider
+from track_record import TrackRecord
+from universe import nse_symbol
+
+TERMINAL_STATUSES = (STATUS_TARGET, STATUS_STOPPED)
+
+
+def _last_close(history: pd.DataFrame, symbols) -> pd.Series:
+    if history.empty:
+        return pd.Series(np.nan, index=symbols)
+    return history['Close'].ffill().iloc[-1].reindex(symbols)
+
+
+def live_prices(symbols, provider: Optional[MarketDataProvider] = None, snapshot=None) -> pd.Series:
+    """Last close per Yahoo symbol from a single bulk request, bypassing the price store"""
+    provider = provider or get_default_provider()
+    symbols = sorted(set(symbols))
+    if not symbols:
+        return pd.Series(dtype=float)
+
+    def download() -> pd.DataFrame:
+        return call_provider(provider, lambda p: p.history(symbols, period='5d'))
+
+    history = download() if snapshot is None else snapshot.fetch(('market', 'history', tuple(symbols), '5d'), download)
+    return _last_close(history, symbols)
+
+
+def latest_prices(
+    symbols, provider: Optional[MarketDataProvider] = None, snapshot=None, store: Optional[PriceStore] = None
+) -> pd.Series:
+    """Last close per Yahoo symbol from the price store (snapshot runs use ``live_prices``)"""
+    if snapshot is not None:
+        return live_prices(symbols, provider, snapshot)
+    symbols = sorted(set(symbols))
+    if not symbols:
+        return pd.Series(dtype=float)
+    history, _ = load_history(symbols, provider or get_default_provider(), store=store, period='5d')
+    return _last_close(history, symbols)
+
+
+def mark_picks(picks: pd.DataFrame, prices: pd.Series) -> pd.DataFrame:
+    """
+    Add ``current_price``, ``unrealized_pnl_pct``, ``to_target_pct`` and an
+    updated ``status`` column to ``picks`` (which needs ``symbol``, ``entry``,
+    ``target``, ``stop`` and ``status``).
+    """
+    marked = picks.copy()
+    price = prices.reindex([nse_symbol(s) for s in picks['symbol']]).to_numpy(dtype=float)
+    entry = marked['entry'].to_numpy(dtype=float)
+    target = marked['target'].to_numpy(dtype=float)
+    stop = marked['stop'].to_numpy(dtype=float)
+    previous = marked['status'].fillna(STATUS_ACTIVE).to_numpy(dtype=object)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        marked['current_price'] = price
+        marked['unrealized_pnl_pct'] = (price / entry - 1) * 100
+        marked['to_target_pct'] = (target / price - 1) * 100
+        status = np.select([price >= target, price <= stop], [STATUS_TARGET, STATUS_STOPPED], STATUS_ACTIVE)
+
+    sticky = np.isin(previous, TERMINAL_STATUSES)
+    marked['status'] = np.where(sticky, previous, status)
+    return marked
+
+
+def track_record_picks(track_record: TrackRecord, runs_db: Optional[Path] = None) -> pd.DataFrame:
+    """Track-record picks with entry/target/stop levels (see backtest.load_picks) and current status"""
+    statuses = {(e['date'], e['symbol']): e.get('status', STATUS_ACTIVE) for e in track_record}
+    if not statuses:
+        return pd.DataFrame()
+
+    picks = load_picks(runs_db, track_record.path)
+    keys = list(zip(picks['date'], picks['symbol']))
+    picks = picks[[key in statuses for key in keys]].reset_index(drop=True)
+    picks['status'] = [statuses[key] for key in zip(picks['date'], picks['symbol'])]
+    return picks
+
+
+def mark_track_record(
+    track_record: Optional[TrackRecord] = None,
+    provider: Optional[MarketDataProvider] = None,
+    snapshot=None,
+    runs_db: Optional[Path] = None,
+    store: Optional[PriceStore] = None,
+) -> pd.DataFrame:
+    """Mark every pick in the track record (the track record itself is not changed)"""
+    if track_record is None:  # An empty TrackRecord is falsy
+        track_record = TrackRecord()
+    picks = track_record_picks(track_record, runs_db)
+    if picks.empty:
+        return pd.DataFrame()
+
+    prices = latest_prices({nse_symbol(s) for s in picks['symbol']}, provider, snapshot, store)
+    return mark_picks(picks, prices)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Mark the track record to market")
+    parser.add_argument('--data-dir', metavar='DIR', help="Local market data dumps")
+    args = parser.parse_args()
+
+    provider = get_default_provider(Path(args.data_dir) if args.data_dir else None)
+    marked = mark_track_record(provider=provider)
+    if marked.empty:
+        print("No track record yet")
+    else:
+        columns = [
+            'date',
+            'symbol',
+            'entry',
+            'current_price',
+            'target',
+            'unrealized_pnl_pct',
+            'to_target_pct',
+            'status',
+        ]
+        print(marked[columns].round(2).to_string(index=False))
@@ -0,0 +1,280 @@
+"""
+Run instrumentation: stage timings, provider latency, cache and retry counters.
+
+One process-wide ``Metrics`` registry (see ``shared_metrics()``) collects:
+
+- wall and CPU seconds per pipeline stage
+- latency of every provider call attempt, per endpoint (info, balance_sheet,
+  institutional_holders, mutualfund_holders, history) and per ticker
+- hit/miss counts for the response cache and the pipeline artifacts
+- retries per endpoint, rate-limiter wait time and peak RSS
+
+``write()`` exports everything to ``settings.LOGS_DIR``: the latest run as
+JSON, one JSON line per run for week-to-week comparison, and a Prometheus
+textfile-collector file. Only the standard library is used, so importing
+this module keeps the fast CLI paths light.
+"""
+
+import json
+import math
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config import settings
+
+QUANTILES = (0.5, 0.9, 0.99)
+SLOWEST_TICKERS = 10
+
+
+def quantile(sorted_values: List[float], q: float) -> float:
+    """Nearest-rank quantile of an ascending list"""
+    if not sorted_values:
+        return math.nan
+    return sorted_values[min(len(sorted_values) - 1, max(0, math.ceil(q * len(sorted_values)) - 1))]
+
+
+def peak_rss_bytes() -> Optional[int]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class Metrics:
+    """Thread-safe counters and timings for one run"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started = datetime.now()
+        self.stages: Dict[str, Dict[str, Any]] = {}
+        self.latencies: Dict[str, List[float]] = {}  # endpoint -> seconds per attempt
+        self.errors: Dict[str, int] = {}
+        self.retries: Dict[str, int] = {}
+        self.tickers: Dict[str, Dict[str, float]] = {}  # symbol -> endpoint -> seconds
+        self.caches: Dict[str, Dict[str, int]] = {}
+        self.gauges: Dict[str, float] = {}
+
+    @contextmanager
+    def stage(self, name: str, status: str = 'ran') -> Iterator[None]:
+        """Time a block as pipeline stage ``name`` (wall and process CPU seconds)"""
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            self.record_stage(name, time.perf_counter() - wall, time.process_time() - cpu, status)
+
+    def record_stage(self, name: str, wall_seconds: float, cpu_seconds: float, status: str = 'ran'):
+        with self._lock:
+            entry = self.stages.setdefault(name, {'wall_seconds': 0.0, 'cpu_seconds': 0.0, 'runs': 0})
+            entry['wall_seconds'] += wall_seconds
+            entry['cpu_seconds'] += cpu_seconds
+            entry['runs'] += 1
+            entry['status'] = status
+
+    def observe(self, endpoint: str, seconds: float, symbol: Optional[str] = None, ok: bool = True):
+        """Record one provider call attempt"""
+        with self._lock:
+            self.latencies.setdefault(endpoint, []).append(seconds)
+            if not ok:
+                self.errors[endpoint] = self.errors.get(endpoint, 0) + 1
+            if symbol is not None:
+                ticker = self.tickers.setdefault(symbol, {})
+                ticker[endpoint] = ticker.get(endpoint, 0.0) + seconds
+
+    def retry(self, endpoint: str):
+        with self._lock:
+            self.retries[endpoint] = self.retries.get(endpoint, 0) + 1
+
+    def count_cache(self, name: str, hits: int = 0, misses: int = 0):
+        with self._lock:
+            entry = self.caches.setdefault(name, {'hits': 0, 'misses': 0})
+            entry['hits'] += hits
+            entry['misses'] += misses
+
+    def set_gauge(self, name: str, value: float):
+        with self._lock:
+            self.gauges[name] = value
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Everything recorded so far as plain JSON-ready data"""
+        with self._lock:
+            endpoints = {}
+            for endpoint, samples in self.latencies.items():
+                ordered = sorted(samples)
+                endpoints[endpoint] = {
+                    'calls': len(ordered),
+                    'errors': self.errors.get(endpoint, 0),
+                    'retries': self.retries.get(endpoint, 0),
+                    'total_seconds': sum(ordered),
+                    'max_seconds': ordered[-1],
+                    **{f'p{round(q * 100)}_seconds': quantile(ordered, q) for q in QUANTILES},
+                }
+            tickers = {
+                symbol: {**calls, 'total_seconds': sum(calls.values())} for symbol, calls in self.tickers.items()
+            }
+            caches = {
+                name: {**c, 'hit_rate': c['hits'] / (c['hits'] + c['misses']) if c['hits'] + c['misses'] else 0.0}
+                for name, c in self.caches.items()
+            }
+            stages = {name: dict(entry) for name, entry in self.stages.items()}
+            gauges = dict(self.gauges)
+
+        slowest = sorted(tickers, key=lambda s: tickers[s]['total_seconds'], reverse=True)[:SLOWEST_TICKERS]
+        return {
+            'timestamp': self.started.isoformat(timespec='seconds'),
+            'stages': stages,
+            'endpoints': endpoints,
+            'caches': caches,
+            'slowest_tickers': slowest,
+            'tickers': tickers,
+            'peak_rss_bytes': peak_rss_bytes(),
+            **gauges,
+        }
+
+    def write(self, logs_dir: Optional[Path] = None) -> Dict[str, Path]:
+        """Export to ``logs_dir``: latest JSON, JSON-lines history and a Prometheus textfile"""
+        logs_dir = Path(logs_dir or settings.LOGS_DIR)
+        logs_dir.mkdir(parents=True, exist_ok=True)
+        data = self.snapshot()
+        paths = {
+            'json': logs_dir / settings.METRICS_FILE.name,
+            'history': logs_dir / settings.METRICS_HISTORY_FILE.name,
+            'prometheus': logs_dir / settings.METRICS_PROM_FILE.name,
+        }
+        _write_atomic(paths['json'], json.dumps(data, indent=2, default=str) + '\n')
+        with open(paths['history'], 'a', encoding='utf-8') as f:
+            # Per-ticker detail stays in the latest file; history keeps the aggregates
+            f.write(json.dumps({k: v for k, v in data.items() if k != 'tickers'}, default=str) + '\n')
+        # The node_exporter textfile collector may read at any moment, so never expose a partial file
+        _write_atomic(paths['prometheus'], prometheus_text(data))
+        return paths
+
+
+def _write_atomic(path: Path, text: str):
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(text, encoding='utf-8')
+    os.replace(tmp, path)
+
+
+def _label(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _number(value: float) -> str:
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return 'NaN'
+    return repr(float(value))
+
+
+def prometheus_text(data: Dict[str, Any], prefix: str = 'pli') -> str:
+    """Prometheus exposition text for a ``Metrics.snapshot()`` (per-ticker detail omitted)"""
+    lines: List[str] = []
+
+    def family(name: str, kind: str, help_text: str, samples: List[tuple]):
+        if not samples:
+            return
+        lines.append(f"# HELP {prefix}_{name} {help_text}")
+        lines.append(f"# TYPE {prefix}_{name} {kind}")
+        for suffix, labels, value in samples:
+            rendered = ','.join(f'{k}="{_label(v)}"' for k, v in labels.items())
+            lines.append(
+                f"{prefix}_{name}{suffix}{{{rendered}}} {_number(value)}"
+                if rendered
+                else f"{prefix}_{name}{suffix} {_number(value)}"
+            )
+
+    stages, endpoints, caches = data['stages'], data['endpoints'], data['caches']
+    family(
+        'stage_wall_seconds',
+        'gauge',
+        "Wall-clock seconds per pipeline stage",
+        [('', {'stage': s, 'status': e.get('status', 'ran')}, e['wall_seconds']) for s, e in stages.items()],
+    )
+    family(
+        'stage_cpu_seconds',
+        'gauge',
+        "Process CPU seconds per pipeline stage",
+        [('', {'stage': s, 'status': e.get('status', 'ran')}, e['cpu_seconds']) for s, e in stages.items()],
+    )
+
+    latency = []
+    for endpoint, e in endpoints.items():
+        for q in QUANTILES:
+            value = e.get(f'p{round(q * 100)}_seconds')
+            if value is not None:
+                latency.append(('', {'endpoint': endpoint, 'quantile': str(q)}, value))
+        latency.append(('_sum', {'endpoint': endpoint}, e['total_seconds']))
+        latency.append(('_count', {'endpoint': endpoint}, e['calls']))
+    family('provider_call_seconds', 'summary', "Provider call latency per attempt", latency)
+    family(
+        'provider_errors_total',
+        'counter',
+        "Failed provider call attempts",
+        [('', {'endpoint': k}, e['errors']) for k, e in endpoints.items()],
+    )
+    family(
+        'provider_retries_total',
+        'counter',
+        "Provider call retries",
+        [('', {'endpoint': k}, e.get('retries', 0)) for k, e in endpoints.items()],
+    )
+
+    family('cache_hits_total', 'counter', "Cache hits", [('', {'cache': k}, c['hits']) for k, c in caches.items()])
+    family(
+        'cache_misses_total', 'counter', "Cache misses", [('', {'cache': k}, c['misses']) for k, c in caches.items()]
+    )
+    family(
+        'cache_hit_ratio', 'gauge', "Cache hit ratio", [('', {'cache': k}, c['hit_rate']) for k, c in caches.items()]
+    )
+
+    if data.get('peak_rss_bytes') is not None:
+        family('peak_rss_bytes', 'gauge', "Peak resident set size", [('', {}, data['peak_rss_bytes'])])
+    if 'rate_limit_wait_seconds' in data:
+        family(
+            'rate_limit_wait_seconds',
+            'gauge',
+            "Seconds spent waiting on the rate limiter",
+            [('', {}, data['rate_limit_wait_seconds'])],
+        )
+    family(
+        'run_timestamp_seconds',
+        'gauge',
+        "Start of the run (Unix time)",
+        [('', {}, datetime.fromisoformat(data['timestamp']).timestamp())],
+    )
+    return '\n'.join(lines) + '\n'
+
+
+_shared_metrics: Optional[Metrics] = None
+_shared_lock = threading.Lock()
+
+
+def shared_metrics() -> Metrics:
+    """Process-wide registry the hot paths record into"""
+    global _shared_metrics
+    with _shared_lock:
+        if _shared_metrics is None:
+            _shared_metrics = Metrics()
+        return _shared_metrics
+
+
+def reset_metrics() -> Metrics:
+    """Start a fresh registry (e.g. between runs in one process)"""
+    global _shared_metrics
+    with _shared_lock:
+        _shared_metrics = Metrics()
+        return _shared_metrics
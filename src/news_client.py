@@ -0,0 +1,222 @@
+"""
+Asynchronous NewsAPI client.
+
+Runs many ``/v2/everything`` queries at once (one per company, sector and PLI
+keyword), pages through each result set and streams articles to the caller as
+they arrive. Requests share a small pool of keep-alive HTTPS connections, so a
+run costs roughly one round trip per page rather than a new TLS handshake per
+query. Uses only the standard library: blocking ``http.client`` calls run on
+worker threads via ``asyncio.to_thread``.
+"""
+
+import asyncio
+import http.client
+import json
+import urllib.parse
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Optional, Union
+
+NEWS_API_URL = "https://newsapi.org/v2/everything"
+
+# Broad PLI keywords queried alongside company and sector names
+PLI_NEWS_KEYWORDS = [
+    'PLI scheme',
+    'Production Linked Incentive',
+    'iPhone exports India',
+    'electronics component manufacturing India',
+]
+
+
+class NewsAPIError(Exception):
+    """Raised when NewsAPI returns an error response"""
+
+    def __init__(self, status: int, code: str, message: str):
+        super().__init__(f"{status} {code}: {message}")
+        self.status = status
+        self.code = code
+
+
+def build_news_queries(
+    companies: Iterable[str] = (), sectors: Iterable[str] = (), keywords: Iterable[str] = PLI_NEWS_KEYWORDS
+) -> List[str]:
+    """One query per company, sector and keyword, without duplicates"""
+    queries = [f'"{name}"' for name in companies]
+    queries += [f'{sector} India PLI' for sector in sectors]
+    queries += list(keywords)
+    return list(dict.fromkeys(queries))
+
+
+class AsyncNewsClient:
+    """Concurrent, paginating NewsAPI client over pooled keep-alive connections"""
+
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str = NEWS_API_URL,
+        max_connections: int = 4,
+        page_size: int = 100,
+        max_pages: int = 3,
+        timeout: float = 10.0,
+        language: str = 'en',
+        snapshot=None,
+        transport: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None,
+    ):
+        url = urllib.parse.urlsplit(base_url)
+        self.api_key = api_key
+        self.scheme = url.scheme
+        self.host = url.netloc
+        self.path = url.path
+        self.max_connections = max_connections
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self.timeout = timeout
+        self.language = language
+        self.snapshot = snapshot
+        self.transport = transport  # Replaces HTTP: query params -> response JSON (e.g. SyntheticNewsSource)
+        self.requests = 0
+        self.errors: Dict[str, Exception] = {}
+        self._pool: Optional[asyncio.Queue] = None
+        self._connections: List[http.client.HTTPConnection] = []
+
+    # ---------------------------------------------------------------- pool
+
+    def _new_connection(self) -> http.client.HTTPConnection:
+        if self.scheme == 'https':
+            return http.client.HTTPSConnection(self.host, timeout=self.timeout)
+        return http.client.HTTPConnection(self.host, timeout=self.timeout)
+
+    def _ensure_pool(self) -> asyncio.Queue:
+        if self._pool is None:
+            self._pool = asyncio.Queue()
+            for _ in range(self.max_connections):
+                conn = self._new_connection()
+                self._connections.append(conn)
+                self._pool.put_nowait(conn)
+        return self._pool
+
+    def close(self):
+        for conn in self._connections:
+            conn.close()
+        self._connections = []
+        self._pool = None
+
+    async def __aenter__(self) -> 'AsyncNewsClient':
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.close()
+
+    # ------------------------------------------------------------ requests
+
+    def _request_sync(self, conn: http.client.HTTPConnection, params: Dict[str, Any]) -> Dict[str, Any]:
+        """One blocking GET on a pooled connection; reconnects transparently if it was dropped"""
+        target = f"{self.path}?{urllib.parse.urlencode(params)}"
+        headers = {
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+            'X-Api-Key': self.api_key,
+            'Connection': 'keep-alive',
+        }
+        try:
+            conn.request('GET', target, headers=headers)
+            response = conn.getresponse()
+            body = response.read()
+        except (http.client.HTTPException, OSError):
+            # Server closed an idle keep-alive socket; retry once on a fresh one
+            conn.close()
+            conn.request('GET', target, headers=headers)
+            response = conn.getresponse()
+            body = response.read()
+
+        data = json.loads(body.decode('utf-8'))
+        if response.status != 200 or data.get('status') != 'ok':
+            raise NewsAPIError(response.status, data.get('code', 'unknown'), data.get('message', ''))
+        return data
+
+    async def _get(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        if self.transport is not None:
+            self.requests += 1
+            return await asyncio.to_thread(self.transport, params)
+        pool = self._ensure_pool()
+        conn = await pool.get()
+        try:
+            self.requests += 1
+            return await asyncio.to_thread(self._request_sync, conn, params)
+        finally:
+            pool.put_nowait(conn)
+
+    async def _page(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        if self.snapshot is None:
+            return await self._get(params)
+        # Snapshot key leaves out the rolling 'from' cursor
+        key = ('newsapi', params['q'], params['page'], params['pageSize'], params['sortBy'], params['language'])
+        if self.snapshot.replaying:
+            return self.snapshot.fetch(key)
+        data = await self._get(params)
+        return self.snapshot.fetch(key, lambda: data)
+
+    async def iter_query(self, query: str, since: Optional[str] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Yield every article for one query, page by page"""
+        params = {
+            'q': query,
+            'pageSize': self.page_size,
+            'sortBy': 'publishedAt',
+            'language': self.language,
+        }
+        if since:
+            params['from'] = since
+
+        fetched = 0
+        for page in range(1, self.max_pages + 1):
+            data = await self._page(dict(params, page=page))
+            articles = data.get('articles', [])
+            for article in articles:
+                yield article
+            fetched += len(articles)
+            if len(articles) < self.page_size or fetched >= data.get('totalResults', 0):
+                break
+
+    async def stream(
+        self, queries: Iterable[str], since: Union[None, str, Dict[str, str]] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Run all queries concurrently and yield articles as they arrive.
+
+        Args:
+            queries: NewsAPI query strings
+            since: ISO timestamp for every query, or a per-query ``{query: timestamp}`` map
+
+        Yields:
+            Raw NewsAPI article dicts with the originating ``query`` added
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        done = object()
+        queries = list(queries)
+
+        async def run(query: str):
+            cursor = since.get(query) if isinstance(since, dict) else since
+            try:
+                async for article in self.iter_query(query, cursor):
+                    await queue.put(dict(article, query=query))
+            except Exception as e:
+                # Free-tier limits (e.g. maximumResultsReached) end one query, not the run
+                self.errors[query] = e
+            finally:
+                await queue.put(done)
+
+        tasks = [asyncio.create_task(run(q)) for q in queries]
+        remaining = len(tasks)
+        try:
+            while remaining:
+                item = await queue.get()
+                if item is done:
+                    remaining -= 1
+                else:
+                    yield item
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def fetch_all(
+        self, queries: Iterable[str], since: Union[None, str, Dict[str, str]] = None
+    ) -> List[Dict[str, Any]]:
+        """Collect the full stream into a list"""
+        return [article async for article in self.stream(queries, since)]
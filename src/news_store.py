@@ -0,0 +1,162 @@
+"""
+Local article store for incremental news fetching.
+
+Articles are kept in SQLite keyed by a hash of their URL and indexed by
+``publishedAt``. Each query remembers the newest article it has seen, so the
+next fetch only asks NewsAPI for anything after that cursor; articles found by
+several queries are stored once and linked to every query that found them.
+"""
+
+import hashlib
+import json
+import sqlite3
+import sys
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config import settings
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    url_hash TEXT PRIMARY KEY,
+    url TEXT,
+    title TEXT,
+    description TEXT,
+    source TEXT,
+    published_at TEXT,
+    fetched_at TEXT,
+    raw TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_articles_published ON articles(published_at);
+CREATE TABLE IF NOT EXISTS article_queries (
+    query TEXT,
+    url_hash TEXT,
+    PRIMARY KEY (query, url_hash)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS cursors (
+    query TEXT PRIMARY KEY,
+    last_published_at TEXT,
+    updated_at TEXT
+);
+"""
+
+
+def article_hash(article: Dict[str, Any]) -> str:
+    """Stable identity for an article: its URL, or title + timestamp when missing"""
+    key = article.get('url') or f"{article.get('title', '')}|{article.get('publishedAt', '')}"
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+
+class NewsStore:
+    """SQLite-backed article history with per-query since-cursors"""
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path or settings.NEWS_DB_PATH)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+    def close(self):
+        self._conn.close()
+
+    def __enter__(self) -> 'NewsStore':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def cursor(self, query: str) -> Optional[str]:
+        """Newest ``publishedAt`` seen for a query"""
+        row = self._conn.execute("SELECT last_published_at FROM cursors WHERE query = ?", (query,)).fetchone()
+        return row[0] if row else None
+
+    def since_map(self, queries: Iterable[str], lookback_days: int = 7) -> Dict[str, str]:
+        """NewsAPI ``from`` value per query: its cursor, or a lookback window for new queries"""
+        default = (datetime.now() - timedelta(days=lookback_days)).strftime('%Y-%m-%d')
+        since = {}
+        for query in queries:
+            cursor = self.cursor(query)
+            # NewsAPI wants ISO 8601 without the trailing Z
+            since[query] = cursor.rstrip('Z') if cursor else default
+        return since
+
+    def add(self, article: Dict[str, Any], query: Optional[str] = None) -> bool:
+        """Store one article; returns False if it was already known"""
+        url_hash = article_hash(article)
+        published = article.get('publishedAt') or ''
+        with self._lock, self._conn:
+            inserted = (
+                self._conn.execute(
+                    "INSERT OR IGNORE INTO articles VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        url_hash,
+                        article.get('url'),
+                        article.get('title'),
+                        article.get('description'),
+                        (article.get('source') or {}).get('name'),
+                        published,
+                        datetime.now().isoformat(),
+                        json.dumps({k: v for k, v in article.items() if k != 'query'}),
+                    ),
+                ).rowcount
+                == 1
+            )
+            if query:
+                self._conn.execute("INSERT OR IGNORE INTO article_queries VALUES (?, ?)", (query, url_hash))
+        return inserted
+
+    def advance_cursor(self, query: str, published_at: str):
+        """Move a query's cursor forward (never backwards)"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO cursors VALUES (?, ?, ?) "
+                "ON CONFLICT(query) DO UPDATE SET "
+                "last_published_at = MAX(last_published_at, excluded.last_published_at), "
+                "updated_at = excluded.updated_at",
+                (query, published_at, datetime.now().isoformat()),
+            )
+
+    def articles_for(self, query: str, since: Optional[str] = None, limit: int = 50) -> List[Dict[str, Any]]:
+        """Newest-first articles found by a query"""
+        rows = self._conn.execute(
+            "SELECT a.raw FROM articles a JOIN article_queries q ON q.url_hash = a.url_hash "
+            "WHERE q.query = ? AND a.published_at >= ? ORDER BY a.published_at DESC LIMIT ?",
+            (query, since or '', limit),
+        ).fetchall()
+        return [json.loads(r['raw']) for r in rows]
+
+    def latest(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """Newest-first articles across all queries"""
+        rows = self._conn.execute("SELECT raw FROM articles ORDER BY published_at DESC LIMIT ?", (limit,)).fetchall()
+        return [json.loads(r['raw']) for r in rows]
+
+    def count(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+
+    async def sync(self, client, queries: Iterable[str], lookback_days: int = 7) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Incrementally fetch ``queries`` through an AsyncNewsClient.
+
+        Only articles newer than each query's cursor are requested, and only
+        articles not already in the store are yielded. Cursors move only for
+        queries that completed, so a failed page is retried next run.
+        """
+        queries = list(queries)
+        newest: Dict[str, str] = {}
+        async for article in client.stream(queries, since=self.since_map(queries, lookback_days)):
+            query = article.get('query')
+            published = article.get('publishedAt') or ''
+            if query and published > newest.get(query, ''):
+                newest[query] = published
+            if self.add(article, query):
+                yield article
+
+        for query, published in newest.items():
+            if query not in client.errors:
+                self.advance_cursor(query, published)
@@ -0,0 +1,378 @@
+"""
+Parallel parameter sweep over scoring weights and trigger percentages.
+
+Rule firings are weight independent, so they are evaluated once for every
+(rebalance date, symbol) pair of the cached price history. Each parameter set
+then only costs a matrix product (scores), an argmax (the weekly top pick)
+and a vectorized trade simulation (see backtest.simulate_trades).
+
+The price matrices and the firing tensor are placed in shared memory once;
+worker processes attach to them read-only instead of receiving a pickled copy
+with every task.
+
+A pick is bought when its price touches ``low_52w * BUY_TRIGGER_PERCENTAGE``
+within ``horizon`` bars, then held until the 52-week high (target),
+``low_52w * STOP_LOSS_PERCENTAGE`` (stop) or ``horizon`` more bars. Weeks
+without an entry count as a 0% return.
+"""
+
+import itertools
+import math
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from multiprocessing.shared_memory import SharedMemory
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config import settings
+from backtest import simulate_trades
+from price_analytics import HORIZONS, WINDOW_52W
+from price_history import price_field
+from rule_engine import RuleSet, default_rules
+from universe import nse_symbol
+
+TRIGGER_PARAMS = ['BUY_TRIGGER_PERCENTAGE', 'STOP_LOSS_PERCENTAGE']
+METRICS = ['mean_return_pct', 'hit_rate', 'win_rate', 'trades']
+
+DEFAULT_TRIGGER_GRID = {
+    'BUY_TRIGGER_PERCENTAGE': [1.0, 1.02, 1.05, 1.1],
+    'STOP_LOSS_PERCENTAGE': [0.9, 0.93, 0.95, 0.98],
+}
+# Weight levels for rules missing from a grid space: each rule off or at its current weight
+DEFAULT_WEIGHT_LEVELS = (0, 1)
+# Grids past this size should use random search (--samples) instead
+MAX_GRID_SETS = 10_000
+DEFAULT_TRIGGER_RANGES = {
+    'BUY_TRIGGER_PERCENTAGE': (1.0, 1.15),
+    'STOP_LOSS_PERCENTAGE': (0.85, 0.99),
+}
+
+
+# ------------------------------------------------------------ inputs
+
+
+def build_sweep_data(
+    history: pd.DataFrame,
+    companies: List[Dict[str, Any]],
+    rules: Optional[RuleSet] = None,
+    rebalance_every: int = 5,
+    warmup: Optional[int] = None,
+) -> Dict[str, np.ndarray]:
+    """
+    Precompute everything that does not depend on the swept parameters.
+
+    Price-derived rule columns (``current_price``, 52-week low/high,
+    ``three_month_change``, ``avg_volume``) are recomputed as of every
+    rebalance date; other columns (expert overlay, fundamentals) come from
+    ``companies`` and are held constant.
+    """
+    rules = rules or default_rules()
+    close = price_field(history, 'Close')
+    symbols = list(close.columns)
+    n_days, n_symbols = close.shape
+
+    low_52w = price_field(history, 'Low').rolling(WINDOW_52W, min_periods=1).min()
+    high_52w = price_field(history, 'High').rolling(WINDOW_52W, min_periods=1).max()
+    dynamic = {
+        'current_price': close,
+        'fifty_two_week_low': low_52w,
+        'fifty_two_week_high': high_52w,
+        'three_month_change': (close / close.shift(HORIZONS['three_month_change']) - 1) * 100,
+    }
+    if 'Volume' in history.columns.get_level_values(0):
+        dynamic['avg_volume'] = history['Volume'].rolling(63, min_periods=1).mean()
+
+    warmup = min(252, n_days // 2) if warmup is None else warmup
+    rebalance = np.arange(warmup, n_days, rebalance_every)
+    n_dates = len(rebalance)
+
+    by_symbol = {nse_symbol(c['symbol']): c for c in companies if c.get('symbol')}
+    static = rules.frame_from_companies([by_symbol.get(s, {}) for s in symbols])
+    columns = {}
+    for name in rules.columns:
+        if name in dynamic:
+            columns[name] = dynamic[name].to_numpy(dtype=float)[rebalance].ravel()
+        else:
+            columns[name] = np.tile(static[name].to_numpy(), n_dates)
+    fired = rules.evaluate(pd.DataFrame(columns, index=pd.RangeIndex(n_dates * n_symbols)))
+
+    return {
+        'close': np.ascontiguousarray(close.to_numpy(dtype=float).T),
+        'high': np.ascontiguousarray(price_field(history, 'High').to_numpy(dtype=float).T),
+        'low': np.ascontiguousarray(price_field(history, 'Low').to_numpy(dtype=float).T),
+        'low_52w': low_52w.to_numpy(dtype=float)[rebalance],
+        'high_52w': high_52w.to_numpy(dtype=float)[rebalance],
+        'fired': fired.reshape(n_dates, n_symbols, len(rules.rules)).astype(float),
+        'rebalance': rebalance,
+    }
+
+
+def param_names(rules: RuleSet) -> List[str]:
+    """Column order of a parameter matrix: rule weights, then trigger percentages"""
+    return [r.name for r in rules.rules] + TRIGGER_PARAMS
+
+
+def base_params(rules: RuleSet) -> Dict[str, float]:
+    """The current hand-picked weights and settings"""
+    params = {r.name: float(w) for r, w in zip(rules.rules, rules.weights)}
+    params.update({name: float(getattr(settings, name)) for name in TRIGGER_PARAMS})
+    return params
+
+
+def grid_params(
+    rules: RuleSet,
+    space: Optional[Dict[str, Sequence[float]]] = None,
+    weight_levels: Sequence[float] = DEFAULT_WEIGHT_LEVELS,
+    max_sets: Optional[int] = MAX_GRID_SETS,
+) -> np.ndarray:
+    """
+    Every combination of the values in ``space``.
+
+    Parameters missing from ``space`` sweep their current weight scaled by
+    ``weight_levels``; trigger percentages default to DEFAULT_TRIGGER_GRID.
+    Raises ValueError before expanding a grid larger than ``max_sets``.
+    """
+    base = base_params(rules)
+    space = dict(DEFAULT_TRIGGER_GRID, **(space or {}))
+    axes = [
+        sorted(set(space.get(name, [base[name] * level for level in weight_levels]))) for name in param_names(rules)
+    ]
+    size = math.prod(len(axis) for axis in axes)
+    if max_sets is not None and size > max_sets:
+        raise ValueError(
+            f"Grid has {size} parameter sets (limit {max_sets}); narrow the space or use random search (--samples)"
+        )
+    return np.array(list(itertools.product(*axes)), dtype=float)
+
+
+def random_params(
+    rules: RuleSet, samples: int, ranges: Optional[Dict[str, Tuple[float, float]]] = None, seed: int = 0
+) -> np.ndarray:
+    """
+    Uniform random parameter sets.
+
+    Weights default to integers between 0 and twice their current value, so a
+    penalty stays a penalty; the current parameters are always the first row.
+    """
+    base = base_params(rules)
+    ranges = dict(DEFAULT_TRIGGER_RANGES, **(ranges or {}))
+    rng = np.random.default_rng(seed)
+    columns = []
+    for name in param_names(rules):
+        if name in ranges:
+            lo, hi = ranges[name]
+            columns.append(rng.uniform(lo, hi, samples))
+        else:
+            lo, hi = sorted((0.0, 2 * base[name]))
+            columns.append(rng.integers(int(lo), int(hi) + 1, samples).astype(float))
+    params = np.column_stack(columns)
+    params[0] = [base[name] for name in param_names(rules)]
+    return params
+
+
+# ------------------------------------------------------------ evaluation
+
+
+def evaluate_params(data: Dict[str, np.ndarray], params: np.ndarray, horizon: int = 63) -> np.ndarray:
+    """Backtest metrics (columns as METRICS) for each row of ``params``"""
+    fired, rebalance = data['fired'], data['rebalance']
+    close, high, low = data['close'], data['high'], data['low']
+    n_dates = len(rebalance)
+    n_rules = fired.shape[2]
+    rows = np.arange(n_dates)
+    days = np.arange(close.shape[1])
+    # Symbols without a price on the rebalance date can't be picked
+    tradable = ~np.isnan(close[:, rebalance].T)
+
+    metrics = np.full((len(params), len(METRICS)), np.nan)
+    for i, p in enumerate(params):
+        scores = np.where(tradable, fired @ p[:n_rules], -np.inf)
+        pick = scores.argmax(axis=1)
+        low_52w = data['low_52w'][rows, pick]
+        trigger = low_52w * p[n_rules]
+        target = data['high_52w'][rows, pick]
+        stop = low_52w * p[n_rules + 1]
+        close_paths, high_paths, low_paths = close[pick], high[pick], low[pick]
+
+        with np.errstate(invalid='ignore'):
+            waiting = (days > rebalance[:, None]) & (days <= rebalance[:, None] + horizon)
+            entry_bars = waiting & (low_paths <= trigger[:, None])
+        entered = entry_bars.any(axis=1)
+        entry_bar = entry_bars.argmax(axis=1)
+        # Gap-downs fill at the bar's high rather than the trigger
+        entry = np.minimum(trigger, high_paths[rows, entry_bar])
+
+        trades = simulate_trades(
+            entry_bar + 1, target, stop, close_paths, high_paths, low_paths, end=entry_bar + 1 + horizon
+        )
+        live = entered & trades['traded']
+        returns = np.where(live, trades['exit_price'] / entry - 1, 0.0) * 100
+        closed = live & (trades['stopped'] | trades['hit'])
+
+        metrics[i] = [
+            returns.mean() if n_dates else np.nan,
+            (trades['hit'] & live).sum() / closed.sum() if closed.any() else np.nan,
+            (returns[live] > 0).mean() if live.any() else np.nan,
+            live.sum(),
+        ]
+    return metrics
+
+
+_shared: Dict[str, np.ndarray] = {}
+_blocks: List[SharedMemory] = []
+
+
+def _share(arrays: Dict[str, np.ndarray]) -> Tuple[List[SharedMemory], Dict[str, Tuple[str, tuple, str]]]:
+    """Copy arrays into shared memory blocks once; returns the blocks and attach specs"""
+    blocks, specs = [], {}
+    for name, array in arrays.items():
+        array = np.ascontiguousarray(array)
+        block = SharedMemory(create=True, size=max(array.nbytes, 1))
+        np.ndarray(array.shape, array.dtype, buffer=block.buf)[...] = array
+        blocks.append(block)
+        specs[name] = (block.name, array.shape, array.dtype.str)
+    return blocks, specs
+
+
+def _attach(specs: Dict[str, Tuple[str, tuple, str]]):
+    """Worker initializer: map the parent's blocks as read-only arrays"""
+    for name, (block_name, shape, dtype) in specs.items():
+        block = SharedMemory(name=block_name)
+        array = np.ndarray(shape, np.dtype(dtype), buffer=block.buf)
+        array.flags.writeable = False
+        _blocks.append(block)
+        _shared[name] = array
+
+
+def _evaluate_chunk(args: Tuple[np.ndarray, int]) -> np.ndarray:
+    params, horizon = args
+    return evaluate_params(_shared, params, horizon)
+
+
+def run_sweep(
+    data: Dict[str, np.ndarray],
+    params: np.ndarray,
+    names: Sequence[str],
+    workers: Optional[int] = None,
+    horizon: int = 63,
+    chunk_size: int = 128,
+) -> pd.DataFrame:
+    """
+    Evaluate every parameter set across a process pool.
+
+    Returns:
+        One row per parameter set with METRICS columns, best mean return first
+    """
+    workers = workers or os.cpu_count() or 1
+    chunks = [params[i : i + chunk_size] for i in range(0, len(params), chunk_size)]
+
+    if workers == 1 or len(chunks) <= 1:
+        metrics = [evaluate_params(data, chunk, horizon) for chunk in chunks]
+    else:
+        blocks, specs = _share(data)
+        try:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_attach, initargs=(specs,)) as pool:
+                metrics = list(pool.map(_evaluate_chunk, [(chunk, horizon) for chunk in chunks]))
+        finally:
+            for block in blocks:
+                block.close()
+                block.unlink()
+
+    results = pd.DataFrame(params, columns=list(names))
+    results[METRICS] = np.vstack(metrics) if metrics else np.empty((0, len(METRICS)))
+    results['trades'] = results['trades'].astype(int)
+    return results.sort_values('mean_return_pct', ascending=False, kind='stable').reset_index(drop=True)
+
+
+def main(
+    samples: int = 2000,
+    grid: bool = False,
+    seed: int = 0,
+    workers: Optional[int] = None,
+    horizon: int = 63,
+    period: str = '2y',
+    record: Optional[str] = None,
+    replay: Optional[str] = None,
+    data_dir: Optional[str] = None,
+    top: int = 10,
+):
+    from dynamic_pli_analyzer import discover_companies_with_expert_insights, load_price_history
+    from providers import get_default_provider
+    from snapshot import open_snapshot
+    from universe import build_universe, sector_map
+
+    rules = default_rules()
+    params = grid_params(rules) if grid else random_params(rules, samples, seed=seed)
+    print(f"🧪 Sweeping {len(params)} parameter sets ({'grid' if grid else 'random search'})")
+
+    snapshot = open_snapshot(record, replay)
+    provider = get_default_provider(Path(data_dir) if data_dir else None)
+    universe = build_universe()
+    symbols = [s for sector_symbols in universe.values() for s in sector_symbols]
+
+    history = load_price_history(symbols, period=period, snapshot=snapshot, provider=provider)
+    companies = discover_companies_with_expert_insights(
+        symbols, history=history, snapshot=snapshot, provider=provider, sectors=sector_map(universe)
+    )
+    if snapshot is not None and not snapshot.replaying:
+        snapshot.save()
+
+    data = build_sweep_data(history, companies, rules)
+    print(f"   over {len(data['rebalance'])} rebalance dates x {data['close'].shape[0]} symbols")
+
+    started = datetime.now()
+    results = run_sweep(data, params, param_names(rules), workers=workers, horizon=horizon)
+    elapsed = (datetime.now() - started).total_seconds()
+    print(f"✅ Done in {elapsed:.1f}s ({len(params) / max(elapsed, 1e-9):.0f} sets/s)")
+
+    baseline = results[
+        np.all(results[param_names(rules)].to_numpy() == [base_params(rules)[n] for n in param_names(rules)], axis=1)
+    ]
+    if len(baseline):
+        print(f"   Current settings: {baseline['mean_return_pct'].iloc[0]:.2f}% mean return per pick week")
+    print(results.head(top).round(3).to_string())
+
+    settings.LOGS_DIR.mkdir(parents=True, exist_ok=True)
+    out_file = settings.LOGS_DIR / f"param_sweep_{datetime.now().strftime('%Y%m%d_%H%M')}.csv"
+    results.to_csv(out_file, index=False)
+    print(f"💾 Results saved to {out_file}")
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Sweep scoring weights and trigger percentages")
+    parser.add_argument('--samples', type=int, default=2000, help="Random parameter sets to try")
+    parser.add_argument(
+        '--grid', action='store_true', help=f"Full grid instead of random search (at most {MAX_GRID_SETS} sets)"
+    )
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, help="Worker processes (default: all cores)")
+    parser.add_argument('--horizon', type=int, default=63, help="Max bars to wait for entry and to hold")
+    parser.add_argument('--period', default='2y', help="History to backtest over")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--record', metavar='FILE', help="Record market data to a snapshot file")
+    mode.add_argument('--replay', metavar='FILE', help="Replay market data from a snapshot file")
+    parser.add_argument('--data-dir', metavar='DIR', help="Local market data dumps")
+    parser.add_argument('--top', type=int, default=10, help="Parameter sets to print")
+    args = parser.parse_args()
+    main(
+        samples=args.samples,
+        grid=args.grid,
+        seed=args.seed,
+        workers=args.workers,
+        horizon=args.horizon,
+        period=args.period,
+        record=args.record,
+        replay=args.replay,
+        data_dir=args.data_dir,
+        top=args.top,
+    )
@@ -0,0 +1,367 @@
+"""
+Staged analysis pipeline with content-addressed artifacts.
+
+The weekly run is five stages::
+
+    fetch → enrich → score → render
+                          └──────────→ publish
+
+Each stage's output is stored under ``settings.ARTIFACTS_DIR/<stage>/<key>``.
+The key is a hash of the stage's parameters, its dependencies' keys and the
+source of the modules that implement it. A stage whose key already has an
+artifact is loaded instead of run, and its own dependencies are never
+touched. Editing ``config/scoring_rules.json`` therefore re-runs score,
+render and publish from the cached fetch.
+
+Fetch is keyed by the universe and the trading date (or the replayed
+snapshot's contents), so repeated runs on one day hit the network once.
+``--force`` re-runs every stage up to the target.
+"""
+
+import gzip
+import hashlib
+import io
+import json
+import os
+import pickle
+import sys
+import time
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config import settings
+from dynamic_pli_analyzer import (
+    EXPERT_INSIGHTS,
+    build_companies,
+    calculate_buy_trigger,
+    fetch_company_data,
+    load_price_history,
+    run_record,
+)
+from metrics import shared_metrics
+from report_renderer import default_format, render_report
+from run_store import RunStore
+from snapshot import open_snapshot
+from universe import build_universe, sector_map
+
+ROOT_DIR = settings.ROOT_DIR
+
+
+class PipelineOptions(NamedTuple):
+    """Everything outside the artifacts that a stage may read"""
+
+    symbols: Tuple[str, ...]
+    sectors: Dict[str, str]
+    data_dir: Optional[str] = None
+    replay: Optional[str] = None
+    rules_file: Optional[str] = None
+    fmt: str = 'plain'
+    readme: bool = True
+    runs_db: Optional[str] = None
+
+
+class Stage(NamedTuple):
+    name: str
+    deps: Tuple[str, ...]
+    modules: Tuple[str, ...]  # Source files (relative to the repo root) that make up the code version
+    params: Callable[[PipelineOptions], Dict[str, Any]]
+    run: Callable[[Dict[str, Any], PipelineOptions], Any]
+
+
+def file_digest(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+# ---- artifacts
+
+
+class ArtifactStore:
+    """Gzipped pickles addressed by stage name and key"""
+
+    def __init__(self, root: Optional[Path] = None):
+        self.root = Path(root or settings.ARTIFACTS_DIR)
+
+    def path(self, stage: str, key: str) -> Path:
+        return self.root / stage / f"{key}.pkl.gz"
+
+    def has(self, stage: str, key: str) -> bool:
+        return self.path(stage, key).exists()
+
+    def load(self, stage: str, key: str) -> Any:
+        with gzip.open(self.path(stage, key), 'rb') as f:
+            return pickle.load(f)
+
+    def save(self, stage: str, key: str, value: Any) -> Path:
+        target = self.path(stage, key)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        # Write then rename so an interrupted run never leaves a truncated artifact
+        tmp = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+        with gzip.open(tmp, 'wb', compresslevel=6) as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, target)
+        return target
+
+
+# ---- stages
+
+
+def _fetch_params(options: PipelineOptions) -> Dict[str, Any]:
+    source = {'snapshot': file_digest(Path(options.replay))} if options.replay else {'as_of': date.today().isoformat()}
+    return {
+        'symbols': list(options.symbols),
+        'sectors': options.sectors,
+        'data_dir': options.data_dir,
+        'period': settings.PRICE_HISTORY_PERIOD,
+        **source,
+    }
+
+
+def _fetch(inputs: Dict[str, Any], options: PipelineOptions) -> Dict[str, Any]:
+    from providers import get_default_provider
+
+    symbols = list(options.symbols)
+    snapshot = open_snapshot(replay=options.replay)
+    provider = get_default_provider(Path(options.data_dir) if options.data_dir else None)
+    history = load_price_history(symbols, period=settings.PRICE_HISTORY_PERIOD, snapshot=snapshot, provider=provider)
+    raw = fetch_company_data(symbols, snapshot=snapshot, provider=provider, sectors=options.sectors)
+    return {'symbols': symbols, 'history': history, 'raw': raw, 'timestamp': datetime.now()}
+
+
+def _enrich(inputs: Dict[str, Any], options: PipelineOptions) -> Dict[str, Any]:
+    fetched = inputs['fetch']
+    companies = build_companies(fetched['symbols'], fetched['raw'], fetched['history'], options.sectors)
+    return {'companies': companies, 'timestamp': fetched['timestamp']}
+
+
+def _score_params(options: PipelineOptions) -> Dict[str, Any]:
+    from rule_engine import settings_constants
+
+    rules_file = Path(options.rules_file or settings.SCORING_RULES_FILE)
+    return {'rules': file_digest(rules_file), 'constants': settings_constants(), 'top_k': settings.SCORING_TOP_K}
+
+
+def _score(inputs: Dict[str, Any], options: PipelineOptions) -> Dict[str, Any]:
+    from rule_engine import RuleSet
+    from scoring import score_companies
+
+    # Artifacts loaded in this process may be shared, so score a private copy
+    companies = pickle.loads(pickle.dumps(inputs['enrich']['companies']))
+    asymmetry = score_companies(companies, RuleSet.from_file(options.rules_file), top_k=settings.SCORING_TOP_K)
+    return {'companies': companies, 'asymmetry': asymmetry, 'timestamp': inputs['enrich']['timestamp']}
+
+
+def _render(inputs: Dict[str, Any], options: PipelineOptions) -> str:
+    scored = inputs['score']
+    top = scored['asymmetry']['top_company']
+    buffer = io.StringIO()
+    render_report(
+        scored['companies'],
+        scored['asymmetry'],
+        EXPERT_INSIGHTS,
+        out=buffer,
+        fmt=options.fmt,
+        levels=calculate_buy_trigger(top) if top else None,
+        timestamp=scored['timestamp'],
+    )
+    return buffer.getvalue()
+
+
+def _publish(inputs: Dict[str, Any], options: PipelineOptions) -> Dict[str, Any]:
+    scored = inputs['score']
+    if scored['asymmetry']['top_company'] is None:
+        return {'run_id': None}
+    run_data = run_record(scored['asymmetry'], scored['timestamp'])
+    with RunStore(Path(options.runs_db) if options.runs_db else None) as store:
+        run_id = store.append_run(run_data)
+    if options.readme:
+        sys.path.append(str(ROOT_DIR / "scripts"))
+        from update_readme import ReadmeUpdater
+
+        ReadmeUpdater().update_readme(analysis=run_data)
+    return {'run_id': run_id}
+
+
+STAGES = (
+    Stage(
+        'fetch',
+        (),
+        (
+            'src/dynamic_pli_analyzer.py',
+            'src/providers.py',
+            'src/fetch_engine.py',
+            'src/snapshot.py',
+            'src/price_history.py',
+            'src/price_store.py',
+        ),
+        _fetch_params,
+        _fetch,
+    ),
+    Stage('enrich', ('fetch',), ('src/dynamic_pli_analyzer.py', 'src/price_analytics.py'), lambda options: {}, _enrich),
+    Stage('score', ('enrich',), ('src/scoring.py', 'src/rule_engine.py'), _score_params, _score),
+    Stage(
+        'render',
+        ('score',),
+        ('src/report_renderer.py', 'src/dynamic_pli_analyzer.py'),
+        lambda options: {'format': options.fmt},
+        _render,
+    ),
+    Stage(
+        'publish',
+        ('score', 'render'),
+        ('src/run_store.py', 'src/dynamic_pli_analyzer.py', 'scripts/update_readme.py'),
+        lambda options: {'readme': options.readme, 'runs_db': options.runs_db},
+        _publish,
+    ),
+)
+STAGE_NAMES = [stage.name for stage in STAGES]
+
+
+class Pipeline:
+    """Runs stages on demand, loading any stage whose key already has an artifact"""
+
+    def __init__(
+        self,
+        options: PipelineOptions,
+        store: Optional[ArtifactStore] = None,
+        stages: Tuple[Stage, ...] = STAGES,
+        report: Callable[[str], None] = print,
+    ):
+        self.options = options
+        self.store = store or ArtifactStore()
+        self.stages = {stage.name: stage for stage in stages}
+        self.report = report
+        self.status: Dict[str, str] = {}  # stage -> 'cached' or 'ran'
+        self._keys: Dict[str, str] = {}
+        self._outputs: Dict[str, Any] = {}
+        self._force: set = set()
+
+    def upstream(self, name: str) -> List[str]:
+        """``name`` and every stage it depends on, dependencies first"""
+        order: List[str] = []
+        for dep in self.stages[name].deps:
+            order.extend(s for s in self.upstream(dep) if s not in order)
+        return order + [name]
+
+    def key(self, name: str) -> str:
+        if name not in self._keys:
+            stage = self.stages[name]
+            spec = {
+                'stage': name,
+                'params': stage.params(self.options),
+                'deps': {dep: self.key(dep) for dep in stage.deps},
+                'code': {module: file_digest(ROOT_DIR / module) for module in stage.modules},
+            }
+            self._keys[name] = hashlib.sha256(json.dumps(spec, sort_keys=True, default=str).encode()).hexdigest()
+        return self._keys[name]
+
+    def output(self, name: str) -> Any:
+        if name in self._outputs:
+            return self._outputs[name]
+        key = self.key(name)
+        metrics = shared_metrics()
+        if name not in self._force and self.store.has(name, key):
+            with metrics.stage(name, status='cached'):
+                value = self.store.load(name, key)
+            metrics.count_cache('artifacts', hits=1)
+            self.status[name] = 'cached'
+            self.report(f"✓ {name:<8} cached  {key[:12]}")
+        else:
+            stage = self.stages[name]
+            inputs = {dep: self.output(dep) for dep in stage.deps}
+            started = time.perf_counter()
+            with metrics.stage(name):
+                value = stage.run(inputs, self.options)
+            self.store.save(name, key, value)
+            metrics.count_cache('artifacts', misses=1)
+            self.status[name] = 'ran'
+            self.report(f"▶ {name:<8} ran     {key[:12]} in {time.perf_counter() - started:.2f}s")
+        self._outputs[name] = value
+        return value
+
+    def run(self, target: str = 'publish', force: bool = False) -> Any:
+        """Output of ``target``, running only stages without a matching artifact"""
+        if target not in self.stages:
+            raise ValueError(f"Unknown stage: {target} (choose from {', '.join(self.stages)})")
+        if force:
+            self._force = set(self.upstream(target))
+        return self.output(target)
+
+
+def main(
+    stage: str = 'publish',
+    force: bool = False,
+    replay: Optional[str] = None,
+    data_dir: Optional[str] = None,
+    universe_file: Optional[str] = None,
+    rules_file: Optional[str] = None,
+    report_format: Optional[str] = None,
+    readme: bool = True,
+) -> Pipeline:
+    """Run the pipeline up to ``stage`` and print the report when it was rendered"""
+    universe = build_universe(symbols_file=Path(universe_file) if universe_file else None)
+    symbols = tuple(s for sector_symbols in universe.values() for s in sector_symbols)
+    options = PipelineOptions(
+        symbols=symbols,
+        sectors=sector_map(universe),
+        data_dir=data_dir,
+        replay=replay,
+        rules_file=rules_file,
+        fmt=report_format or default_format(sys.stdout),
+        readme=readme,
+    )
+
+    pipeline = Pipeline(options)
+    result = pipeline.run(stage, force=force)
+    if 'render' in pipeline.upstream(stage):
+        sys.stdout.write(pipeline.output('render'))
+    if stage == 'publish' and result['run_id'] is not None:
+        verb = 'saved' if pipeline.status['publish'] == 'ran' else 'already saved'
+        print(f"✅ Run {result['run_id']} {verb}")
+    paths = shared_metrics().write()
+    print(f"📈 Metrics written to {paths['json']} and {paths['prometheus']}")
+    return pipeline
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run the analysis as cached stages")
+    parser.add_argument(
+        '--stage', choices=STAGE_NAMES, default='publish', help="Run up to this stage (default: publish)"
+    )
+    parser.add_argument('--force', action='store_true', help="Ignore artifacts and re-run every stage up to --stage")
+    parser.add_argument('--replay', metavar='PATH', help="Fetch from a recorded snapshot (no network)")
+    parser.add_argument('--data-dir', metavar='DIR', help="Local market data dumps")
+    parser.add_argument(
+        '--universe',
+        metavar='FILE',
+        nargs='?',
+        const=str(settings.NSE_UNIVERSE_FILE),
+        help="Also scan a broader NSE symbol list " f"(bare flag: {settings.NSE_UNIVERSE_FILE}, not shipped)",
+    )
+    parser.add_argument('--rules', metavar='FILE', help="Scoring rules (default: settings.SCORING_RULES_FILE)")
+    parser.add_argument(
+        '--format',
+        choices=['ansi', 'plain', 'markdown', 'html'],
+        help="Report format (colors on a terminal, plain text otherwise)",
+    )
+    parser.add_argument('--no-readme', action='store_true', help="Publish to the run store without updating the README")
+    args = parser.parse_args()
+
+    main(
+        stage=args.stage,
+        force=args.force,
+        replay=args.replay,
+        data_dir=args.data_dir,
+        universe_file=args.universe,
+        rules_file=args.rules,
+        report_format=args.format,
+        readme=not args.no_readme,
+    )
@@ -0,0 +1,82 @@
+"""
+Price statistics for the whole universe in one vectorized pass.
+
+Quote fields such as ``fiftyTwoWeekLow`` can be stale or missing, and only
+the 3-month change used to be derived from history. ``price_stats()`` works
+on the aligned ``(field, symbol)`` history frame (the price store or a bulk
+download) and computes, for every symbol at once:
+
+- ``fifty_two_week_high`` / ``fifty_two_week_low`` over the last 252 bars
+- ``distance_from_low_pct``: last close above the 52-week low
+- ``one_month_change`` .. ``twelve_month_change``: returns over 21/63/126/252 bars
+
+``merge_price_stats()`` then overlays these on the company dicts, where they
+become columns for the scoring rules.
+"""
+
+import math
+from typing import Any, Dict, List
+
+import numpy as np
+import pandas as pd
+
+from price_history import price_field
+from universe import nse_symbol
+
+WINDOW_52W = 252
+HORIZONS = {
+    'one_month_change': 21,
+    'three_month_change': 63,
+    'six_month_change': 126,
+    'twelve_month_change': 252,
+}
+RANGE_COLUMNS = ['last_close', 'fifty_two_week_high', 'fifty_two_week_low', 'distance_from_low_pct']
+
+
+def price_stats(history: pd.DataFrame, window: int = WINDOW_52W, horizons: Dict[str, int] = HORIZONS) -> pd.DataFrame:
+    """
+    One row of statistics per symbol of ``history``.
+
+    The 52-week range is left NaN when the history is shorter than ``window``
+    and the symbol already traded on its first row, since the full range is
+    then unknown. Returns reach back ``n`` bars, or to the symbol's first bar
+    when it has less history than that.
+    """
+    columns = RANGE_COLUMNS + list(horizons)
+    if history.empty or 'Close' not in history.columns.get_level_values(0):
+        return pd.DataFrame(columns=columns, dtype=float)
+
+    raw_close = price_field(history, 'Close')
+    close = raw_close.ffill().to_numpy(dtype=float)
+    n_bars, n_symbols = close.shape
+    traded = raw_close.notna().to_numpy()
+    first = np.where(traded.any(axis=0), traded.argmax(axis=0), n_bars - 1)
+    last = close[-1]
+
+    recent = slice(max(n_bars - window, 0), None)
+    complete = (n_bars >= window) | (first > 0)
+    high = np.where(complete, price_field(history, 'High').iloc[recent].max().to_numpy(dtype=float), np.nan)
+    low = np.where(complete, price_field(history, 'Low').iloc[recent].min().to_numpy(dtype=float), np.nan)
+
+    stats = {'last_close': last, 'fifty_two_week_high': high, 'fifty_two_week_low': low}
+    with np.errstate(invalid='ignore', divide='ignore'):
+        stats['distance_from_low_pct'] = (last - low) / low * 100
+        for name, bars in horizons.items():
+            base = close[np.maximum(n_bars - 1 - bars, first), np.arange(n_symbols)]
+            stats[name] = (last - base) / base * 100
+    return pd.DataFrame(stats, index=raw_close.columns, columns=columns)
+
+
+def merge_price_stats(companies: List[Dict[str, Any]], stats: pd.DataFrame) -> List[Dict[str, Any]]:
+    """Overlay computed statistics on company dicts in place; NaN values keep the quote's"""
+    if stats.empty:
+        return companies
+    records = stats.to_dict('index')
+    for company in companies:
+        row = records.get(nse_symbol(company['symbol']))
+        if row is None:
+            continue
+        for name, value in row.items():
+            if name != 'last_close' and not math.isnan(value):
+                company[name] = float(value)
+    return companies
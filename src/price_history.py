@@ -0,0 +1,94 @@
+"""
+Batched price history for the whole symbol universe.
+
+One bulk download replaces a ``Ticker.history()`` round trip per symbol. The
+result is a single date-aligned frame with ``(field, symbol)`` columns, e.g.
+``history['Close']`` is a dates x symbols matrix that every later step can
+slice without going back to the network.
+"""
+
+from typing import List, Optional, Sequence
+
+import pandas as pd
+
+OHLCV_FIELDS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+
+def normalize_history(frame: pd.DataFrame, symbols: Sequence[str]) -> pd.DataFrame:
+    """Coerce a download result into (field, symbol) columns over a sorted date index"""
+    if frame is None or frame.empty:
+        columns = pd.MultiIndex.from_product([OHLCV_FIELDS, list(symbols)], names=['Price', 'Ticker'])
+        return pd.DataFrame(columns=columns, dtype=float)
+
+    if not isinstance(frame.columns, pd.MultiIndex):
+        # Single-symbol downloads may come back with flat OHLCV columns
+        frame = pd.concat({symbols[0]: frame}, axis=1).swaplevel(axis=1)
+    elif frame.columns.get_level_values(0)[0] in symbols:
+        # group_by='ticker' layout: (symbol, field)
+        frame = frame.swaplevel(axis=1)
+
+    fields = [f for f in OHLCV_FIELDS if f in frame.columns.get_level_values(0)]
+    frame = frame.reindex(columns=pd.MultiIndex.from_product([fields, list(symbols)]))
+    frame.columns.names = ['Price', 'Ticker']
+    return frame.sort_index()
+
+
+def download_price_history(
+    symbols: Sequence[str], period: Optional[str] = '3mo', start: Optional[str] = None, end: Optional[str] = None
+) -> pd.DataFrame:
+    """
+    Download OHLCV for every symbol in one bulk request.
+
+    Args:
+        symbols: Yahoo symbols (e.g. ``DIXON.NS``)
+        period: Lookback period, ignored when ``start`` is given
+        start, end: Optional explicit date range
+
+    Returns:
+        Date-indexed frame with ``(field, symbol)`` MultiIndex columns
+    """
+    import yfinance as yf
+
+    symbols = list(symbols)
+    if not symbols:
+        return normalize_history(None, symbols)
+
+    frame = yf.download(
+        symbols,
+        period=None if start else period,
+        start=start,
+        end=end,
+        group_by='column',
+        auto_adjust=True,
+        threads=True,
+        progress=False,
+    )
+    return normalize_history(frame, symbols)
+
+
+def price_field(history: pd.DataFrame, field: str, fallback: str = 'Close') -> pd.DataFrame:
+    """One OHLCV field as a date x symbol frame, falling back to Close when missing"""
+    fields = history.columns.get_level_values(0)
+    return history[field if field in fields else fallback]
+
+
+def period_change(history: pd.DataFrame, field: str = 'Close') -> pd.Series:
+    """Percent change from the first to the last valid value of each symbol"""
+    if history.empty or field not in history.columns.get_level_values(0):
+        return pd.Series(dtype=float)
+
+    prices = history[field]
+    first = prices.bfill().iloc[0]
+    last = prices.ffill().iloc[-1]
+    return ((last - first) / first * 100).dropna()
+
+
+def period_start(index: pd.DatetimeIndex, period: Optional[str]) -> Optional[pd.Timestamp]:
+    """Translate a yfinance-style period ('3mo', '1y', '5d', 'max') into a start date"""
+    if not period or period == 'max' or len(index) == 0:
+        return None
+    units = {'d': 'days', 'wk': 'weeks', 'mo': 'months', 'y': 'years'}
+    for suffix, unit in units.items():
+        if period.endswith(suffix) and period[: -len(suffix)].isdigit():
+            return index.max() - pd.DateOffset(**{unit: int(period[: -len(suffix)])})
+    raise ValueError(f"Unsupported period: {period}")
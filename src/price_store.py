@@ -0,0 +1,208 @@
+"""
+Local incremental OHLCV store.
+
+Daily bars for every symbol are kept in SQLite, clustered by
+``(symbol, date)``. ``sync()`` asks the provider only for the bars after each
+symbol's last stored date. Symbols with the same last date share one bulk
+request, and new symbols get one bulk backfill. A routine run therefore
+downloads a few bars per symbol instead of months of history, and reads of
+any date range are served locally.
+"""
+
+import sqlite3
+import sys
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config import settings
+from price_history import OHLCV_FIELDS, normalize_history, period_start
+from providers import MarketDataProvider, call_provider
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS bars (
+    symbol TEXT NOT NULL,
+    date TEXT NOT NULL,
+    open REAL,
+    high REAL,
+    low REAL,
+    close REAL,
+    volume REAL,
+    PRIMARY KEY (symbol, date)
+) WITHOUT ROWID;
+"""
+
+_COLUMNS = [f.lower() for f in OHLCV_FIELDS]
+
+# SQLite caps bound parameters per statement
+_IN_CHUNK = 500
+
+
+def _chunks(items: Sequence[str], size: int = _IN_CHUNK) -> Iterable[List[str]]:
+    for i in range(0, len(items), size):
+        yield list(items[i : i + size])
+
+
+class PriceStore:
+    """Per-symbol daily OHLCV history with delta-only sync"""
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path or settings.PRICE_DB_PATH)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path)
+        self._conn.executescript(SCHEMA)
+
+    def close(self):
+        self._conn.close()
+
+    def __enter__(self) -> 'PriceStore':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def last_dates(self, symbols: Sequence[str]) -> Dict[str, str]:
+        """Newest stored date per symbol (symbols with no bars are left out)"""
+        last = {}
+        for chunk in _chunks(list(symbols)):
+            marks = ','.join('?' * len(chunk))
+            rows = self._conn.execute(
+                f"SELECT symbol, MAX(date) FROM bars WHERE symbol IN ({marks}) GROUP BY symbol", chunk
+            )
+            last.update(dict(rows.fetchall()))
+        return last
+
+    def append(self, history: pd.DataFrame) -> int:
+        """Bulk upsert a ``(field, symbol)`` history frame; returns bars written"""
+        if history.empty or 'Close' not in history.columns.get_level_values(0):
+            return 0
+        long = history.stack(level='Ticker', future_stack=True)
+        long = long[long['Close'].notna()]
+        if long.empty:
+            return 0
+        long = long.reindex(columns=OHLCV_FIELDS)
+        dates = pd.DatetimeIndex(long.index.get_level_values(0)).strftime('%Y-%m-%d')
+        values = long.to_numpy(dtype=float)
+        rows = [
+            (symbol, date, *(None if np.isnan(v) else float(v) for v in bar))
+            for symbol, date, bar in zip(long.index.get_level_values(1), dates, values)
+        ]
+        with self._conn:
+            self._conn.executemany(f"INSERT OR REPLACE INTO bars VALUES (?, ?, {', '.join('?' * len(_COLUMNS))})", rows)
+        return len(rows)
+
+    def read(
+        self,
+        symbols: Sequence[str],
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        period: Optional[str] = None,
+    ) -> pd.DataFrame:
+        """
+        Stored bars as a ``(field, symbol)`` frame, like a bulk download.
+
+        Args:
+            start, end: Date range (``end`` exclusive)
+            period: yfinance-style lookback ('3mo', '1y') from the newest stored bar; ignored with ``start``
+        """
+        symbols = list(symbols)
+        frames = []
+        for chunk in _chunks(symbols):
+            marks = ','.join('?' * len(chunk))
+            query = f"SELECT symbol, date, {', '.join(_COLUMNS)} FROM bars WHERE symbol IN ({marks}) AND date >= ?"
+            params = [*chunk, str(start)[:10] if start else '']
+            if end:
+                query += " AND date < ?"
+                params.append(str(end)[:10])
+            frames.append(pd.read_sql_query(query, self._conn, params=params))
+
+        bars = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+        if bars.empty:
+            return normalize_history(None, symbols)
+        bars['date'] = pd.to_datetime(bars['date'])
+        wide = bars.pivot(index='date', columns='symbol', values=_COLUMNS)
+        wide = wide.rename(columns=dict(zip(_COLUMNS, OHLCV_FIELDS)), level=0)
+        history = normalize_history(wide, symbols)
+        if not start:
+            lower = period_start(history.index, period)
+            if lower is not None:
+                history = history[history.index >= lower]
+        return history
+
+    def sync(
+        self,
+        symbols: Sequence[str],
+        provider: MarketDataProvider,
+        initial_period: str = settings.PRICE_STORE_BACKFILL,
+        initial_start: Optional[str] = None,
+    ) -> Dict[str, int]:
+        """
+        Fetch only missing bars from ``provider``.
+
+        New symbols are backfilled over ``initial_period``, or from
+        ``initial_start`` when that reaches further back. Each symbol's last
+        stored bar is fetched again, because a bar stored during market hours
+        may have been partial. Returns counts of ``requests``, ``backfilled``
+        symbols, ``updated`` symbols and ``bars`` written.
+        """
+        symbols = list(dict.fromkeys(symbols))
+        last = self.last_dates(symbols)
+        stats = {'requests': 0, 'backfilled': 0, 'updated': 0, 'bars': 0}
+
+        new = [s for s in symbols if s not in last]
+        if new:
+            backfill_from = period_start(pd.DatetimeIndex([pd.Timestamp.today().normalize()]), initial_period)
+            if initial_start and (backfill_from is None or pd.Timestamp(initial_start) >= backfill_from):
+                initial_start = None
+            history = call_provider(
+                provider,
+                lambda p: (
+                    p.history(new, period=None, start=initial_start)
+                    if initial_start
+                    else p.history(new, period=initial_period)
+                ),
+            )
+            stats['requests'] += 1
+            stats['backfilled'] = len(new)
+            stats['bars'] += self.append(history)
+
+        by_date = defaultdict(list)
+        for symbol, date in last.items():
+            by_date[date].append(symbol)
+        for date, group in sorted(by_date.items()):
+            history = call_provider(provider, lambda p: p.history(group, period=None, start=date))
+            stats['requests'] += 1
+            stats['updated'] += len(group)
+            stats['bars'] += self.append(history)
+        return stats
+
+    def count(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM bars").fetchone()[0]
+
+
+def load_history(
+    symbols: Sequence[str],
+    provider: MarketDataProvider,
+    store: Optional[PriceStore] = None,
+    start: Optional[str] = None,
+    period: Optional[str] = None,
+) -> Tuple[pd.DataFrame, Dict[str, int]]:
+    """
+    Sync ``symbols`` into ``store`` and read them back (see ``PriceStore.read``).
+
+    Opens and closes the default store when none is given. Returns the
+    history and the sync counts.
+    """
+    own_store = store is None
+    store = store or PriceStore()
+    try:
+        stats = store.sync(symbols, provider, initial_start=start)
+        return store.read(symbols, start=start, period=period), stats
+    finally:
+        if own_store:
+            store.close()
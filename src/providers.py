@@ -0,0 +1,354 @@
+"""
+Market-data providers.
+
+Discovery talks to a ``MarketDataProvider`` instead of calling yfinance
+directly. ``YFinanceProvider`` keeps the existing scraping path,
+``LocalFileProvider`` reads bulk vendor dumps (Parquet, CSV or Arrow) from a
+local directory at disk speed, and ``FallbackProvider`` chains them so symbols
+missing locally still come from yfinance.
+
+Local dump layout (any of .parquet / .csv / .arrow / .feather per table)::
+
+    quotes.*         one row per symbol, yfinance ``info`` keys as columns
+    balance_sheet.*  symbol, item, date, value
+    holders.*        symbol, kind (institutional|mutualfund), Holder, Shares, Value, ...
+    history.*        date, symbol, Open, High, Low, Close, Volume
+"""
+
+import importlib.util
+import math
+import sys
+import threading
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import pandas as pd
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config import settings
+from data_cache import DataCache
+from metrics import shared_metrics
+from price_history import OHLCV_FIELDS, download_price_history, normalize_history, period_start
+from rate_limit import TokenBucket, call_with_retry, shared_limiter
+
+LOCAL_FORMATS = ('.parquet', '.csv', '.arrow', '.feather')
+# pandas reads these through pyarrow
+ARROW_FORMATS = ('.parquet', '.arrow', '.feather')
+
+
+class ProviderMissError(KeyError):
+    """Raised when a provider has no data for a symbol"""
+
+
+# (provider, zero-argument call on it) -> the call's result
+MemberGuard = Callable[['MarketDataProvider', Callable[[], Any]], Any]
+
+
+class MarketDataProvider(ABC):
+    """Interface for quote, fundamentals, holders and history data"""
+
+    name = 'base'
+    remote = False  # Remote providers are worth caching on disk
+
+    @abstractmethod
+    def quote(self, symbol: str) -> Dict[str, Any]:
+        """Quote and summary fields, keyed like yfinance ``Ticker.info``"""
+
+    @abstractmethod
+    def fundamentals(self, symbol: str) -> pd.DataFrame:
+        """Balance sheet with line items as rows and periods as columns"""
+
+    @abstractmethod
+    def holders(self, symbol: str, kind: str = 'institutional') -> pd.DataFrame:
+        """Holder table for ``kind`` in ('institutional', 'mutualfund')"""
+
+    @abstractmethod
+    def history(
+        self,
+        symbols: Sequence[str],
+        period: Optional[str] = '3mo',
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+    ) -> pd.DataFrame:
+        """Date-aligned OHLCV frame with (field, symbol) columns"""
+
+    def fetch(self, symbol: str, kind: str) -> Any:
+        """Dispatch a discovery endpoint kind to the matching method"""
+        if kind == 'info':
+            return self.quote(symbol)
+        if kind == 'balance_sheet':
+            return self.fundamentals(symbol)
+        if kind == 'institutional_holders':
+            return self.holders(symbol, 'institutional')
+        if kind == 'mutualfund_holders':
+            return self.holders(symbol, 'mutualfund')
+        raise ValueError(f"Unknown endpoint kind: {kind}")
+
+
+class YFinanceProvider(MarketDataProvider):
+    """Live data scraped through yfinance"""
+
+    name = 'yfinance'
+    remote = True
+
+    def _ticker(self, symbol: str):
+        import yfinance as yf
+
+        # Fresh Ticker per call so concurrent endpoints don't share lazy state
+        return yf.Ticker(symbol)
+
+    def quote(self, symbol: str) -> Dict[str, Any]:
+        return self._ticker(symbol).info
+
+    def fundamentals(self, symbol: str) -> pd.DataFrame:
+        return self._ticker(symbol).balance_sheet
+
+    def holders(self, symbol: str, kind: str = 'institutional') -> pd.DataFrame:
+        ticker = self._ticker(symbol)
+        return ticker.institutional_holders if kind == 'institutional' else ticker.mutualfund_holders
+
+    def history(
+        self,
+        symbols: Sequence[str],
+        period: Optional[str] = '3mo',
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+    ) -> pd.DataFrame:
+        return download_price_history(symbols, period=period, start=start, end=end)
+
+
+def _require_pyarrow(path: Path):
+    if importlib.util.find_spec('pyarrow') is None:
+        raise ImportError(f"Reading {path} needs pyarrow (pip install pyarrow), or convert the dump to CSV")
+
+
+def _read_table(path: Path) -> pd.DataFrame:
+    if path.suffix in ARROW_FORMATS:
+        _require_pyarrow(path)
+    if path.suffix == '.parquet':
+        return pd.read_parquet(path)
+    if path.suffix in ('.arrow', '.feather'):
+        return pd.read_feather(path)
+    return pd.read_csv(path)
+
+
+class LocalFileProvider(MarketDataProvider):
+    """Reads bulk columnar dumps from a local directory"""
+
+    name = 'local'
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self._tables: Dict[str, Optional[Dict[str, pd.DataFrame]]] = {}
+        self._lock = threading.Lock()
+
+    def _find(self, table: str) -> Optional[Path]:
+        for suffix in LOCAL_FORMATS:
+            path = self.root / f"{table}{suffix}"
+            if path.exists():
+                return path
+        return None
+
+    def available(self) -> bool:
+        return any(self._find(t) for t in ('quotes', 'balance_sheet', 'holders', 'history'))
+
+    def check_readers(self):
+        """Fail before any fetch if a dump needs pyarrow and it isn't installed"""
+        for table in ('quotes', 'balance_sheet', 'holders', 'history'):
+            path = self._find(table)
+            if path is not None and path.suffix in ARROW_FORMATS:
+                _require_pyarrow(path)
+
+    def _table(self, table: str) -> Dict[str, pd.DataFrame]:
+        """Load a dump once and index it by symbol"""
+        with self._lock:
+            if table not in self._tables:
+                path = self._find(table)
+                if path is None:
+                    self._tables[table] = {}
+                else:
+                    frame = _read_table(path)
+                    self._tables[table] = {str(sym): rows for sym, rows in frame.groupby('symbol', sort=False)}
+            return self._tables[table]
+
+    def _rows(self, table: str, symbol: str) -> pd.DataFrame:
+        rows = self._table(table)
+        # Vendor dumps often drop the exchange suffix (DIXON vs DIXON.NS)
+        for key in (symbol, symbol.split('.')[0]):
+            if key in rows:
+                return rows[key]
+        raise ProviderMissError(f"{symbol} not in local {table}")
+
+    def quote(self, symbol: str) -> Dict[str, Any]:
+        row = self._rows('quotes', symbol).iloc[0].drop(labels=['symbol'])
+        return {k: v for k, v in row.items() if not (isinstance(v, float) and math.isnan(v))}
+
+    def fundamentals(self, symbol: str) -> pd.DataFrame:
+        rows = self._rows('balance_sheet', symbol)
+        sheet = rows.pivot_table(index='item', columns='date', values='value', aggfunc='last')
+        sheet.columns = pd.to_datetime(sheet.columns)
+        # Newest period first, matching yfinance
+        return sheet[sorted(sheet.columns, reverse=True)]
+
+    def holders(self, symbol: str, kind: str = 'institutional') -> pd.DataFrame:
+        rows = self._rows('holders', symbol)
+        return rows[rows['kind'] == kind].drop(columns=['symbol', 'kind']).reset_index(drop=True)
+
+    def history(
+        self,
+        symbols: Sequence[str],
+        period: Optional[str] = '3mo',
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+    ) -> pd.DataFrame:
+        symbols = list(symbols)
+        frames = {}
+        for symbol in symbols:
+            try:
+                rows = self._rows('history', symbol)
+            except ProviderMissError:
+                continue
+            frames[symbol] = rows.assign(date=pd.to_datetime(rows['date'])).set_index('date')[
+                [f for f in OHLCV_FIELDS if f in rows.columns]
+            ]
+
+        if not frames:
+            return normalize_history(None, symbols)
+
+        history = normalize_history(pd.concat(frames, axis=1).swaplevel(axis=1), symbols)
+        lower = pd.Timestamp(start) if start else period_start(history.index, period)
+        if lower is not None:
+            history = history[history.index >= lower]
+        if end:
+            history = history[history.index < pd.Timestamp(end)]
+        return history
+
+
+class FallbackProvider(MarketDataProvider):
+    """Tries each provider in order until one has the symbol"""
+
+    name = 'fallback'
+
+    def __init__(self, providers: List[MarketDataProvider], guard: Optional[MemberGuard] = None):
+        self.providers = providers
+        self.remote = any(p.remote for p in providers)
+        # Runs each member call; call_provider() uses it to rate limit only the remote members
+        self.guard: MemberGuard = guard or (lambda provider, call: call())
+
+    def guarded(self, guard: MemberGuard) -> 'FallbackProvider':
+        """The same chain with every member call run through ``guard(provider, call)``"""
+        return FallbackProvider(self.providers, guard)
+
+    def _first(self, method: str, *args) -> Any:
+        last_error: Optional[Exception] = None
+        for provider in self.providers:
+            try:
+                return self.guard(provider, lambda: getattr(provider, method)(*args))
+            except ProviderMissError as e:
+                last_error = e
+        raise last_error or ProviderMissError(args[0])
+
+    def quote(self, symbol: str) -> Dict[str, Any]:
+        return self._first('quote', symbol)
+
+    def fundamentals(self, symbol: str) -> pd.DataFrame:
+        return self._first('fundamentals', symbol)
+
+    def holders(self, symbol: str, kind: str = 'institutional') -> pd.DataFrame:
+        return self._first('holders', symbol, kind)
+
+    def history(
+        self,
+        symbols: Sequence[str],
+        period: Optional[str] = '3mo',
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+    ) -> pd.DataFrame:
+        symbols = list(symbols)
+        pieces = []
+        remaining = symbols
+        for provider in self.providers:
+            if not remaining:
+                break
+            frame = self.guard(provider, lambda: provider.history(remaining, period=period, start=start, end=end))
+            if 'Close' in frame.columns.get_level_values(0):
+                found = [s for s in remaining if frame['Close'][s].notna().any()]
+            else:
+                found = []
+            if found:
+                pieces.append(frame.loc[:, (slice(None), found)])
+            remaining = [s for s in remaining if s not in found]
+
+        if not pieces:
+            return normalize_history(None, symbols)
+        return normalize_history(pd.concat(pieces, axis=1), symbols)
+
+
+def call_provider(
+    provider: MarketDataProvider,
+    call: Callable[[MarketDataProvider], Any],
+    limiter: Optional[TokenBucket] = None,
+    endpoint: str = 'history',
+    symbol: Optional[str] = None,
+    cache: Optional[DataCache] = None,
+) -> Any:
+    """
+    Run ``call(provider)``, rate limited, retried and cached where it goes remote
+
+    A FallbackProvider is guarded per member, so calls its local dumps answer
+    never wait on the limiter and are never cached: a refreshed dump is read
+    on the next run. With ``cache``, remote single-symbol calls are served
+    from and stored in it under ``(symbol, endpoint)``. Every attempt is timed into the shared metrics
+    under ``endpoint`` (and ``symbol`` for single-ticker calls); limiter waits
+    and backoff sleeps are not counted as latency.
+    """
+    metrics = shared_metrics()
+
+    def timed(member_call: Callable[[], Any]) -> Any:
+        started = time.perf_counter()
+        ok = False
+        try:
+            value = member_call()
+            ok = True
+            return value
+        except ProviderMissError:
+            ok = True  # An answer (the next member is asked), not a failure
+            raise
+        finally:
+            metrics.observe(endpoint, time.perf_counter() - started, symbol, ok)
+
+    def guard(member: MarketDataProvider, member_call: Callable[[], Any]) -> Any:
+        if not member.remote:
+            return timed(member_call)
+        member_limiter = limiter or shared_limiter()
+
+        def retried() -> Any:
+            try:
+                return call_with_retry(
+                    lambda: timed(member_call),
+                    limiter=member_limiter,
+                    should_retry=lambda e: not isinstance(e, ProviderMissError),
+                    on_retry=lambda attempt, e: metrics.retry(endpoint),
+                )
+            finally:
+                metrics.set_gauge('rate_limit_wait_seconds', member_limiter.waited)
+
+        if cache is None or symbol is None:
+            return retried()
+        return cache.get_or_fetch(symbol, endpoint, retried)
+
+    if isinstance(provider, FallbackProvider):
+        return call(provider.guarded(guard))
+    return guard(provider, lambda: call(provider))
+
+
+def get_default_provider(data_dir: Optional[Path] = None) -> MarketDataProvider:
+    """Local dumps first when present, with yfinance as the fallback"""
+    local = LocalFileProvider(data_dir or settings.MARKET_DATA_DIR)
+    if local.available():
+        local.check_readers()
+        return FallbackProvider([local, YFinanceProvider()])
+    return YFinanceProvider()
@@ -0,0 +1,111 @@
+"""
+Rate limiting and retries for provider calls.
+
+A full-universe scan issues hundreds of requests; without pacing, Yahoo starts
+returning 429s partway through. Every remote call takes a token from one
+shared ``TokenBucket`` and failed calls are retried with jittered exponential
+backoff.
+"""
+
+import random
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config import settings
+
+
+class TokenBucket:
+    """Thread-safe token bucket: ``rate`` tokens per second, bursts up to ``capacity``"""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self.waited = 0.0  # Total seconds callers spent blocked
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """Take tokens if available without blocking"""
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return True
+            return False
+
+    def acquire(self, tokens: float = 1.0):
+        """Block until ``tokens`` are available, then take them"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                wait = (tokens - self._tokens) / self.rate
+                self.waited += wait
+            time.sleep(wait)
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Full-jitter exponential backoff for the given retry attempt (0-based)"""
+    return random.uniform(0, min(cap, base * (2**attempt)))
+
+
+def call_with_retry(
+    call: Callable[[], Any],
+    limiter: Optional[TokenBucket] = None,
+    retries: int = settings.FETCH_RETRIES,
+    base_delay: float = settings.RETRY_BASE_DELAY,
+    max_delay: float = settings.RETRY_MAX_DELAY,
+    should_retry: Callable[[Exception], bool] = lambda e: True,
+    on_retry: Optional[Callable[[int, Exception], None]] = None,
+) -> Any:
+    """
+    Run ``call`` under the rate limiter, retrying failures with jittered backoff.
+
+    Args:
+        call: Zero-argument provider call
+        limiter: Token bucket to draw from before every attempt
+        retries: Extra attempts after the first failure
+        should_retry: Return False for errors that retrying cannot fix
+        on_retry: Callback invoked with ``(attempt, error)`` before each retry
+    """
+    attempt = 0
+    while True:
+        if limiter is not None:
+            limiter.acquire()
+        try:
+            return call()
+        except Exception as e:
+            if attempt >= retries or not should_retry(e):
+                raise
+            if on_retry:
+                on_retry(attempt + 1, e)
+            time.sleep(backoff_delay(attempt, base_delay, max_delay))
+            attempt += 1
+
+
+_shared_limiter: Optional[TokenBucket] = None
+_shared_lock = threading.Lock()
+
+
+def shared_limiter() -> TokenBucket:
+    """Process-wide limiter for remote provider calls"""
+    global _shared_limiter
+    with _shared_lock:
+        if _shared_limiter is None:
+            _shared_limiter = TokenBucket(settings.RATE_LIMIT_PER_SECOND, settings.RATE_LIMIT_BURST)
+        return _shared_limiter
@@ -0,0 +1,341 @@
+"""
+Streaming report renderer.
+
+The report is built from the same data for every target. A symbol index is
+built once, so each strategic winner and stealth rank is a dict lookup
+instead of a scan of the universe. Sections are written to the output
+stream one at a time, and the report is never held in memory as a whole.
+
+Each section is a generator that describes its content through a formatter
+(``heading``, ``field``, ``bullet``, ``table``, ...). Formatters turn that
+description into text:
+
+- ``ansi``: colored terminal output (the classic report)
+- ``plain``: same layout without escape codes, for CI logs and files
+- ``markdown``: headings, bullet lists and pipe tables
+- ``html``: a standalone, escaped HTML page
+"""
+
+import html
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Sequence, TextIO, Union
+
+TITLE = "🚀 AUTONOMOUS PLI ALPHA GENERATOR v2.0"
+SUBTITLE = "   Expert-Validated Supply Chain Intelligence"
+RULE_WIDTH = 100
+
+ANSI_CODES = {
+    'header': '\033[95m',
+    'blue': '\033[94m',
+    'magenta': '\033[95m',
+    'cyan': '\033[96m',
+    'green': '\033[92m',
+    'yellow': '\033[93m',
+    'red': '\033[91m',
+    'bold': '\033[1m',
+}
+ANSI_END = '\033[0m'
+
+
+# ------------------------------------------------------------ formatters
+
+
+class PlainFormatter:
+    """Terminal layout without escape codes"""
+
+    def style(self, text: str, *styles: Optional[str]) -> str:
+        return text
+
+    def begin(self, title: str) -> str:
+        return ''
+
+    def end(self) -> str:
+        return ''
+
+    def banner(self, lines: Sequence[str]) -> str:
+        rule = self.style('=' * RULE_WIDTH, 'bold', 'header')
+        body = ''.join(f"{self.style(line, 'bold', 'header')}\n" for line in lines)
+        return f"\n{rule}\n{body}{rule}\n\n"
+
+    def heading(self, text: str, color: Optional[str] = None) -> str:
+        return f"\n{self.style(text, 'bold', color)}\n"
+
+    def subheading(self, title: str, detail: str = '') -> str:
+        return f"\n{self.style(title, 'bold')}{f' - {detail}' if detail else ''}\n"
+
+    def field(self, label: str, value: Any, color: Optional[str] = 'blue') -> str:
+        return f"{self.style(f'{label}:', color)} {value}\n"
+
+    def bullet(self, text: str, label: Optional[str] = None, color: Optional[str] = None) -> str:
+        prefix = f"{self.style(f'{label}:', color)} " if label else ''
+        return f"  • {prefix}{text}\n"
+
+    def table(self, headers: Sequence[str], widths: Sequence[int], rows: Sequence[Sequence[Any]]) -> str:
+        def line(cells):
+            return ' '.join(f"{str(cell):<{width}}" for cell, width in zip(cells, widths)).rstrip()
+
+        separator = '-' * (sum(widths) + len(widths) - 1)
+        return '\n'.join([line(headers), separator, *(line(row) for row in rows)]) + '\n'
+
+    def text(self, text: str, color: Optional[str] = None) -> str:
+        return f"{self.style(text, color)}\n"
+
+    def rule(self) -> str:
+        return f"\n{self.style('=' * RULE_WIDTH, 'bold', 'header')}\n"
+
+
+class AnsiFormatter(PlainFormatter):
+    """Plain layout with terminal colors"""
+
+    def style(self, text: str, *styles: Optional[str]) -> str:
+        codes = ''.join(ANSI_CODES[s] for s in styles if s)
+        return f"{codes}{text}{ANSI_END}" if codes else text
+
+
+class MarkdownFormatter(PlainFormatter):
+    """GitHub-flavored Markdown"""
+
+    def style(self, text: str, *styles: Optional[str]) -> str:
+        return f"**{text}**" if 'bold' in styles else text
+
+    def banner(self, lines: Sequence[str]) -> str:
+        title, *rest = lines
+        subtitle = ' '.join(line.strip() for line in rest)
+        return f"# {title}\n\n" + (f"_{subtitle}_\n\n" if subtitle else '')
+
+    def heading(self, text: str, color: Optional[str] = None) -> str:
+        return f"\n## {text}\n\n"
+
+    def subheading(self, title: str, detail: str = '') -> str:
+        return f"\n### {title}{f' - {detail}' if detail else ''}\n\n"
+
+    def field(self, label: str, value: Any, color: Optional[str] = 'blue') -> str:
+        return f"**{label}:** {value}  \n"
+
+    def bullet(self, text: str, label: Optional[str] = None, color: Optional[str] = None) -> str:
+        return f"- **{label}:** {text}\n" if label else f"- {text}\n"
+
+    def table(self, headers: Sequence[str], widths: Sequence[int], rows: Sequence[Sequence[Any]]) -> str:
+        def line(cells):
+            return '| ' + ' | '.join(str(cell).replace('|', '\\|') for cell in cells) + ' |'
+
+        return '\n'.join([line(headers), '|' + '---|' * len(headers), *(line(row) for row in rows)]) + '\n'
+
+    def text(self, text: str, color: Optional[str] = None) -> str:
+        return f"{self.style(text.strip(), color)}  \n"
+
+    def rule(self) -> str:
+        return "\n---\n\n"
+
+
+class HtmlFormatter(PlainFormatter):
+    """Standalone HTML page; bullets are grouped into lists as they stream"""
+
+    def __init__(self):
+        self._in_list = False
+
+    def _close(self) -> str:
+        if not self._in_list:
+            return ''
+        self._in_list = False
+        return "</ul>\n"
+
+    def begin(self, title: str) -> str:
+        return (
+            f'<!DOCTYPE html>\n<html>\n<head>\n<meta charset="utf-8">\n'
+            f'<title>{html.escape(title)}</title>\n</head>\n<body>\n'
+        )
+
+    def end(self) -> str:
+        return f"{self._close()}</body>\n</html>\n"
+
+    def banner(self, lines: Sequence[str]) -> str:
+        title, *rest = lines
+        subtitle = ' '.join(line.strip() for line in rest)
+        return f"{self._close()}<h1>{html.escape(title)}</h1>\n" + (
+            f"<p><em>{html.escape(subtitle)}</em></p>\n" if subtitle else ''
+        )
+
+    def heading(self, text: str, color: Optional[str] = None) -> str:
+        return f"{self._close()}<h2>{html.escape(text)}</h2>\n"
+
+    def subheading(self, title: str, detail: str = '') -> str:
+        detail = f" - {html.escape(detail)}" if detail else ''
+        return f"{self._close()}<h3>{html.escape(title)}{detail}</h3>\n"
+
+    def field(self, label: str, value: Any, color: Optional[str] = 'blue') -> str:
+        return f"{self._close()}<p><strong>{html.escape(label)}:</strong> {html.escape(str(value))}</p>\n"
+
+    def bullet(self, text: str, label: Optional[str] = None, color: Optional[str] = None) -> str:
+        opening = '' if self._in_list else "<ul>\n"
+        self._in_list = True
+        prefix = f"<strong>{html.escape(label)}:</strong> " if label else ''
+        return f"{opening}<li>{prefix}{html.escape(str(text))}</li>\n"
+
+    def table(self, headers: Sequence[str], widths: Sequence[int], rows: Sequence[Sequence[Any]]) -> str:
+        head = ''.join(f"<th>{html.escape(str(h))}</th>" for h in headers)
+        body = ''.join('<tr>' + ''.join(f"<td>{html.escape(str(c))}</td>" for c in row) + '</tr>\n' for row in rows)
+        return f"{self._close()}<table>\n<tr>{head}</tr>\n{body}</table>\n"
+
+    def text(self, text: str, color: Optional[str] = None) -> str:
+        return f"{self._close()}<p>{html.escape(text.strip())}</p>\n"
+
+    def rule(self) -> str:
+        return f"{self._close()}<hr>\n"
+
+
+FORMATS: Dict[str, Callable[[], PlainFormatter]] = {
+    'ansi': AnsiFormatter,
+    'plain': PlainFormatter,
+    'markdown': MarkdownFormatter,
+    'html': HtmlFormatter,
+}
+SUFFIX_FORMATS = {'.md': 'markdown', '.markdown': 'markdown', '.html': 'html', '.htm': 'html'}
+
+
+def format_for_path(path: Path) -> str:
+    """Report format implied by a file name (plain text unless .md or .html)"""
+    return SUFFIX_FORMATS.get(Path(path).suffix.lower(), 'plain')
+
+
+def default_format(stream: TextIO) -> str:
+    """Colors for a terminal, plain text for CI logs and pipes"""
+    isatty = getattr(stream, 'isatty', None)
+    return 'ansi' if isatty is not None and isatty() else 'plain'
+
+
+# ------------------------------------------------------------ sections
+
+
+class ReportData(NamedTuple):
+    companies: List[Dict[str, Any]]
+    by_symbol: Dict[str, Dict[str, Any]]
+    top: Optional[Dict[str, Any]]
+    insights: Dict[str, Any]
+    levels: Optional[Dict[str, float]]
+    timestamp: datetime
+
+
+def index_by_symbol(companies: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Symbol -> company, keeping the first company for a repeated symbol"""
+    index: Dict[str, Dict[str, Any]] = {}
+    for company in companies:
+        index.setdefault(company['symbol'], company)
+    return index
+
+
+def _header(fmt: PlainFormatter, data: ReportData) -> Iterator[str]:
+    yield fmt.banner([TITLE, SUBTITLE])
+    yield fmt.field('Analysis Timestamp', data.timestamp.strftime('%Y-%m-%d %H:%M:%S IST'))
+    yield fmt.field('Expert Insights Date', 'February 23, 2026 (Gemini Analysis)')
+
+
+def _macro_view(fmt: PlainFormatter, data: ReportData) -> Iterator[str]:
+    yield fmt.heading('📊 EXPERT MACRO VIEW', 'yellow')
+    yield fmt.bullet('PLI disbursed: ₹28,748 crore (as of late 2025)')
+    yield fmt.bullet(f"Component PLI boost: ₹{data.insights['industry_metrics']['component_pli_size']:,} Cr")
+    yield fmt.bullet("Shift: 'Screw-Driver Technology' → Core Component Manufacturing")
+
+
+def _strategic_winners(fmt: PlainFormatter, data: ReportData) -> Iterator[str]:
+    yield fmt.heading('🏭 STRATEGIC CORRELATION: 20%+ Utilization Candidates', 'cyan')
+    for symbol, insight in data.insights['strategic_winners'].items():
+        company = data.by_symbol.get(symbol)
+        yield fmt.subheading(symbol, f"₹{company['current_price']:.2f}" if company else '₹N/A')
+        yield fmt.bullet(insight['catalyst'], 'Catalyst', 'green')
+        yield fmt.bullet(insight.get('warning', 'None'), 'Warning', 'yellow')
+        if 'geopolitical_risk' in insight:
+            yield fmt.bullet(insight['geopolitical_risk'], 'Geo Risk', 'red')
+
+
+def _stealth_ranking(fmt: PlainFormatter, data: ReportData) -> Iterator[str]:
+    yield fmt.heading('🕵️ INSTITUTIONAL STEALTH RANKING', 'magenta')
+    rows = []
+    for rank, stealth in sorted(data.insights['stealth_ranking'].items()):
+        company = data.by_symbol.get(stealth['symbol'])
+        if company:
+            rows.append(
+                [
+                    rank,
+                    company['name'][:18],
+                    stealth['score'],
+                    f"{company.get('mf_percentage', 0):.1f}%",
+                    f"₹{company['current_price']:.2f}",
+                ]
+            )
+    yield fmt.table(['Rank', 'Company', 'Score', 'Live MF %', 'Current'], [6, 20, 18, 10, 10], rows)
+
+
+def _hidden_risks(fmt: PlainFormatter, data: ReportData) -> Iterator[str]:
+    yield fmt.heading('⚠️ HIDDEN RISKS MATRIX', 'red')
+    for company in data.companies:
+        if 'hidden_risks' in company or 'risk_flags' in company:
+            yield fmt.subheading(company['symbol'])
+            for risk in company.get('hidden_risks', []) + company.get('risk_flags', []):
+                yield fmt.bullet(risk)
+
+
+def _top_opportunity(fmt: PlainFormatter, data: ReportData) -> Iterator[str]:
+    top = data.top
+    if not top:
+        return
+    yield fmt.heading('🎯 CURRENT HIGHEST ASYMMETRY OPPORTUNITY', 'green')
+    yield fmt.text(f"{top['name']} ({top['symbol']})", 'bold')
+    yield fmt.field('Asymmetry Score', f"{top['asymmetry_score']}/10")
+    yield fmt.field('Live Price', f"₹{top['current_price']:.2f}")
+    yield fmt.field('52-Week Range', f"₹{top['fifty_two_week_low']:.2f} - ₹{top['fifty_two_week_high']:.2f}")
+    if top.get('asymmetry_reasons'):
+        yield fmt.text('Asymmetry Drivers:', 'blue')
+        for reason in top['asymmetry_reasons']:
+            yield fmt.bullet(reason)
+
+    if data.levels:
+        yield fmt.heading('💰 BUY TRIGGER (Live)', 'green')
+        yield fmt.text(f"   Buy at: ₹{data.levels['buy_trigger']:.2f}")
+        yield fmt.text(f"   Target: ₹{data.levels['target']:.2f}")
+        yield fmt.text(f"   Stop: ₹{data.levels['stop']:.2f}")
+
+
+def _footer(fmt: PlainFormatter, data: ReportData) -> Iterator[str]:
+    yield fmt.rule()
+    yield fmt.text('⚠️  DISCLAIMER: Expert insights from Feb 23, 2026. Prices are live.', 'yellow')
+    yield fmt.text('   Always validate with current fundamentals.', 'yellow')
+
+
+SECTIONS = [_header, _macro_view, _strategic_winners, _stealth_ranking, _hidden_risks, _top_opportunity, _footer]
+
+
+def render_report(
+    companies: List[Dict[str, Any]],
+    asymmetry: Dict[str, Any],
+    insights: Dict[str, Any],
+    out: Optional[TextIO] = None,
+    fmt: Union[str, PlainFormatter] = 'ansi',
+    levels: Optional[Dict[str, float]] = None,
+    timestamp: Optional[datetime] = None,
+):
+    """
+    Stream the expert report to ``out`` (stdout by default), section by section.
+
+    Args:
+        insights: The EXPERT_INSIGHTS overlay
+        fmt: 'ansi', 'plain', 'markdown', 'html' or a formatter instance
+        levels: Buy/target/stop levels of the top company (calculate_buy_trigger)
+    """
+    out = out or sys.stdout
+    formatter = FORMATS[fmt]() if isinstance(fmt, str) else fmt
+    data = ReportData(
+        companies,
+        index_by_symbol(companies),
+        asymmetry.get('top_company'),
+        insights,
+        levels,
+        timestamp or datetime.now(),
+    )
+
+    out.write(formatter.begin(TITLE))
+    for section in SECTIONS:
+        out.write(''.join(section(formatter, data)))
+    out.write(formatter.end())
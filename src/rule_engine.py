@@ -0,0 +1,214 @@
+"""
+Declarative scoring rules compiled to vectorized predicates.
+
+Rules live in a JSON file (``config/scoring_rules.json`` by default)::
+
+    {"name": "extreme_pe", "when": "pe_ratio > PE_HIGH_THRESHOLD",
+     "weight": -4, "kind": "risk", "template": "⚠️ Extreme P/E: {pe_ratio:.0f}"}
+
+``when`` is an arithmetic/comparison expression over company columns and
+upper-case constants (``config.settings`` thresholds by default). It is parsed
+and validated once, then evaluated against whole NumPy columns, so every rule
+applies to every symbol at array speed. Combine conditions with ``&``, ``|``
+and ``~``. ``has_<field>`` is true where a company has a non-empty ``<field>``.
+Templates are only formatted for rows that are reported.
+"""
+
+import ast
+import json
+import string
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config import settings
+
+_ALLOWED_NODES = (
+    ast.Expression,
+    ast.BinOp,
+    ast.UnaryOp,
+    ast.Compare,
+    ast.Name,
+    ast.Load,
+    ast.Constant,
+    ast.Add,
+    ast.Sub,
+    ast.Mult,
+    ast.Div,
+    ast.Mod,
+    ast.Pow,
+    ast.USub,
+    ast.UAdd,
+    ast.Invert,
+    ast.BitAnd,
+    ast.BitOr,
+    ast.BitXor,
+    ast.Lt,
+    ast.LtE,
+    ast.Gt,
+    ast.GtE,
+    ast.Eq,
+    ast.NotEq,
+)
+
+
+class RuleError(ValueError):
+    """Raised for malformed rule files or expressions"""
+
+
+def settings_constants() -> Dict[str, Any]:
+    """Upper-case numeric settings usable in rule expressions"""
+    return {
+        k: v
+        for k, v in vars(settings).items()
+        if k.isupper() and isinstance(v, (int, float)) and not isinstance(v, bool)
+    }
+
+
+class _TemplateValues(dict):
+    """Format mapping that renders missing fields as empty strings"""
+
+    def __missing__(self, key):
+        return ''
+
+
+class Rule:
+    """One compiled rule"""
+
+    def __init__(self, spec: Dict[str, Any], constants: Dict[str, Any]):
+        try:
+            self.name = spec['name']
+            self.expression = spec['when']
+            self.weight = spec['weight']
+        except KeyError as e:
+            raise RuleError(f"Rule is missing {e}: {spec}") from None
+        self.kind = spec.get('kind', 'reason')
+        if self.kind not in ('reason', 'risk'):
+            raise RuleError(f"Rule {self.name}: kind must be 'reason' or 'risk'")
+        self.template = spec.get('template', self.name)
+
+        try:
+            tree = ast.parse(self.expression, mode='eval')
+        except SyntaxError as e:
+            raise RuleError(f"Rule {self.name}: {e.msg} in {self.expression!r}") from None
+        for node in ast.walk(tree):
+            if not isinstance(node, _ALLOWED_NODES):
+                hint = " (use & / | instead of and / or)" if isinstance(node, ast.BoolOp) else ""
+                raise RuleError(f"Rule {self.name}: {type(node).__name__} not allowed{hint}")
+            if isinstance(node, ast.Compare) and len(node.ops) > 1:
+                raise RuleError(f"Rule {self.name}: chained comparisons are not vectorizable")
+
+        names = {n.id for n in ast.walk(tree) if isinstance(n, ast.Name)}
+        self.constants = {n: constants[n] for n in names if n in constants}
+        self.columns = sorted(names - set(self.constants))
+        unknown = [n for n in self.columns if n.isupper()]
+        if unknown:
+            raise RuleError(f"Rule {self.name}: unknown constant(s) {', '.join(unknown)}")
+        self._code = compile(tree, f"<rule {self.name}>", 'eval')
+
+    def evaluate(self, columns: Dict[str, np.ndarray], n: int) -> np.ndarray:
+        namespace = {name: columns[name] for name in self.columns}
+        namespace.update(self.constants)
+        with np.errstate(invalid='ignore'):
+            result = eval(self._code, {'__builtins__': {}}, namespace)
+        # NaN inputs never fire a rule
+        return np.broadcast_to(np.asarray(result, dtype=bool), (n,))
+
+    def render(self, company: Dict[str, Any], constants: Dict[str, Any]) -> str:
+        values = _TemplateValues(constants)
+        values.update(company)
+        return string.Formatter().vformat(self.template, (), values)
+
+
+class RuleSet:
+    """Compiled rules plus the column defaults they were written against"""
+
+    def __init__(self, spec: Dict[str, Any], constants: Optional[Dict[str, Any]] = None):
+        self.constants = settings_constants() if constants is None else dict(constants)
+        self.defaults = spec.get('defaults', {})
+        self.rules = [Rule(r, self.constants) for r in spec.get('rules', [])]
+        names = [r.name for r in self.rules]
+        if len(names) != len(set(names)):
+            raise RuleError("Rule names must be unique")
+        self.columns = sorted({c for r in self.rules for c in r.columns})
+        self.weights = np.array([r.weight for r in self.rules], dtype=float)
+
+    @classmethod
+    def from_file(cls, path: Optional[Path] = None, constants: Optional[Dict[str, Any]] = None) -> 'RuleSet':
+        path = Path(path or settings.SCORING_RULES_FILE)
+        with open(path, encoding='utf-8') as f:
+            return cls(json.load(f), constants)
+
+    def with_weights(self, weights: Dict[str, float]) -> 'RuleSet':
+        """Copy of the rule set with some weights replaced"""
+        clone = object.__new__(RuleSet)
+        clone.__dict__.update(self.__dict__)
+        clone.weights = np.array([weights.get(r.name, r.weight) for r in self.rules], dtype=float)
+        return clone
+
+    def frame_from_companies(self, companies: List[Dict[str, Any]]) -> pd.DataFrame:
+        """Extract just the columns the rules reference from company dicts"""
+        n = len(companies)
+        columns: Dict[str, Any] = {}
+        for name in self.columns:
+            if name.startswith('has_'):
+                field = name[4:]
+                columns[name] = np.fromiter((bool(c.get(field)) for c in companies), dtype=bool, count=n)
+                continue
+            default = self.defaults.get(name)
+            values = [c.get(name, default) for c in companies]
+            try:
+                columns[name] = np.array([np.nan if v is None else v for v in values], dtype=float)
+            except (TypeError, ValueError):
+                columns[name] = np.array(values, dtype=object)
+        return pd.DataFrame(columns, index=pd.RangeIndex(n))
+
+    def evaluate(self, frame: pd.DataFrame) -> np.ndarray:
+        """Boolean matrix of shape (rows, rules)"""
+        n = len(frame)
+        columns = {}
+        for name in self.columns:
+            if name not in frame.columns:
+                if name in self.defaults:
+                    columns[name] = np.full(n, self.defaults[name], dtype=float)
+                    continue
+                raise RuleError(f"Column {name} is missing from the scoring frame")
+            column = frame[name]
+            if name in self.defaults and column.dtype.kind == 'f':
+                column = column.fillna(self.defaults[name])
+            columns[name] = column.to_numpy()
+        if not self.rules:
+            return np.zeros((n, 0), dtype=bool)
+        return np.column_stack([rule.evaluate(columns, n) for rule in self.rules])
+
+    def scores(self, fired: np.ndarray) -> np.ndarray:
+        """Weighted sum of fired rules per row"""
+        scores = fired @ self.weights
+        return scores.astype(np.int64) if np.all(self.weights == np.round(self.weights)) else scores
+
+    def explain(self, company: Dict[str, Any], fired_row: np.ndarray) -> Tuple[List[str], List[str]]:
+        """Render (reasons, risk_flags) for one reported row"""
+        reasons, risks = [], []
+        for rule, fired in zip(self.rules, fired_row):
+            if fired:
+                (risks if rule.kind == 'risk' else reasons).append(rule.render(company, self.constants))
+        return reasons, risks
+
+    def risk_mask(self) -> np.ndarray:
+        return np.array([r.kind == 'risk' for r in self.rules], dtype=bool)
+
+
+_default_rules: Optional[RuleSet] = None
+
+
+def default_rules() -> RuleSet:
+    """Rules from settings.SCORING_RULES_FILE, compiled once per process"""
+    global _default_rules
+    if _default_rules is None:
+        _default_rules = RuleSet.from_file()
+    return _default_rules
@@ -0,0 +1,206 @@
+"""
+Append-only store of analysis runs.
+
+Replaces one ``reports/analysis_*.json`` file per run with a SQLite database
+holding one row per company per run. Runs are keyed by an increasing
+``run_id`` (with a unique index on the timestamp), and company rows are
+clustered by ``(run_id, rank)`` with a second index on ``(symbol, run_id)``.
+So the latest run, any single run and a symbol's time series are all B-tree
+lookups, however many runs have been stored. Runs are ordered by timestamp,
+not ``run_id``, so reports imported after live runs never become "latest".
+"""
+
+import json
+import sqlite3
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config import settings
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp TEXT NOT NULL UNIQUE,
+    top_symbol TEXT,
+    company_count INTEGER
+);
+CREATE TABLE IF NOT EXISTS companies (
+    run_id INTEGER NOT NULL REFERENCES runs(run_id),
+    rank INTEGER NOT NULL,
+    symbol TEXT NOT NULL,
+    name TEXT,
+    price REAL,
+    score REAL,
+    fifty_two_week_low REAL,
+    fifty_two_week_high REAL,
+    reasons TEXT,
+    risk_flags TEXT,
+    PRIMARY KEY (run_id, rank)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_companies_symbol ON companies(symbol, run_id);
+"""
+
+
+class RunStore:
+    """SQLite-backed history of every analysis run"""
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path or settings.RUNS_DB_PATH)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.executescript(SCHEMA)
+
+    def close(self):
+        self._conn.close()
+
+    def __enter__(self) -> 'RunStore':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def append_run(self, analysis: Dict[str, Any]) -> Optional[int]:
+        """
+        Store one run in the report JSON shape
+        (``{'timestamp', 'top_company', 'all_companies'}``).
+
+        Returns the new ``run_id``, or None if a run with that timestamp
+        is already stored.
+        """
+        timestamp = analysis.get('timestamp') or datetime.now().isoformat()
+        top = analysis.get('top_company') or {}
+        companies = analysis.get('all_companies') or ([top] if top else [])
+
+        rows = []
+        for rank, company in enumerate(companies, start=1):
+            # all_companies rows are summaries; the top pick carries the full detail
+            detail = top if company.get('symbol') == top.get('symbol') else company
+            rows.append(
+                (
+                    rank,
+                    company['symbol'],
+                    company.get('name'),
+                    company.get('price', company.get('current_price')),
+                    company.get('score', company.get('asymmetry_score')),
+                    detail.get('fifty_two_week_low'),
+                    detail.get('fifty_two_week_high'),
+                    json.dumps(detail.get('asymmetry_reasons', []), ensure_ascii=False),
+                    json.dumps(detail.get('risk_flags', []), ensure_ascii=False),
+                )
+            )
+
+        with self._conn:
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO runs (timestamp, top_symbol, company_count) VALUES (?, ?, ?)",
+                (timestamp, top.get('symbol'), len(rows)),
+            )
+            if cursor.rowcount == 0:
+                return None
+            run_id = cursor.lastrowid
+            self._conn.executemany(
+                "INSERT INTO companies VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", [(run_id, *row) for row in rows]
+            )
+        return run_id
+
+    def _analysis(self, run: sqlite3.Row) -> Dict[str, Any]:
+        rows = self._conn.execute("SELECT * FROM companies WHERE run_id = ? ORDER BY rank", (run['run_id'],)).fetchall()
+        all_companies = [
+            {
+                'symbol': r['symbol'],
+                'name': r['name'],
+                'price': r['price'],
+                'score': r['score'],
+                'fifty_two_week_low': r['fifty_two_week_low'],
+                'fifty_two_week_high': r['fifty_two_week_high'],
+                'risk_flags': json.loads(r['risk_flags'] or '[]'),
+            }
+            for r in rows
+        ]
+        top = rows[0] if rows else None
+        return {
+            'run_id': run['run_id'],
+            'timestamp': run['timestamp'],
+            'top_company': (
+                {
+                    'name': top['name'],
+                    'symbol': top['symbol'],
+                    'current_price': top['price'],
+                    'fifty_two_week_low': top['fifty_two_week_low'],
+                    'fifty_two_week_high': top['fifty_two_week_high'],
+                    'asymmetry_score': top['score'],
+                    'asymmetry_reasons': json.loads(top['reasons'] or '[]'),
+                    'risk_flags': json.loads(top['risk_flags'] or '[]'),
+                }
+                if top
+                else None
+            ),
+            'all_companies': all_companies,
+        }
+
+    def latest_run(self) -> Optional[Dict[str, Any]]:
+        """Run with the newest timestamp in the report JSON shape, or None when empty"""
+        run = self._conn.execute("SELECT * FROM runs ORDER BY timestamp DESC LIMIT 1").fetchone()
+        return self._analysis(run) if run else None
+
+    def get_run(self, run_id: int) -> Optional[Dict[str, Any]]:
+        run = self._conn.execute("SELECT * FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+        return self._analysis(run) if run else None
+
+    def top_picks(self) -> Iterator[Dict[str, Any]]:
+        """Each run's rank-1 company, oldest first"""
+        rows = self._conn.execute(
+            "SELECT r.run_id, r.timestamp, c.* FROM runs r JOIN companies c "
+            "ON c.run_id = r.run_id AND c.rank = 1 ORDER BY r.timestamp"
+        )
+        for row in rows:
+            yield dict(row)
+
+    def symbol_history(self, symbol: str, since: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Price, score and rank of one symbol across runs, oldest first"""
+        rows = self._conn.execute(
+            "SELECT r.run_id, r.timestamp, c.rank, c.price, c.score FROM companies c "
+            "JOIN runs r ON r.run_id = c.run_id "
+            "WHERE c.symbol = ? AND r.timestamp >= ? ORDER BY r.timestamp",
+            (symbol, since or ''),
+        ).fetchall()
+        return [dict(r) for r in rows]
+
+    def count(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
+
+    def import_reports(self, reports_dir: Optional[Path] = None) -> int:
+        """One-shot import of legacy ``analysis_*.json`` files; returns runs added"""
+        added = 0
+        for path in sorted(Path(reports_dir or settings.REPORTS_DIR).glob("analysis_*.json")):
+            with open(path) as f:
+                if self.append_run(json.load(f)) is not None:
+                    added += 1
+        return added
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Analysis run store")
+    parser.add_argument(
+        '--import',
+        dest='import_dir',
+        nargs='?',
+        const=str(settings.REPORTS_DIR),
+        metavar='DIR',
+        help="Import legacy analysis_*.json reports",
+    )
+    args = parser.parse_args()
+
+    with RunStore() as store:
+        if args.import_dir:
+            print(f"✅ Imported {store.import_reports(Path(args.import_dir))} runs from {args.import_dir}")
+        latest = store.latest_run()
+        print(f"📦 {store.count()} runs in {store.path}")
+        if latest:
+            print(f"   Latest: {latest['timestamp']} → {latest['top_company']['symbol']}")
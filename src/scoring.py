@@ -0,0 +1,83 @@
+"""
+Columnar asymmetry scoring.
+
+Factors are declarative rules (see rule_engine.py and
+``config/scoring_rules.json``) evaluated as NumPy columns over the whole
+universe in one pass; the per-company loop only runs for the rows that are
+actually reported (reason strings for the top-K, risk flags for flagged rows).
+"""
+
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from rule_engine import RuleSet, default_rules
+
+
+def companies_to_frame(companies: List[Dict[str, Any]], rules: Optional[RuleSet] = None) -> pd.DataFrame:
+    """
+    Extract only the scoring inputs from company dicts into columns.
+
+    Missing optional keys take the rule file's defaults (a missing
+    ``three_month_change`` is 0 and a missing ``stealth_rank`` is 5).
+    """
+    return (rules or default_rules()).frame_from_companies(companies)
+
+
+def factor_masks(frame: pd.DataFrame, rules: Optional[RuleSet] = None) -> Dict[str, np.ndarray]:
+    """Boolean column per rule; NaN inputs never trigger a rule"""
+    rules = rules or default_rules()
+    fired = rules.evaluate(frame)
+    return {rule.name: fired[:, i] for i, rule in enumerate(rules.rules)}
+
+
+def score_frame(frame: pd.DataFrame, rules: Optional[RuleSet] = None) -> np.ndarray:
+    """Weighted asymmetry score for every row"""
+    rules = rules or default_rules()
+    return rules.scores(rules.evaluate(frame))
+
+
+def score_companies(
+    companies: List[Dict[str, Any]], rules: Optional[RuleSet] = None, top_k: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Score company dicts in place and rank them.
+
+    Every company gets ``asymmetry_score`` and ``risk_flags``; reason strings
+    are only built for the ``top_k`` highest scores (all rows when None) and
+    left empty elsewhere.
+
+    Returns:
+        ``{'top_company': ..., 'all_companies': [...]}`` sorted by score, ties
+        keeping input order
+    """
+    if not companies:
+        return {'top_company': None, 'all_companies': []}
+
+    rules = rules or default_rules()
+    fired = rules.evaluate(rules.frame_from_companies(companies))
+    scores = rules.scores(fired)
+
+    order = np.argsort(-scores, kind='stable')
+    reported = order if top_k is None else order[:top_k]
+    risk = rules.risk_mask()
+    reason_fired = np.where(risk, False, fired)
+    risk_fired = np.where(risk, fired, False)
+    flagged = np.flatnonzero(risk_fired.any(axis=1))
+
+    for company, score in zip(companies, scores.tolist()):
+        company['asymmetry_score'] = score
+        company['asymmetry_reasons'] = []
+        company['risk_flags'] = []
+
+    for i in reported.tolist():
+        companies[i]['asymmetry_reasons'] = rules.explain(companies[i], reason_fired[i])[0]
+    for i in flagged.tolist():
+        companies[i]['risk_flags'] = rules.explain(companies[i], risk_fired[i])[1]
+
+    sorted_companies = [companies[i] for i in order.tolist()]
+    return {
+        'top_company': sorted_companies[0],
+        'all_companies': sorted_companies,
+    }
@@ -0,0 +1,104 @@
+"""
+Record/replay snapshots of raw provider responses.
+
+In record mode every provider call made through ``Snapshot.fetch`` is executed
+and its raw result stored; ``save()`` writes them all to one gzip-compressed
+pickle. In replay mode the same calls are answered from that file with no
+network I/O, so a past run can be reproduced, benchmarked or tested offline.
+"""
+
+import gzip
+import pickle
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+SNAPSHOT_VERSION = 1
+
+
+class SnapshotMissError(KeyError):
+    """Raised in replay mode when a call was never recorded"""
+
+
+class Snapshot:
+    """A set of recorded provider responses keyed by call signature"""
+
+    def __init__(self, path: str, mode: str = 'record'):
+        if mode not in ('record', 'replay'):
+            raise ValueError(f"Unknown snapshot mode: {mode}")
+        self.path = Path(path)
+        self.mode = mode
+        self.created = datetime.now().isoformat()
+        self._entries: Dict[Tuple[Hashable, ...], Any] = {}
+        self._lock = threading.Lock()
+
+        if mode == 'replay':
+            with gzip.open(self.path, 'rb') as f:
+                payload = pickle.load(f)
+            if payload.get('version') != SNAPSHOT_VERSION:
+                raise ValueError(f"Unsupported snapshot version in {self.path}: {payload.get('version')}")
+            self.created = payload['created']
+            self._entries = payload['entries']
+
+    @classmethod
+    def record(cls, path: str) -> 'Snapshot':
+        return cls(path, mode='record')
+
+    @classmethod
+    def replay(cls, path: str) -> 'Snapshot':
+        return cls(path, mode='replay')
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == 'replay'
+
+    def fetch(self, key: Tuple[Hashable, ...], call: Optional[Callable[[], Any]] = None) -> Any:
+        """
+        Run ``call`` and record its result, or serve the recorded result.
+
+        Args:
+            key: Call signature, e.g. ``('yfinance', 'DIXON.NS', 'info')``
+            call: Zero-argument provider call (unused when replaying)
+        """
+        if self.replaying:
+            try:
+                return self._entries[key]
+            except KeyError:
+                raise SnapshotMissError(key) from None
+
+        value = call()
+        with self._lock:
+            self._entries[key] = value
+        return value
+
+    def save(self, path: Optional[str] = None) -> Path:
+        """Write recorded responses to disk"""
+        target = Path(path) if path else self.path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            payload = {'version': SNAPSHOT_VERSION, 'created': self.created, 'entries': dict(self._entries)}
+        with gzip.open(target, 'wb', compresslevel=6) as f:
+            pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+        return target
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __enter__(self) -> 'Snapshot':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.mode == 'record' and exc_type is None:
+            self.save()
+
+
+def open_snapshot(record: Optional[str] = None, replay: Optional[str] = None) -> Optional[Snapshot]:
+    """Build a snapshot from CLI-style record/replay paths (at most one may be set)"""
+    if record and replay:
+        raise ValueError("Choose either record or replay, not both")
+    if record:
+        return Snapshot.record(record)
+    if replay:
+        return Snapshot.replay(replay)
+    return None
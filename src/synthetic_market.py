@@ -0,0 +1,411 @@
+"""
+Seeded synthetic market data and news for offline load testing.
+
+``SyntheticMarketProvider`` is a ``MarketDataProvider`` serving any symbol:
+
+- daily OHLCV from a geometric random walk with per-symbol drift and
+  volatility (fat-tailed returns, volume rising with the size of the move)
+- yfinance-style quotes derived from that path (52-week range, average
+  volume, market cap, P/E)
+- balance sheets with four annual periods, newest first
+- institutional and mutual-fund holder tables
+
+``SyntheticNewsSource`` answers NewsAPI ``/v2/everything`` requests with
+paged, dated articles per query. Pass ``source.request`` to
+``fetch_live_headline_from_newsapi(request=...)`` or the source itself to
+``AsyncNewsClient(transport=...)``.
+
+Every value derives from ``(seed, symbol)`` or ``(seed, query)``, so the
+same seed and end date give the same data at any scale and in any call
+order. Optional latency and transient failures exercise concurrency,
+caching and retries. ``python src/synthetic_market.py --symbols 1000``
+runs discovery, scoring and a news stream end to end without the network.
+"""
+
+import random
+import sys
+import threading
+import time
+import urllib.parse
+import zlib
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from price_history import OHLCV_FIELDS, normalize_history, period_start
+from providers import MarketDataProvider
+
+TRADING_DAYS = 252
+NEWS_SOURCES = ('Economic Times', 'Mint', 'Business Standard', 'Moneycontrol', 'Reuters', 'The Hindu BusinessLine')
+HEADLINES = (
+    "{q}: government clears fresh incentive disbursals",
+    "{q} exports hit record as new capacity comes online",
+    "Brokerages turn cautious on {q} after sharp rally",
+    "{q} order book swells on component localisation push",
+    "Why mutual funds are quietly adding {q} exposure",
+    "{q} margins under pressure as input costs rise",
+    "Analysts see {q} winning share from Chinese suppliers",
+)
+
+
+def synthetic_symbols(n: int, suffix: str = '.NS') -> List[str]:
+    """``n`` distinct Yahoo-style symbols (SYN000000.NS, ...)"""
+    return [f"SYN{i:06d}{suffix}" for i in range(n)]
+
+
+def _rng(seed: int, key: str) -> np.random.Generator:
+    # crc32 is stable across processes, unlike hash()
+    return np.random.default_rng([seed, zlib.crc32(key.encode())])
+
+
+def _end_date(end: Optional[str]) -> pd.Timestamp:
+    return pd.Timestamp(end) if end else pd.Timestamp.today().normalize()
+
+
+class _Faults:
+    """Seeded latency and transient failures shared by the synthetic sources"""
+
+    def __init__(self, seed: int, latency: float, failure_rate: float):
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def apply(self, what: str):
+        if not self.latency and not self.failure_rate:
+            return
+        with self._lock:
+            delay = self.latency * self._random.uniform(0.5, 1.5)
+            fail = self._random.random() < self.failure_rate
+        if delay:
+            time.sleep(delay)
+        if fail:
+            raise ConnectionError(f"synthetic transient failure: {what}")
+
+
+class SyntheticMarketProvider(MarketDataProvider):
+    """Deterministic fake market for any symbol list"""
+
+    name = 'synthetic'
+
+    def __init__(
+        self,
+        seed: int = 0,
+        days: int = 2 * TRADING_DAYS,
+        end: Optional[str] = None,
+        drift: float = 0.08,
+        volatility: float = 0.35,
+        latency: float = 0.0,
+        failure_rate: float = 0.0,
+        remote: bool = False,
+    ):
+        """
+        Args:
+            days: Trading days of history per symbol, ending at ``end`` (today by default)
+            drift: Mean annual drift; each symbol draws its own around it
+            volatility: Typical annual volatility; each symbol draws its own around it
+            latency: Mean seconds slept per call
+            failure_rate: Share of calls raising ConnectionError (retried when ``remote``)
+            remote: Treat as a remote provider so the cache, rate limiter and retries apply
+        """
+        self.seed = seed
+        self.days = days
+        self.end = _end_date(end)
+        self.drift = drift
+        self.volatility = volatility
+        self.remote = remote
+        self._faults = _Faults(seed, latency, failure_rate)
+        self._paths: Dict[str, pd.DataFrame] = {}
+        self._lock = threading.Lock()
+
+    # ---- per-symbol state
+
+    def _profile(self, symbol: str) -> Dict[str, float]:
+        rng = _rng(self.seed, 'profile:' + symbol)
+        return {
+            'start_price': rng.lognormal(np.log(400), 1.0),
+            'drift': rng.normal(self.drift, 0.15),
+            'volatility': self.volatility * rng.lognormal(0, 0.35),
+            'shares': rng.lognormal(np.log(2e8), 1.2),
+            'avg_volume': rng.lognormal(np.log(3e5), 1.2),
+            'pe': rng.lognormal(np.log(35), 0.8),
+            'price_to_book': rng.lognormal(np.log(5), 0.6),
+            'debt_to_equity': rng.gamma(1.2, 0.2),
+            'institutional': rng.beta(2, 8),
+            'mutualfund': rng.beta(1.5, 12),
+            'beta': rng.normal(1.0, 0.3),
+        }
+
+    def path(self, symbol: str) -> pd.DataFrame:
+        """Daily OHLCV for one symbol over ``days`` business days"""
+        with self._lock:
+            if symbol in self._paths:
+                return self._paths[symbol]
+        profile = self._profile(symbol)
+        rng = _rng(self.seed, 'path:' + symbol)
+        dates = pd.bdate_range(end=self.end, periods=self.days, name='date')
+
+        sigma = profile['volatility'] / np.sqrt(TRADING_DAYS)
+        shocks = rng.standard_t(4, self.days) / np.sqrt(2)  # Unit variance, fat tails
+        returns = (profile['drift'] - 0.5 * profile['volatility'] ** 2) / TRADING_DAYS + sigma * shocks
+        close = profile['start_price'] * np.exp(np.cumsum(returns))
+        open_ = np.concatenate([[profile['start_price']], close[:-1]]) * (1 + rng.normal(0, sigma / 4, self.days))
+        high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, sigma / 2, self.days)))
+        low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, sigma / 2, self.days)))
+        volume = profile['avg_volume'] * rng.lognormal(0, 0.4, self.days) * (1 + 10 * np.abs(returns))
+
+        frame = pd.DataFrame(
+            {'Open': open_, 'High': high, 'Low': low, 'Close': close, 'Volume': volume.round()}, index=dates
+        ).round({'Open': 2, 'High': 2, 'Low': 2, 'Close': 2})
+        with self._lock:
+            return self._paths.setdefault(symbol, frame)
+
+    # ---- MarketDataProvider
+
+    def quote(self, symbol: str) -> Dict[str, Any]:
+        self._faults.apply(f"{symbol} info")
+        profile = self._profile(symbol)
+        bars = self.path(symbol)
+        year = bars.iloc[-TRADING_DAYS:]
+        price = float(bars['Close'].iloc[-1])
+        quote = {
+            'longName': f"{symbol.split('.')[0].title()} Industries Ltd",
+            'currentPrice': price,
+            'regularMarketPrice': price,
+            'marketCap': price * profile['shares'],
+            'volume': int(bars['Volume'].iloc[-1]),
+            'averageVolume': int(bars['Volume'].iloc[-63:].mean()),
+            'fiftyTwoWeekHigh': float(year['High'].max()),
+            'fiftyTwoWeekLow': float(year['Low'].min()),
+            'beta': round(profile['beta'], 2),
+        }
+        # Loss makers (about 5%) have no trailing P/E, as on Yahoo
+        if _rng(self.seed, 'pe:' + symbol).random() >= 0.05:
+            quote['trailingPE'] = round(profile['pe'], 2)
+        return quote
+
+    def fundamentals(self, symbol: str) -> pd.DataFrame:
+        self._faults.apply(f"{symbol} balance_sheet")
+        profile = self._profile(symbol)
+        rng = _rng(self.seed, 'fundamentals:' + symbol)
+        market_cap = float(self.path(symbol)['Close'].iloc[-1]) * profile['shares']
+        equity = market_cap / profile['price_to_book']
+        # Growth compounds backwards from the latest filing
+        scale = np.cumprod(np.concatenate([[1.0], 1 / (1 + rng.normal(0.12, 0.08, 3))]))
+        debt = equity * profile['debt_to_equity'] * rng.lognormal(0, 0.15, 4)
+        year = self.end.year if self.end.month > 3 else self.end.year - 1
+        periods = pd.to_datetime([f"{year - i}-03-31" for i in range(4)])
+        return pd.DataFrame(
+            {
+                'Total Debt': debt * scale,
+                'Total Equity Gross Minority Interest': equity * scale,
+                'Total Assets': (equity + debt) * scale * rng.uniform(1.1, 1.5),
+                'Cash And Cash Equivalents': equity * scale * rng.uniform(0.02, 0.2),
+            },
+            index=periods,
+        ).T
+
+    def holders(self, symbol: str, kind: str = 'institutional') -> pd.DataFrame:
+        self._faults.apply(f"{symbol} {kind}_holders")
+        profile = self._profile(symbol)
+        rng = _rng(self.seed, f'holders:{kind}:{symbol}')
+        count = int(rng.integers(3, 11))
+        held = profile[kind if kind == 'mutualfund' else 'institutional'] * rng.dirichlet(np.ones(count) * 0.7)
+        held = np.sort(held)[::-1]
+        price = float(self.path(symbol)['Close'].iloc[-1])
+        shares = (held * profile['shares']).round()
+        prefix = 'Fund' if kind == 'mutualfund' else 'Capital'
+        return pd.DataFrame(
+            {
+                'Date Reported': self.end - pd.to_timedelta(rng.integers(10, 100, count), unit='D'),
+                'Holder': [f"Synthetic {prefix} {i + 1}" for i in range(count)],
+                'pctHeld': held.round(4),
+                'Shares': shares,
+                'Value': shares * price,
+            }
+        )
+
+    def history(
+        self,
+        symbols: Sequence[str],
+        period: Optional[str] = '3mo',
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+    ) -> pd.DataFrame:
+        symbols = list(symbols)
+        self._faults.apply(f"history of {len(symbols)} symbols")
+        if not symbols:
+            return normalize_history(None, symbols)
+        frames = {symbol: self.path(symbol)[list(OHLCV_FIELDS)] for symbol in symbols}
+        history = normalize_history(pd.concat(frames, axis=1).swaplevel(axis=1), symbols)
+        lower = pd.Timestamp(start) if start else period_start(history.index, period)
+        if lower is not None:
+            history = history[history.index >= lower]
+        if end:
+            history = history[history.index < pd.Timestamp(end)]
+        return history
+
+
+class SyntheticNewsSource:
+    """NewsAPI ``/v2/everything`` stand-in: seeded, dated articles per query"""
+
+    def __init__(
+        self,
+        seed: int = 0,
+        per_day: float = 3.0,
+        days: int = 30,
+        end: Optional[str] = None,
+        latency: float = 0.0,
+        failure_rate: float = 0.0,
+    ):
+        """
+        Args:
+            per_day: Mean articles per query per day
+            days: Days of coverage ending at ``end`` (today by default)
+        """
+        self.seed = seed
+        self.per_day = per_day
+        self.days = days
+        self.end = _end_date(end) + pd.Timedelta(days=1)
+        self.requests = 0
+        self._faults = _Faults(seed, latency, failure_rate)
+        self._articles: Dict[str, List[Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+
+    def articles(self, query: str) -> List[Dict[str, Any]]:
+        """Every article for ``query``, newest first"""
+        with self._lock:
+            if query in self._articles:
+                return self._articles[query]
+        rng = _rng(self.seed, 'news:' + query)
+        count = int(rng.poisson(self.per_day * self.days))
+        offsets = np.sort(rng.uniform(0, self.days * 86400, count))
+        slug = ''.join(c if c.isalnum() else '-' for c in query.lower()).strip('-')
+        articles = []
+        for i, offset in enumerate(offsets):
+            published = (self.end - pd.Timedelta(seconds=int(offset))).strftime('%Y-%m-%dT%H:%M:%SZ')
+            source = NEWS_SOURCES[int(rng.integers(len(NEWS_SOURCES)))]
+            title = HEADLINES[int(rng.integers(len(HEADLINES)))].format(q=query)
+            articles.append(
+                {
+                    'source': {'id': None, 'name': source},
+                    'author': f"{source} Bureau",
+                    'title': title,
+                    'description': f"{title}. Synthetic coverage item {i + 1} for offline testing.",
+                    'url': f"https://news.example.com/{slug}/{i + 1}",
+                    'urlToImage': None,
+                    'publishedAt': published,
+                    'content': f"{title} ... [+{int(rng.integers(500, 4000))} chars]",
+                }
+            )
+        with self._lock:
+            return self._articles.setdefault(query, articles)
+
+    def __call__(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Response for one request's query parameters (q, page, pageSize, from)"""
+        self._faults.apply(f"news {params.get('q')}")
+        with self._lock:
+            self.requests += 1
+        articles = self.articles(params['q'])
+        since = params.get('from')
+        if since:
+            articles = [a for a in articles if a['publishedAt'] >= since]
+        page, size = int(params.get('page', 1)), int(params.get('pageSize', 100))
+        return {'status': 'ok', 'totalResults': len(articles), 'articles': articles[(page - 1) * size : page * size]}
+
+    def request(self, url: str) -> Dict[str, Any]:
+        """Response for a full NewsAPI URL (the ``fetch_live_headline_from_newsapi`` request hook)"""
+        query = urllib.parse.urlsplit(url).query
+        return self({k: v[0] for k, v in urllib.parse.parse_qs(query).items()})
+
+
+def main(
+    symbols: int = 1000,
+    seed: int = 0,
+    latency: float = 0.0,
+    failure_rate: float = 0.0,
+    remote: bool = False,
+    workers: int = 32,
+):
+    """Discover, score and stream news for a synthetic universe; print timings and write metrics"""
+    import asyncio
+    import tempfile
+
+    from data_cache import DataCache
+    from dynamic_pli_analyzer import analyze_expert_validated_asymmetry, discover_companies_with_expert_insights
+    from metrics import shared_metrics
+    from news_client import AsyncNewsClient, build_news_queries
+    from price_store import PriceStore
+    from rate_limit import TokenBucket
+
+    provider = SyntheticMarketProvider(seed=seed, latency=latency, failure_rate=failure_rate, remote=remote)
+    universe = synthetic_symbols(symbols)
+    metrics = shared_metrics()
+
+    with tempfile.TemporaryDirectory() as cache_dir, PriceStore(Path(cache_dir) / "prices.sqlite") as store:
+        started = time.perf_counter()
+        with metrics.stage('fetch'):
+            # Generous limiter: the point is to stress concurrency, not to pace a real API
+            companies = discover_companies_with_expert_insights(
+                universe,
+                provider=provider,
+                cache=DataCache(Path(cache_dir)),
+                max_workers=workers,
+                limiter=TokenBucket(10_000, 10_000),
+                sectors={s: 'synthetic' for s in universe},
+                store=store,
+            )
+        with metrics.stage('score'):
+            analysis = analyze_expert_validated_asymmetry(companies)
+        discovered = time.perf_counter()
+
+    news = SyntheticNewsSource(seed=seed, latency=latency, failure_rate=failure_rate)
+    queries = build_news_queries(companies=[c['name'] for c in companies[:200]])
+
+    async def stream() -> int:
+        async with AsyncNewsClient('synthetic', transport=news, max_connections=8) as client:
+            return len(await client.fetch_all(queries))
+
+    with metrics.stage('news'):
+        articles = asyncio.run(stream())
+    finished = time.perf_counter()
+
+    top = analysis['top_company']
+    print(
+        f"🧪 {len(companies)}/{symbols} synthetic companies in {discovered - started:.2f}s; "
+        f"top pick {top['symbol']} (score {top['asymmetry_score']})"
+        if top
+        else "🧪 No companies built"
+    )
+    print(
+        f"📰 {articles} articles for {len(queries)} queries in {news.requests} requests, "
+        f"{finished - discovered:.2f}s"
+    )
+    paths = metrics.write()
+    print(f"📈 Metrics written to {paths['json']}")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Offline load test on seeded synthetic market data and news")
+    parser.add_argument('--symbols', type=int, default=1000, help="Universe size")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--latency', type=float, default=0.0, help="Mean seconds per simulated call")
+    parser.add_argument('--failure-rate', type=float, default=0.0, help="Share of calls failing transiently")
+    parser.add_argument('--remote', action='store_true', help="Exercise the response cache, rate limiter and retries")
+    parser.add_argument('--workers', type=int, default=32, help="Symbols fetched concurrently")
+    args = parser.parse_args()
+
+    main(
+        symbols=args.symbols,
+        seed=args.seed,
+        latency=args.latency,
+        failure_rate=args.failure_rate,
+        remote=args.remote,
+        workers=args.workers,
+    )
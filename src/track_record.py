@@ -0,0 +1,203 @@
+"""
+Append-only track record.
+
+Picks are appended as JSON lines to ``data/track_record.jsonl`` and never
+rewritten. A small side index (``track_record.idx``, also append-only) maps
+each ``(date, symbol)`` to the byte offset of its line and to its current
+status, so:
+
+- appending a pick is one write to each file
+- the duplicate check is a dict lookup
+- status changes append one index line instead of rewriting the log
+- ``tail(n)`` seeks back from the end of the log and never parses older history
+"""
+
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config import settings
+
+Key = Tuple[str, str]
+
+_TAIL_BLOCK = 8192
+
+
+def _parse(line: bytes) -> Optional[Dict[str, Any]]:
+    try:
+        return json.loads(line)
+    except json.JSONDecodeError:
+        return None  # Torn line from an interrupted write
+
+
+class TrackRecord:
+    """JSONL pick log with a (date, symbol) -> (offset, status) side index"""
+
+    def __init__(self, path: Optional[Path] = None, index_path: Optional[Path] = None):
+        self.path = Path(path or settings.TRACK_RECORD_PATH)
+        self.index_path = Path(index_path or self.path.with_suffix('.idx'))
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._offsets: Dict[Key, int] = {}
+        self._statuses: Dict[Key, str] = {}
+        self._dates = set()
+        self._load_index()
+
+    # ------------------------------------------------------------ index
+
+    def _index(self, key: Key, offset: int, status: str):
+        self._offsets.setdefault(key, offset)
+        self._statuses[key] = status
+        self._dates.add(key[0])
+
+    def _append_index(self, key: Key, offset: int, status: str):
+        with open(self.index_path, 'a', encoding='utf-8') as f:
+            f.write(f"{key[0]}\t{key[1]}\t{offset}\t{status}\n")
+        self._index(key, offset, status)
+
+    def _load_index(self):
+        last_offset = -1
+        if self.index_path.exists():
+            with open(self.index_path, encoding='utf-8') as f:
+                for line in f:
+                    parts = line.rstrip('\n').split('\t')
+                    if len(parts) != 4:
+                        continue  # Torn final line from an interrupted write
+                    date, symbol, offset, status = parts
+                    self._index((date, symbol), int(offset), status)
+                    last_offset = max(last_offset, int(offset))
+
+        # Index any log lines written after the last indexed one (e.g. a crash between the two appends)
+        if self.path.exists():
+            with open(self.path, 'rb') as f:
+                if last_offset >= 0:
+                    f.seek(last_offset)
+                    f.readline()
+                while True:
+                    offset = f.tell()
+                    line = f.readline()
+                    if not line.endswith(b'\n'):
+                        break
+                    entry = _parse(line)
+                    if entry is None:
+                        continue
+                    key = (entry['date'], entry['symbol'])
+                    if key not in self._offsets:
+                        self._append_index(key, offset, entry.get('status', 'Active'))
+
+    # ------------------------------------------------------------ reads
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def __contains__(self, key: Key) -> bool:
+        return key in self._offsets
+
+    def has_date(self, date: str) -> bool:
+        return date in self._dates
+
+    def _with_status(self, entry: Dict[str, Any]) -> Dict[str, Any]:
+        status = self._statuses.get((entry['date'], entry['symbol']))
+        return dict(entry, status=status) if status else entry
+
+    def get(self, date: str, symbol: str) -> Optional[Dict[str, Any]]:
+        """One pick by key, read with a single seek"""
+        offset = self._offsets.get((date, symbol))
+        if offset is None:
+            return None
+        with open(self.path, 'rb') as f:
+            f.seek(offset)
+            return self._with_status(json.loads(f.readline()))
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        """Every pick, oldest first (full scan)"""
+        if not self.path.exists():
+            return
+        with open(self.path, 'rb') as f:
+            for line in f:
+                entry = _parse(line) if line.endswith(b'\n') else None
+                if entry is not None:
+                    yield self._with_status(entry)
+
+    def tail(self, n: int) -> List[Dict[str, Any]]:
+        """Last ``n`` picks, oldest first, reading backwards from the end of the log"""
+        if n <= 0 or not self.path.exists():
+            return []
+        with open(self.path, 'rb') as f:
+            end = f.seek(0, os.SEEK_END)
+            position = end
+            buffer = b''
+            while position > 0 and buffer.count(b'\n') <= n:
+                step = min(_TAIL_BLOCK, position)
+                position -= step
+                f.seek(position)
+                buffer = f.read(step) + buffer
+
+        lines = buffer.split(b'\n')
+        # Drop the partial first line (unless we reached the start) and anything after the last newline
+        lines = lines[1:-1] if position > 0 else lines[:-1]
+        entries = [e for e in map(_parse, lines) if e is not None]
+        return [self._with_status(e) for e in entries[-n:]]
+
+    # ------------------------------------------------------------ writes
+
+    def append(self, entry: Dict[str, Any]) -> bool:
+        """Append a pick; returns False if that (date, symbol) is already recorded"""
+        key = (entry['date'], entry['symbol'])
+        if key in self._offsets:
+            return False
+        line = (json.dumps(entry, ensure_ascii=False) + '\n').encode('utf-8')
+        with open(self.path, 'a+b') as f:
+            offset = f.seek(0, os.SEEK_END)
+            if offset:
+                f.seek(offset - 1)
+                if f.read(1) != b'\n':
+                    # Terminate a torn line left by an interrupted write
+                    f.write(b'\n')
+                    offset += 1
+            f.write(line)
+        self._append_index(key, offset, entry.get('status', 'Active'))
+        return True
+
+    def set_status(self, date: str, symbol: str, status: str) -> bool:
+        """Record a new status for a pick; returns False if unknown or unchanged"""
+        key = (date, symbol)
+        if key not in self._offsets or self._statuses.get(key) == status:
+            return False
+        self._append_index(key, self._offsets[key], status)
+        return True
+
+    def migrate_json(self, json_path: Path) -> int:
+        """Append the entries of a legacy ``track_record.json``; returns picks added"""
+        json_path = Path(json_path)
+        if not json_path.exists():
+            return 0
+        with open(json_path) as f:
+            return sum(self.append(entry) for entry in json.load(f))
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Append-only track record")
+    parser.add_argument(
+        '--migrate',
+        nargs='?',
+        const=str(settings.DATA_DIR / "track_record.json"),
+        metavar='FILE',
+        help="Import a legacy track_record.json",
+    )
+    parser.add_argument('--tail', type=int, default=10, help="Picks to show")
+    args = parser.parse_args()
+
+    record = TrackRecord()
+    if args.migrate:
+        print(f"✅ Migrated {record.migrate_json(Path(args.migrate))} picks from {args.migrate}")
+    print(f"📒 {len(record)} picks in {record.path}")
+    for entry in record.tail(args.tail):
+        print(
+            f"   {entry['date']}  {entry['symbol']:<10} ₹{entry['price']:.2f} → ₹{entry['target']:.2f}  {entry['status']}"
+        )
@@ -0,0 +1,101 @@
+"""
+Sorted price-level index for crossing detection.
+
+Every live level (buy trigger, target and stop for each watched company, plus
+target and stop for each active track-record pick) is kept in a price-sorted
+list per symbol. A move from ``previous`` to ``price`` crosses exactly the
+levels between the two prices, so two bisections find them. Only crossed
+levels are touched, however many levels a symbol carries.
+
+Crossing rules match a plain comparison: moving up crosses levels in
+``(previous, price]`` and moving down crosses levels in ``[price, previous)``.
+"""
+
+import math
+import sys
+from bisect import bisect_left, bisect_right
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from backtest import STATUS_ACTIVE
+from dynamic_pli_analyzer import calculate_buy_trigger
+from mark_to_market import track_record_picks
+from track_record import TrackRecord
+from universe import nse_symbol
+
+UNIVERSE = 'universe'
+
+
+class Level(NamedTuple):
+    price: float
+    name: str  # 'buy_trigger', 'target' or 'stop'
+    source: str  # UNIVERSE, or the date of a track-record pick
+
+
+class TriggerIndex:
+    """Per-symbol price levels, sorted for bisect lookups"""
+
+    def __init__(self):
+        self._prices: Dict[str, List[float]] = {}
+        self._levels: Dict[str, List[Level]] = {}
+
+    def __len__(self) -> int:
+        return sum(len(levels) for levels in self._levels.values())
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._levels
+
+    @property
+    def symbols(self) -> List[str]:
+        return list(self._levels)
+
+    def add(self, symbol: str, name: str, price: float, source: str = UNIVERSE):
+        if price is None or math.isnan(price) or price <= 0:
+            return
+        prices = self._prices.setdefault(symbol, [])
+        i = bisect_right(prices, price)
+        prices.insert(i, price)
+        self._levels.setdefault(symbol, []).insert(i, Level(price, name, source))
+
+    def replace(self, symbol: str, levels: Dict[str, float], source: str = UNIVERSE):
+        """Swap one source's levels for a symbol (e.g. after its 52-week low moved)"""
+        kept = [level for level in self._levels.get(symbol, []) if level.source != source]
+        self._levels[symbol] = kept
+        self._prices[symbol] = [level.price for level in kept]
+        for name, price in levels.items():
+            self.add(symbol, name, price, source)
+
+    def levels(self, symbol: str, source: str = UNIVERSE) -> Dict[str, float]:
+        return {level.name: level.price for level in self._levels.get(symbol, []) if level.source == source}
+
+    def crossed(self, symbol: str, previous: float, price: float) -> List[Level]:
+        """Levels crossed moving from ``previous`` to ``price``, nearest first"""
+        prices = self._prices.get(symbol)
+        if not prices or price == previous:
+            return []
+        levels = self._levels[symbol]
+        if price > previous:
+            return levels[bisect_right(prices, previous) : bisect_right(prices, price)]
+        return levels[bisect_left(prices, price) : bisect_left(prices, previous)][::-1]
+
+
+def build_trigger_index(
+    companies: Iterable[Dict[str, Any]], track_record: Optional[TrackRecord] = None, runs_db: Optional[Path] = None
+) -> TriggerIndex:
+    """Buy/target/stop levels for ``companies`` plus target/stop for active picks (Yahoo symbols)"""
+    index = TriggerIndex()
+    for company in companies:
+        if company.get('fifty_two_week_low') and company.get('fifty_two_week_high'):
+            index.replace(nse_symbol(company['symbol']), calculate_buy_trigger(company))
+
+    if track_record is not None:
+        picks = track_record_picks(track_record, runs_db)
+        if not picks.empty:
+            active = picks[picks['status'] == STATUS_ACTIVE]
+            for pick in active.itertuples():
+                symbol = nse_symbol(pick.symbol)
+                index.add(symbol, 'target', pick.target, pick.date)
+                index.add(symbol, 'stop', pick.stop, pick.date)
+    return index
@@ -0,0 +1,120 @@
+"""
+Symbol universe for discovery scans.
+
+The universe is every symbol in ``config.settings.PLI_SECTORS``, optionally
+extended with a broader NSE list (CSV with a ``symbol`` and optional
+``sector`` column, or plain text with one symbol per line).
+"""
+
+import csv
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config import settings
+
+DEFAULT_EXTRA_SECTOR = 'nse'
+
+
+def nse_symbol(symbol: str) -> str:
+    symbol = symbol.strip().upper()
+    return symbol if '.' in symbol else f"{symbol}.NS"
+
+
+def load_symbol_list(path: Path) -> Dict[str, List[str]]:
+    """Read an extra symbol list into ``{sector: [symbols]}``"""
+    path = Path(path)
+    sectors: Dict[str, List[str]] = {}
+    with open(path, newline='') as f:
+        if path.suffix == '.csv':
+            for row in csv.DictReader(f):
+                symbol = (row.get('symbol') or row.get('SYMBOL') or '').strip()
+                if symbol:
+                    sector = (row.get('sector') or DEFAULT_EXTRA_SECTOR).strip() or DEFAULT_EXTRA_SECTOR
+                    sectors.setdefault(sector, []).append(nse_symbol(symbol))
+        else:
+            for line in f:
+                symbol = line.split('#')[0].strip()
+                if symbol:
+                    sectors.setdefault(DEFAULT_EXTRA_SECTOR, []).append(nse_symbol(symbol))
+    return sectors
+
+
+def build_universe(
+    sectors: Optional[Dict[str, List[str]]] = None, symbols_file: Optional[Path] = None
+) -> Dict[str, List[str]]:
+    """
+    Ordered ``{sector: [symbols]}`` with each symbol listed once.
+
+    Args:
+        sectors: Sector map to scan (defaults to settings.PLI_SECTORS)
+        symbols_file: Optional broader symbol list appended after the sectors
+    """
+    sources = [settings.PLI_SECTORS if sectors is None else sectors]
+    if symbols_file and not Path(symbols_file).is_file():
+        # settings.NSE_UNIVERSE_FILE is the bare --universe default and isn't shipped
+        raise FileNotFoundError(
+            f"Universe file not found: {symbols_file}. Pass --universe FILE "
+            f"(CSV with a symbol[,sector] header, or one symbol per line)"
+        )
+    if symbols_file:
+        sources.append(load_symbol_list(symbols_file))
+
+    universe: Dict[str, List[str]] = {}
+    seen = set()
+    for source in sources:
+        for sector, symbols in source.items():
+            for symbol in symbols:
+                if symbol not in seen:
+                    seen.add(symbol)
+                    universe.setdefault(sector, []).append(symbol)
+    return universe
+
+
+def sector_map(universe: Dict[str, List[str]]) -> Dict[str, str]:
+    """Invert a universe into ``{symbol: sector}``"""
+    return {symbol: sector for sector, symbols in universe.items() for symbol in symbols}
+
+
+class ScanProgress:
+    """Per-sector progress and throughput reporting for a universe scan"""
+
+    def __init__(self, sectors: Dict[str, str], report=print):
+        self.sector_of = sectors
+        self.report = report
+        self.totals: Dict[str, int] = {}
+        for sector in sectors.values():
+            self.totals[sector] = self.totals.get(sector, 0) + 1
+        self.done = {sector: 0 for sector in self.totals}
+        self.failed = {sector: 0 for sector in self.totals}
+        self.started = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def update(self, symbol: str, ok: bool):
+        """Record one finished symbol; reports when its sector completes"""
+        sector = self.sector_of.get(symbol, DEFAULT_EXTRA_SECTOR)
+        with self._lock:
+            self.totals.setdefault(sector, 0)
+            self.done[sector] = self.done.get(sector, 0) + 1
+            if not ok:
+                self.failed[sector] = self.failed.get(sector, 0) + 1
+            if self.done[sector] == self.totals[sector]:
+                elapsed = time.perf_counter() - self.started
+                self.report(
+                    f"  ▸ {sector}: {self.done[sector] - self.failed[sector]}/{self.totals[sector]} "
+                    f"fetched ({elapsed:.1f}s elapsed)"
+                )
+
+    def summary(self) -> str:
+        elapsed = time.perf_counter() - self.started
+        done = sum(self.done.values())
+        failed = sum(self.failed.values())
+        rate = done / elapsed if elapsed > 0 else 0.0
+        return (
+            f"{done - failed}/{sum(self.totals.values())} symbols across {len(self.totals)} sectors "
+            f"in {elapsed:.1f}s ({rate:.1f} symbols/s)"
+        )
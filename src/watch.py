@@ -0,0 +1,249 @@
+"""
+Watch mode: poll quotes during NSE market hours and alert on level crossings.
+
+The weekly batch run only checks buy triggers once a week. ``watch`` runs a
+full discovery once, then polls last prices for the whole universe with one
+bulk request per tick. Only symbols whose price changed are touched on a
+tick:
+
+- crossed buy/target/stop levels are looked up in a sorted trigger index
+  (see trigger_index.py), which also carries active track-record picks
+- a price outside the 52-week range moves that bound (and so the levels)
+- their rule inputs are re-scored in one vectorized call
+
+Alerts go to stdout and are appended as JSON lines to ``settings.ALERTS_FILE``.
+"""
+
+import json
+import math
+import sys
+import time
+from datetime import datetime
+from datetime import time as dt_time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Mapping, Optional
+from zoneinfo import ZoneInfo
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config import settings
+from dynamic_pli_analyzer import calculate_buy_trigger, discover_companies_with_expert_insights, load_price_history
+from mark_to_market import live_prices
+from providers import get_default_provider
+from rule_engine import RuleSet, default_rules
+from scoring import companies_to_frame, score_companies, score_frame
+from track_record import TrackRecord
+from trigger_index import UNIVERSE, TriggerIndex, build_trigger_index
+from universe import build_universe, nse_symbol, sector_map
+
+LEVEL_LABELS = {'buy_trigger': 'buy trigger', 'target': 'target', 'stop': 'stop'}
+
+
+def market_now() -> datetime:
+    return datetime.now(ZoneInfo(settings.MARKET_TIMEZONE))
+
+
+def market_is_open(now: Optional[datetime] = None) -> bool:
+    """Whether ``now`` (exchange time) falls in a weekday trading session"""
+    now = now or market_now()
+    session_open = dt_time.fromisoformat(settings.MARKET_OPEN)
+    session_close = dt_time.fromisoformat(settings.MARKET_CLOSE)
+    return now.weekday() < 5 and session_open <= now.time() < session_close
+
+
+def _valid(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not math.isnan(value) and value > 0
+
+
+class Watcher:
+    """Per-symbol price, levels and score, updated one tick at a time"""
+
+    def __init__(
+        self,
+        companies: List[Dict[str, Any]],
+        rules: Optional[RuleSet] = None,
+        alerts_path: Optional[Path] = None,
+        emit: Callable[[str], None] = print,
+        index: Optional[TriggerIndex] = None,
+    ):
+        self.rules = rules or default_rules()
+        self.alerts_path = Path(alerts_path or settings.ALERTS_FILE)
+        self.emit = emit
+        self.companies = {nse_symbol(c['symbol']): c for c in companies}
+        self.prices = {s: c.get('current_price') for s, c in self.companies.items()}
+        self.index = index or build_trigger_index(companies)
+
+    @property
+    def symbols(self) -> List[str]:
+        """Watched companies plus symbols that only have track-record levels"""
+        return list(self.companies) + [s for s in self.index.symbols if s not in self.companies]
+
+    def _crossings(self, symbol: str, previous: float, price: float, now: datetime) -> List[Dict[str, Any]]:
+        company = self.companies.get(symbol, {})
+        direction = 'up' if price > previous else 'down'
+        return [
+            {
+                'timestamp': now.isoformat(timespec='seconds'),
+                'symbol': company.get('symbol', symbol.removesuffix('.NS')),
+                'level': level.name,
+                'level_price': round(level.price, 2),
+                'source': level.source,
+                'previous': previous,
+                'price': price,
+                'direction': direction,
+                'score': company.get('asymmetry_score'),
+            }
+            for level in self.index.crossed(symbol, previous, price)
+        ]
+
+    def _update(self, symbol: str, price: float):
+        company = self.companies[symbol]
+        company['current_price'] = price
+        self.prices[symbol] = price
+        moved = False
+        if _valid(company.get('fifty_two_week_low')) and price < company['fifty_two_week_low']:
+            company['fifty_two_week_low'] = price
+            moved = True
+        if _valid(company.get('fifty_two_week_high')) and price > company['fifty_two_week_high']:
+            company['fifty_two_week_high'] = price
+            moved = True
+        if moved and _valid(company.get('fifty_two_week_high')):
+            self.index.replace(symbol, calculate_buy_trigger(company))
+        if _valid(company.get('fifty_two_week_low')) and 'distance_from_low_pct' in company:
+            low = company['fifty_two_week_low']
+            company['distance_from_low_pct'] = (price - low) / low * 100
+
+    def _rescore(self, symbols: List[str]):
+        changed = [self.companies[s] for s in symbols if s in self.companies]
+        if not changed:
+            return
+        scores = score_frame(companies_to_frame(changed, self.rules), self.rules)
+        for company, score in zip(changed, scores.tolist()):
+            company['asymmetry_score'] = score
+
+    def tick(self, prices: Mapping[str, float], now: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """Apply one round of last prices (Yahoo symbols); returns the alerts raised"""
+        now = now or market_now()
+        changed = [
+            s
+            for s, price in prices.items()
+            if (s in self.companies or s in self.index) and _valid(price) and price != self.prices.get(s)
+        ]
+        if not changed:
+            return []
+
+        alerts = []
+        for symbol in changed:
+            previous = self.prices.get(symbol)
+            if _valid(previous):
+                alerts.extend(self._crossings(symbol, previous, prices[symbol], now))
+            if symbol in self.companies:
+                self._update(symbol, prices[symbol])
+            else:
+                self.prices[symbol] = prices[symbol]
+        self._rescore(changed)
+
+        if alerts:
+            self._publish(alerts)
+        return alerts
+
+    def _publish(self, alerts: List[Dict[str, Any]]):
+        self.alerts_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.alerts_path, 'a', encoding='utf-8') as f:
+            for alert in alerts:
+                f.write(json.dumps(alert, ensure_ascii=False) + '\n')
+        for alert in alerts:
+            arrow = '↑' if alert['direction'] == 'up' else '↓'
+            origin = f"score {alert['score']}" if alert['source'] == UNIVERSE else f"pick of {alert['source']}"
+            self.emit(
+                f"🔔 {alert['timestamp'][11:19]} {alert['symbol']} {arrow} {LEVEL_LABELS[alert['level']]} "
+                f"₹{alert['level_price']:.2f} (₹{alert['previous']:.2f} → ₹{alert['price']:.2f}, {origin})"
+            )
+
+
+def watch(
+    watcher: Watcher,
+    fetch_prices: Callable[[List[str]], Mapping[str, float]],
+    poll_seconds: float = settings.WATCH_POLL_SECONDS,
+    max_ticks: Optional[int] = None,
+    ignore_hours: bool = False,
+    sleep: Callable[[float], None] = time.sleep,
+):
+    """Poll ``fetch_prices`` every ``poll_seconds`` while the market is open"""
+    ticks = 0
+    while max_ticks is None or ticks < max_ticks:
+        if ignore_hours or market_is_open():
+            started = time.perf_counter()
+            try:
+                prices = fetch_prices(watcher.symbols)
+            except Exception as e:
+                print(f"⚠️ Quote poll failed: {e}")
+            else:
+                fetched = time.perf_counter()
+                alerts = watcher.tick(prices)
+                print(
+                    f"⏱  {market_now():%H:%M:%S} {len(watcher.symbols)} symbols, {len(alerts)} alerts "
+                    f"(fetch {fetched - started:.2f}s, tick {(time.perf_counter() - fetched) * 1000:.1f}ms)"
+                )
+            ticks += 1
+            if ticks == max_ticks:
+                break
+        sleep(poll_seconds)
+
+
+def main(
+    data_dir: Optional[str] = None,
+    universe_file: Optional[str] = None,
+    poll_seconds: float = settings.WATCH_POLL_SECONDS,
+    max_ticks: Optional[int] = None,
+    ignore_hours: bool = False,
+):
+    """Discover and score the universe once, then watch it"""
+    provider = get_default_provider(Path(data_dir) if data_dir else None)
+    universe = build_universe(symbols_file=Path(universe_file) if universe_file else None)
+    symbols = [s for sector_symbols in universe.values() for s in sector_symbols]
+    history = load_price_history(symbols, period=settings.PRICE_HISTORY_PERIOD, provider=provider)
+    companies = discover_companies_with_expert_insights(
+        symbols, history=history, provider=provider, sectors=sector_map(universe)
+    )
+    score_companies(companies, top_k=0)
+
+    watcher = Watcher(companies, index=build_trigger_index(companies, TrackRecord()))
+    print(f"👀 Watching {len(watcher.symbols)} symbols every {poll_seconds:.0f}s; alerts → {watcher.alerts_path}")
+    # Intraday ticks need live quotes; the price store only holds daily bars
+    watch(
+        watcher,
+        lambda symbols: live_prices(symbols, provider).to_dict(),
+        poll_seconds=poll_seconds,
+        max_ticks=max_ticks,
+        ignore_hours=ignore_hours,
+    )
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Watch quotes and alert on buy/target/stop crossings")
+    parser.add_argument('--interval', type=float, default=settings.WATCH_POLL_SECONDS, help="Seconds between polls")
+    parser.add_argument('--ticks', type=int, help="Stop after this many polls")
+    parser.add_argument('--ignore-hours', action='store_true', help="Poll outside NSE market hours too")
+    parser.add_argument('--data-dir', metavar='DIR', help="Local market data dumps")
+    parser.add_argument(
+        '--universe',
+        metavar='FILE',
+        nargs='?',
+        const=str(settings.NSE_UNIVERSE_FILE),
+        help="Also watch a broader NSE symbol list " f"(bare flag: {settings.NSE_UNIVERSE_FILE}, not shipped)",
+    )
+    args = parser.parse_args()
+
+    try:
+        main(
+            data_dir=args.data_dir,
+            universe_file=args.universe,
+            poll_seconds=args.interval,
+            max_ticks=args.ticks,
+            ignore_hours=args.ignore_hours,
+        )
+    except KeyboardInterrupt:
+        print("\n👋 Watch stopped")
@@ -0,0 +1,82 @@
+"""Tests for the vectorized pick backtest"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from backtest import evaluate_picks, load_picks, summarize, update_track_record
+from price_history import normalize_history
+from run_store import RunStore
+from track_record import TrackRecord
+
+def make_history(paths):
+    """OHLCV frame where every bar's high/low is its close +/- 1"""
+
+    dates = pd.bdate_range('2026-03-02', periods=len(next(iter(paths.values()))))
+    fields = {}
+    for symbol, closes in paths.items():
+        closes = np.asarray(closes, dtype=float)
+        fields[('Close', symbol)] = closes
+        fields[('High', symbol)] = closes + 1
+        fields[('Low', symbol)] = closes - 1
+    return normalize_history(pd.DataFrame(fields, index=dates), list(paths))
+
+def test_target_stop_and_open_picks():
+    """Each pick exits on its first target or stop touch after the entry date"""
+
+    history = make_history({
+        'UP.NS': [100, 105, 112, 121, 130, 125],
+        'DOWN.NS': [100, 98, 90, 80, 70, 75],
+        'FLAT.NS': [100, 101, 99, 100, 102, 103],
+    })
+    picks = pd.DataFrame({
+        'date': ['2026-03-02'] * 3 + ['2026-03-09'],
+        'symbol': ['UP', 'DOWN', 'FLAT', 'UP'],
+        'entry': [100.0, 100.0, 100.0, 125.0],
+        'target': [120.0, 150.0, 150.0, 150.0],
+        'stop': [80.0, 85.0, 50.0, 80.0],
+    })
+
+    results = evaluate_picks(picks, history)
+
+    assert list(results['status']) == ['Target Hit', 'Stopped Out', 'Active', 'No Data']
+    assert list(results['exit_date'][:3]) == ['2026-03-05', '2026-03-05', '2026-03-09']
+    assert results['return_pct'].iloc[0] == pytest.approx(20.0)
+    assert results['return_pct'].iloc[1] == pytest.approx(-15.0)
+    assert results['return_pct'].iloc[2] == pytest.approx(3.0)
+    assert results['days_in_trade'].iloc[0] == 3
+    assert results['max_drawdown_pct'].iloc[1] == pytest.approx(-15.0)
+
+    summary = summarize(results)
+    assert summary['closed'] == 2 and summary['hit_rate'] == 0.5
+    assert summary['per_symbol'].loc['UP', 'targets_hit'] == 1
+
+def test_load_picks_merges_reports_and_track_record(tmp_path):
+    """Stored runs supply the 52-week low; the later run of a day wins"""
+
+    with RunStore(tmp_path / "runs.sqlite") as store:
+        for hour, price in [('05', 530.0), ('09', 531.0)]:
+            store.append_run({'timestamp': f"2026-03-02T{hour}:00:00",
+                              'top_company': {'symbol': 'TCIEXP', 'name': 'TCI Express', 'current_price': price,
+                                              'fifty_two_week_low': 478.0, 'fifty_two_week_high': 848.0}})
+    track = tmp_path / "track_record.jsonl"
+    record = TrackRecord(track)
+    record.append({'date': '2026-03-02', 'company': 'TCI Express', 'symbol': 'TCIEXP', 'price': 530.1, 'target': 848.0, 'status': 'Active'})
+    record.append({'date': '2026-03-09', 'company': 'TCI Express', 'symbol': 'TCIEXP', 'price': 500.0, 'target': 848.0, 'status': 'Active'})
+
+    picks = load_picks(tmp_path / "runs.sqlite", track)
+
+    assert len(picks) == 2
+    assert picks['entry'].iloc[0] == 531.0
+    assert picks['stop'].iloc[0] == 478.0 * 0.95
+    assert picks['stop'].iloc[1] == 500.0 * 0.95
+
+    results = picks.assign(status=['Stopped Out', 'No Data'])
+    assert update_track_record(results, track) == 1
+    assert [e['status'] for e in TrackRecord(track)] == ['Stopped Out', 'Active']
@@ -0,0 +1,29 @@
+"""Tests for the benchmark suite"""
+
+import sys
+from pathlib import Path
+
+# Add benchmarks to path
+sys.path.append(str(Path(__file__).parent.parent / "benchmarks"))
+
+from run_benchmarks import regressions, run_benchmarks, synthetic_companies
+
+def test_synthetic_universe_is_seeded_and_plausible():
+    """Same seed, same universe; the 52-week range brackets the price"""
+
+    companies = synthetic_companies(500, seed=7)
+    assert companies == synthetic_companies(500, seed=7)
+    assert len({c['symbol'] for c in companies}) == 500
+    assert all(c['fifty_two_week_low'] <= c['current_price'] <= c['fifty_two_week_high'] for c in companies)
+    assert companies[0]['symbol'] == 'DIXON'
+
+def test_small_run_and_regression_check():
+    """Every case is timed per size; only slowdowns past ratio and floor count"""
+
+    results = run_benchmarks(sizes=[10], repeat=1)
+    assert set(results) == {'score/10', 'report/10', 'persist/10', 'readme/10'}
+
+    baseline = {'thresholds': {'max_ratio': 1.5, 'min_seconds': 0.01},
+                'results': {'score/10': 0.1, 'report/10': 0.001}}
+    slow = regressions({'score/10': 0.2, 'report/10': 0.005}, baseline)
+    assert len(slow) == 1 and slow[0].startswith('score/10')
@@ -0,0 +1,47 @@
+"""Tests for the fast-start CLI"""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+SRC = Path(__file__).parent.parent / "src"
+
+def run_python(code, tmp_path):
+    """Run ``code`` in a fresh interpreter so sys.modules reflects only what it imported"""
+    script = tmp_path / "probe.py"
+    script.write_text(f"import sys\nsys.path.insert(0, {str(SRC)!r})\n{code}")
+    result = subprocess.run([sys.executable, str(script)], capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0, result.stderr
+    return result.stdout
+
+def test_analyzer_import_stays_light(tmp_path):
+    """Importing the analyzer (insights, scoring entry point) loads no heavy or network modules"""
+
+    out = run_python(
+        "import json, cli, dynamic_pli_analyzer\n"
+        "print(json.dumps([m for m in cli.HEAVY_MODULES + ('dotenv',) if m in sys.modules]))\n",
+        tmp_path)
+    assert json.loads(out) == []
+
+def test_report_from_store_without_pandas(tmp_path):
+    """Re-rendering a stored run never imports pandas, numpy or the network stack"""
+
+    db = tmp_path / "runs.sqlite"
+    out = run_python(
+        "import json, cli\n"
+        "from run_store import RunStore\n"
+        f"with RunStore({str(db)!r}) as store:\n"
+        "    store.append_run({'timestamp': '2026-03-02T09:30:00', 'top_company': {\n"
+        "        'name': 'Syrma SGS', 'symbol': 'SYRMA', 'current_price': 500.0, 'fifty_two_week_low': 450.0,\n"
+        "        'fifty_two_week_high': 700.0, 'asymmetry_score': 7, 'asymmetry_reasons': ['High stealth']},\n"
+        "        'all_companies': [{'symbol': 'SYRMA', 'name': 'Syrma SGS', 'price': 500.0, 'score': 7}]})\n"
+        f"cli.main(['report', '--format', 'plain', '--runs-db', {str(db)!r}])\n"
+        "print(json.dumps([m for m in cli.HEAVY_MODULES if m in sys.modules]))\n",
+        tmp_path)
+
+    report, heavy = out.rstrip('\n').rsplit('\n', 1)
+    assert json.loads(heavy) == []
+    assert 'Syrma SGS (SYRMA)' in report
+    assert 'Buy at: ₹459.00' in report
+    assert '2026-03-02 09:30:00' in report
@@ -0,0 +1,52 @@
+"""Tests for the on-disk provider cache"""
+
+import sys
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from data_cache import DataCache, MISSING
+
+def test_get_or_fetch_hits_after_first_call(tmp_path):
+    """Second lookup is served from disk without calling the provider"""
+
+    cache = DataCache(root=tmp_path, ttls={'info': 60})
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        return {'currentPrice': 100}
+
+    assert cache.get_or_fetch('DIXON.NS', 'info', fetch) == {'currentPrice': 100}
+    assert cache.get_or_fetch('DIXON.NS', 'info', fetch) == {'currentPrice': 100}
+    assert len(calls) == 1
+    assert cache.stats['hits'] == 1 and cache.stats['misses'] == 1
+    assert cache.stats['bytes_written'] > 0
+
+def test_per_kind_ttl(tmp_path):
+    """Each kind expires on its own TTL; kinds without a TTL are not cached"""
+
+    cache = DataCache(root=tmp_path, ttls={'info': 0.05, 'balance_sheet': 60})
+    cache.set('A', 'info', 1)
+    cache.set('A', 'balance_sheet', 2)
+    cache.set('A', 'unknown', 3)
+    time.sleep(0.1)
+
+    assert cache.get('A', 'info') is MISSING
+    assert cache.get('A', 'balance_sheet') == 2
+    assert cache.get('A', 'unknown') is MISSING
+    assert cache.stats['expired'] == 1
+
+def test_size_bound_evicts_oldest(tmp_path):
+    """Writing past max_bytes evicts the least recently used entries"""
+
+    cache = DataCache(root=tmp_path, ttls={'info': 60}, max_bytes=2500)
+    for i in range(5):
+        cache.set(f"S{i}", 'info', 'x' * 1000)
+        time.sleep(0.01)
+
+    assert cache.stats['evictions'] >= 3
+    assert cache.get('S4', 'info') == 'x' * 1000
+    assert cache.get('S0', 'info') is MISSING
@@ -0,0 +1,72 @@
+"""Tests for the concurrent fetch engine"""
+
+import sys
+import threading
+import time
+import random
+from pathlib import Path
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from fetch_engine import fetch_universe
+
+def test_results_keep_input_order():
+    """Results come back in symbol order regardless of completion order"""
+
+    def fetch(symbol, kind):
+        time.sleep(random.uniform(0, 0.02))
+        return f"{symbol}:{kind}"
+
+    symbols = [f"S{i}" for i in range(20)]
+    results = fetch_universe(symbols, fetch, endpoints=('info', 'history'), max_workers=4)
+
+    assert [r['info'] for r in results] == [f"{s}:info" for s in symbols]
+    assert [r['history'] for r in results] == [f"{s}:history" for s in symbols]
+
+def test_endpoints_fan_out_within_symbol():
+    """Endpoints for one symbol run in parallel, not back to back"""
+
+    def fetch(symbol, kind):
+        time.sleep(0.2)
+        return kind
+
+    start = time.perf_counter()
+    fetch_universe(['A'], fetch, endpoints=('a', 'b', 'c', 'd'), max_workers=1)
+    assert time.perf_counter() - start < 0.6
+
+def test_failures_and_timeouts_yield_none():
+    """A failing or slow symbol is dropped without affecting the others"""
+
+    errors = []
+
+    def fetch(symbol, kind):
+        if symbol == 'BAD':
+            raise ValueError("boom")
+        if symbol == 'SLOW':
+            time.sleep(1)
+        return symbol
+
+    results = fetch_universe(['OK', 'BAD', 'SLOW'], fetch, endpoints=('info',),
+                             timeout=0.2, on_error=lambda s, e: errors.append(s))
+
+    assert results[0] == {'info': 'OK'}
+    assert results[1] is None and results[2] is None
+    assert sorted(errors) == ['BAD', 'SLOW']
+
+def test_hung_call_does_not_starve_later_symbols():
+    """A call still running after its timeout doesn't hold up the symbols behind it"""
+
+    release = threading.Event()
+
+    def fetch(symbol, kind):
+        if symbol == 'HUNG':
+            release.wait(5)
+        return symbol
+
+    try:
+        results = fetch_universe(['HUNG', 'A', 'B'], fetch, endpoints=('info',), max_workers=1, timeout=0.2)
+    finally:
+        release.set()
+
+    assert results == [None, {'info': 'A'}, {'info': 'B'}]
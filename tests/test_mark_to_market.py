@@ -0,0 +1,77 @@
+"""Tests for batched mark-to-market of the track record"""
+
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from mark_to_market import mark_picks, mark_track_record
+from price_store import PriceStore
+from providers import MarketDataProvider, ProviderMissError
+from track_record import TrackRecord
+
+class CountingProvider(MarketDataProvider):
+    """Serves fixed last closes and counts history calls"""
+
+    def __init__(self, closes):
+        self.closes = closes
+        self.calls = 0
+
+    def quote(self, symbol):
+        raise ProviderMissError(symbol)
+
+    def fundamentals(self, symbol):
+        raise ProviderMissError(symbol)
+
+    def holders(self, symbol, kind='institutional'):
+        raise ProviderMissError(symbol)
+
+    def history(self, symbols, period='3mo', start=None, end=None):
+        self.calls += 1
+        dates = pd.bdate_range('2026-07-01', periods=2)
+        frame = pd.DataFrame({('Close', s): [self.closes[s] * 0.99, self.closes[s]] for s in symbols}, index=dates)
+        frame.columns = pd.MultiIndex.from_tuples(frame.columns, names=['Price', 'Ticker'])
+        return frame
+
+def test_mark_picks_statuses_are_sticky():
+    """Target/stop from the current price; terminal statuses never revert"""
+
+    picks = pd.DataFrame({
+        'symbol': ['A', 'B', 'C', 'D'],
+        'entry': [100.0, 100.0, 100.0, 100.0],
+        'target': [120.0, 120.0, 120.0, 120.0],
+        'stop': [90.0, 90.0, 90.0, 90.0],
+        'status': ['Active', 'Active', 'Active', 'Target Hit'],
+    })
+    prices = pd.Series({'A.NS': 125.0, 'B.NS': 85.0, 'C.NS': 110.0, 'D.NS': 100.0})
+
+    marked = mark_picks(picks, prices)
+
+    assert list(marked['status']) == ['Target Hit', 'Stopped Out', 'Active', 'Target Hit']
+    assert marked['unrealized_pnl_pct'].iloc[2] == pytest.approx(10.0)
+    assert marked['to_target_pct'].iloc[2] == pytest.approx(100 * (120 / 110 - 1))
+
+def test_one_price_call_for_all_picks(tmp_path):
+    """Years of entries across symbols cost one history request"""
+
+    record = TrackRecord(tmp_path / "track.jsonl")
+    for i, day in enumerate(pd.date_range('2024-01-01', periods=150, freq='W-MON')):
+        symbol = ['SYRMA', 'DIXON', 'TCIEXP'][i % 3]
+        record.append({'date': day.strftime('%Y-%m-%d'), 'company': symbol, 'symbol': symbol,
+                       'price': 100.0, 'target': 150.0, 'status': 'Active'})
+    provider = CountingProvider({'SYRMA.NS': 160.0, 'DIXON.NS': 120.0, 'TCIEXP.NS': 80.0})
+
+    with PriceStore(tmp_path / "prices.sqlite") as store:
+        marked = mark_track_record(record, provider=provider, runs_db=tmp_path / "runs.sqlite", store=store)
+        assert store.last_dates(['SYRMA.NS']) == {'SYRMA.NS': '2026-07-02'}
+
+    assert provider.calls == 1
+    assert len(marked) == 150
+    assert dict(zip(marked['symbol'], marked['status'])) == {
+        'SYRMA': 'Target Hit', 'DIXON': 'Active', 'TCIEXP': 'Stopped Out'}
+    # Recorded statuses belong to backtest.py --write
+    assert {e['status'] for e in TrackRecord(tmp_path / "track.jsonl")} == {'Active'}
@@ -0,0 +1,62 @@
+"""Tests for run metrics"""
+
+import json
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+import rate_limit
+from metrics import Metrics, prometheus_text, reset_metrics
+from providers import LocalFileProvider, YFinanceProvider, call_provider
+
+def test_provider_calls_are_timed_per_endpoint_and_ticker(monkeypatch, tmp_path):
+    """Each attempt is timed under its endpoint; retries and failures are counted"""
+
+    monkeypatch.setattr(rate_limit.time, 'sleep', lambda seconds: None)
+    metrics = reset_metrics()
+
+    attempts = []
+
+    def call():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise ConnectionError("429")
+        return {'longName': 'Dixon'}
+
+    assert call_provider(YFinanceProvider(), lambda p: call(), endpoint='info', symbol='DIXON.NS') == {'longName': 'Dixon'}
+    call_provider(LocalFileProvider(tmp_path), lambda p: None)
+
+    data = metrics.snapshot()
+    assert data['endpoints']['info']['calls'] == 3
+    assert data['endpoints']['info']['errors'] == 2
+    assert data['endpoints']['info']['retries'] == 2
+    assert data['endpoints']['history']['calls'] == 1
+    assert data['slowest_tickers'] == ['DIXON.NS']
+    assert 'rate_limit_wait_seconds' in data
+
+def test_write_exports_json_history_and_prometheus(tmp_path):
+    """One write produces the latest JSON, a history line and a textfile-collector file"""
+
+    metrics = Metrics()
+    with metrics.stage('score'):
+        sum(range(1000))
+    metrics.observe('balance_sheet', 0.25, 'AMBER.NS')
+    metrics.count_cache('responses', hits=3, misses=1)
+
+    paths = metrics.write(tmp_path)
+    metrics.write(tmp_path)
+
+    data = json.loads(paths['json'].read_text())
+    assert data['stages']['score']['runs'] == 1 and data['stages']['score']['wall_seconds'] >= 0
+    assert data['caches']['responses']['hit_rate'] == 0.75
+    assert data['peak_rss_bytes'] > 0
+    assert len(paths['history'].read_text().splitlines()) == 2
+
+    text = paths['prometheus'].read_text()
+    assert '# TYPE pli_provider_call_seconds summary' in text
+    assert 'pli_provider_call_seconds{endpoint="balance_sheet",quantile="0.5"} 0.25' in text
+    assert 'pli_cache_hit_ratio{cache="responses"} 0.75' in text
+    assert 'AMBER' not in text  # Per-ticker detail stays out of Prometheus
+    assert text == prometheus_text(data)
@@ -0,0 +1,99 @@
+"""Tests for the async NewsAPI client against a local keep-alive server"""
+
+import asyncio
+import json
+import sys
+import threading
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+# Add src and the repo root (latest_headline.py) to path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+sys.path.append(str(Path(__file__).parent.parent))
+
+from latest_headline import attach_news_coverage
+from news_client import AsyncNewsClient, build_news_queries
+
+class FakeNewsAPI(BaseHTTPRequestHandler):
+    """Serves 5 articles per query, paginated, over HTTP/1.1 keep-alive"""
+
+    protocol_version = 'HTTP/1.1'
+    connections = set()
+
+    def do_GET(self):
+        FakeNewsAPI.connections.add(self.client_address)
+        params = dict(urllib.parse.parse_qsl(urllib.parse.urlsplit(self.path).query))
+        page, size = int(params['page']), int(params['pageSize'])
+        total = 5
+        articles = [
+            {'title': f"{params['q']} #{i}", 'url': f"https://news/{params['q']}/{i}",
+             'publishedAt': f"2026-10-0{i + 1}T00:00:00Z"}
+            for i in range((page - 1) * size, min(page * size, total))
+        ]
+        body = json.dumps({'status': 'ok', 'totalResults': total, 'articles': articles}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def news_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FakeNewsAPI)
+    FakeNewsAPI.connections = set()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/v2/everything"
+    server.shutdown()
+
+def test_fan_out_paginates_and_reuses_connections(news_server):
+    """Every page of every query is streamed over at most max_connections sockets"""
+
+    queries = build_news_queries(companies=['Dixon', 'Amber'], sectors=['electronics'], keywords=['PLI scheme'])
+
+    async def run():
+        async with AsyncNewsClient('key', base_url=news_server, page_size=2, max_connections=2) as client:
+            articles = await client.fetch_all(queries)
+            return articles, client.requests
+
+    articles, requests = asyncio.run(run())
+
+    assert len(articles) == 5 * len(queries)
+    assert {a['query'] for a in articles} == set(queries)
+    assert requests == 3 * len(queries)  # pages of 2, 2 and 1
+    assert len(FakeNewsAPI.connections) <= 2
+
+def test_max_pages_caps_each_query(news_server):
+    """Pagination stops at max_pages even when more results exist"""
+
+    async def run():
+        async with AsyncNewsClient('key', base_url=news_server, page_size=2, max_pages=1) as client:
+            return await client.fetch_all(['PLI scheme'])
+
+    assert len(asyncio.run(run())) == 2
+
+def test_build_news_queries_deduplicates():
+    """Company, sector and keyword queries are combined without repeats"""
+
+    queries = build_news_queries(companies=['Dixon', 'Dixon'], sectors=['logistics'], keywords=['PLI scheme'])
+    assert queries == ['"Dixon"', 'logistics India PLI', 'PLI scheme']
+
+def test_coverage_is_attached_per_company():
+    """Each company gets the count and newest title of its own query's articles"""
+
+    companies = [{'name': 'Dixon Technologies'}, {'name': 'Amber Enterprises'}]
+    articles = [
+        {'query': 'Dixon Technologies', 'title': 'Older', 'publishedAt': '2026-10-01T08:00:00Z'},
+        {'query': 'Dixon Technologies', 'title': 'Newer', 'publishedAt': '2026-10-02T08:00:00Z'},
+        {'query': 'PLI scheme', 'title': 'Sector', 'publishedAt': '2026-10-03T08:00:00Z'},
+    ]
+
+    assert attach_news_coverage(companies, articles) == {'Dixon Technologies': 2, 'Amber Enterprises': 0}
+    assert companies[0]['latest_news'] == 'Newer'
+    assert companies[1]['latest_news'] is None
@@ -0,0 +1,61 @@
+"""Tests for the incremental news store"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from news_store import NewsStore
+
+class FakeClient:
+    """Stands in for AsyncNewsClient, recording the 'from' it was asked for"""
+
+    def __init__(self, articles):
+        self.articles = articles
+        self.since = None
+        self.errors = {}
+
+    async def stream(self, queries, since=None):
+        self.since = since
+        for query in queries:
+            for article in self.articles.get(query, []):
+                if article['publishedAt'].rstrip('Z') >= since[query]:
+                    yield dict(article, query=query)
+
+def _article(n, day):
+    return {'url': f"https://news/{n}", 'title': f"Story {n}", 'publishedAt': f"2026-10-{day:02d}T08:00:00Z",
+            'source': {'name': 'Wire'}}
+
+def _sync(store, client, queries):
+    async def run():
+        return [a async for a in store.sync(client, queries)]
+    return asyncio.run(run())
+
+def test_duplicates_across_queries_are_stored_once(tmp_path):
+    """An article found by two queries is new once and linked to both"""
+
+    shared = _article(1, 10)
+    client = FakeClient({'Dixon': [shared, _article(2, 11)], 'PLI scheme': [shared]})
+
+    with NewsStore(tmp_path / "news.sqlite") as store:
+        new = _sync(store, client, ['Dixon', 'PLI scheme'])
+        assert len(new) == 2
+        assert store.count() == 2
+        assert [a['title'] for a in store.articles_for('PLI scheme')] == ['Story 1']
+        assert [a['title'] for a in store.articles_for('Dixon')] == ['Story 2', 'Story 1']
+
+def test_second_fetch_starts_at_cursor(tmp_path):
+    """Later runs ask only for articles after the newest one seen"""
+
+    client = FakeClient({'Dixon': [_article(1, 10), _article(2, 11)]})
+    with NewsStore(tmp_path / "news.sqlite") as store:
+        _sync(store, client, ['Dixon'])
+        assert store.cursor('Dixon') == '2026-10-11T08:00:00Z'
+
+        client.articles['Dixon'].append(_article(3, 12))
+        new = _sync(store, client, ['Dixon'])
+
+        assert client.since['Dixon'] == '2026-10-11T08:00:00'
+        assert [a['title'] for a in new] == ['Story 3']
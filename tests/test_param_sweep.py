@@ -0,0 +1,66 @@
+"""Tests for the parallel parameter sweep"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from param_sweep import MAX_GRID_SETS, build_sweep_data, grid_params, param_names, random_params, run_sweep
+from price_history import normalize_history
+from rule_engine import default_rules
+
+def synthetic_history(n_days=400, symbols=('DIXON.NS', 'SYRMA.NS', 'AMBER.NS'), seed=3):
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range('2024-06-03', periods=n_days)
+    fields = {}
+    for symbol in symbols:
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, n_days)))
+        fields[('Close', symbol)] = close
+        fields[('High', symbol)] = close * 1.01
+        fields[('Low', symbol)] = close * 0.99
+        fields[('Volume', symbol)] = rng.integers(50_000, 500_000, n_days).astype(float)
+    return normalize_history(pd.DataFrame(fields, index=dates), list(symbols))
+
+COMPANIES = [
+    {'symbol': 'DIXON', 'expert_catalyst': 'Display JV', 'stealth_rank': 4, 'pe_ratio': 90},
+    {'symbol': 'SYRMA', 'expert_catalyst': 'Component PLI', 'stealth_rank': 1, 'debt_to_equity': 0.35},
+    {'symbol': 'AMBER', 'stealth_rank': 5, 'pe_ratio': 166},
+]
+
+def test_parameter_spaces():
+    """Grid covers every combination; random search starts from the current settings"""
+
+    rules = default_rules()
+    names = param_names(rules)
+    grid = grid_params(rules, space={name: [1.0] for name in names[:-2]})
+    assert grid.shape == (16, len(names))
+    # Default grid: each rule off or on, times the trigger grid
+    assert len(grid_params(rules)) == 2 ** (len(names) - 2) * 16 <= MAX_GRID_SETS
+    with pytest.raises(ValueError, match='random search'):
+        grid_params(rules, weight_levels=(0, 1, 2))
+
+    sampled = random_params(rules, 50, seed=1)
+    assert sampled.shape == (50, len(names))
+    assert sampled[0, -2] == 1.02 and sampled[0, -1] == 0.95
+    # Penalties stay non-positive
+    penalties = [i for i, r in enumerate(rules.rules) if r.weight < 0]
+    assert (sampled[:, penalties] <= 0).all()
+
+def test_pool_matches_in_process():
+    """Workers reading shared memory produce the same ranking as a single process"""
+
+    rules = default_rules()
+    data = build_sweep_data(synthetic_history(), COMPANIES, rules)
+    assert data['fired'].shape == (len(data['rebalance']), 3, len(rules.rules))
+
+    params = random_params(rules, 40, seed=2)
+    serial = run_sweep(data, params, param_names(rules), workers=1, chunk_size=8)
+    pooled = run_sweep(data, params, param_names(rules), workers=2, chunk_size=8)
+
+    pd.testing.assert_frame_equal(serial, pooled)
+    assert serial['mean_return_pct'].is_monotonic_decreasing
@@ -0,0 +1,86 @@
+"""Tests for the staged pipeline"""
+
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from config import settings
+from dynamic_pli_analyzer import fetch_company_data, fetch_price_history
+from pipeline import ArtifactStore, Pipeline, PipelineOptions
+from providers import MarketDataProvider
+from snapshot import Snapshot
+
+SYMBOLS = ('AAA.NS', 'BBB.NS')
+
+
+class FakeProvider(MarketDataProvider):
+    def quote(self, symbol):
+        price = 100.0 if symbol == 'AAA.NS' else 50.0
+        return {'longName': symbol + ' Ltd', 'currentPrice': price, 'marketCap': 1e9, 'trailingPE': 40.0}
+
+    def fundamentals(self, symbol):
+        return pd.DataFrame()
+
+    def holders(self, symbol, kind='institutional'):
+        return pd.DataFrame({'Holder': ['Fund'], 'Value': [1e7]})
+
+    def history(self, symbols, period='3mo', start=None, end=None):
+        dates = pd.bdate_range('2025-01-01', periods=300)
+        closes = {s: np.linspace(80.0, 120.0, len(dates)) for s in symbols}
+        return pd.concat({'Close': pd.DataFrame(closes, index=dates)}, axis=1)
+
+
+@pytest.fixture
+def options(tmp_path):
+    """Options replaying a snapshot recorded from the fake provider"""
+
+    snapshot = Snapshot.record(str(tmp_path / "run.snap"))
+    provider = FakeProvider()
+    fetch_price_history(list(SYMBOLS), period=settings.PRICE_HISTORY_PERIOD, snapshot=snapshot, provider=provider)
+    fetch_company_data(list(SYMBOLS), snapshot=snapshot, provider=provider)
+    snapshot.save()
+
+    rules = tmp_path / "rules.json"
+    rules.write_text(settings.SCORING_RULES_FILE.read_text(encoding='utf-8'), encoding='utf-8')
+    return PipelineOptions(symbols=SYMBOLS, sectors={}, replay=str(snapshot.path), rules_file=str(rules),
+                           readme=False, runs_db=str(tmp_path / "runs.sqlite"))
+
+def test_rerun_loads_every_stage(tmp_path, options):
+    """A second run with unchanged inputs runs nothing"""
+
+    store = ArtifactStore(tmp_path / "artifacts")
+    first = Pipeline(options, store, report=lambda line: None)
+    report = first.run('publish')
+    assert set(first.status.values()) == {'ran'}
+    assert report['run_id'] == 1
+
+    second = Pipeline(options, store, report=lambda line: None)
+    assert second.run('publish') == report
+    assert second.status == {'publish': 'cached'}  # Cached stages never load their dependencies
+    assert 'AAA' in second.output('render')
+
+def test_rule_change_reruns_only_score_and_render(tmp_path, options):
+    """Editing a scoring weight keeps the fetched and enriched artifacts"""
+
+    store = ArtifactStore(tmp_path / "artifacts")
+    Pipeline(options, store, report=lambda line: None).run('render')
+
+    rules_file = Path(options.rules_file)
+    spec = json.loads(rules_file.read_text(encoding='utf-8'))
+    spec['rules'][0]['weight'] += 1
+    rules_file.write_text(json.dumps(spec), encoding='utf-8')
+
+    rerun = Pipeline(options, store, report=lambda line: None)
+    rerun.run('render')
+    assert rerun.status == {'enrich': 'cached', 'score': 'ran', 'render': 'ran'}
+
+    forced = Pipeline(options, store, report=lambda line: None)
+    forced.run('score', force=True)
+    assert forced.status == {'fetch': 'ran', 'enrich': 'ran', 'score': 'ran'}
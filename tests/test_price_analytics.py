@@ -0,0 +1,52 @@
+"""Tests for vectorized 52-week and multi-horizon statistics"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from price_analytics import HORIZONS, merge_price_stats, price_stats
+from price_history import OHLCV_FIELDS
+
+def make_history(closes):
+    """Daily bars with High/Low 1% either side of the close"""
+    closes = pd.DataFrame(closes, index=pd.bdate_range('2025-01-01', periods=len(next(iter(closes.values())))))
+    fields = {'Open': closes, 'High': closes * 1.01, 'Low': closes * 0.99, 'Close': closes, 'Volume': closes * 0 + 1e5}
+    history = pd.concat(fields, axis=1)
+    history.columns.names = ['Price', 'Ticker']
+    return history[OHLCV_FIELDS]
+
+def test_stats_match_per_symbol_loop():
+    """One pass over the matrix matches a naive per-symbol computation"""
+
+    rng = np.random.default_rng(7)
+    closes = {f"S{i}.NS": 100 * np.exp(np.cumsum(rng.normal(0, 0.02, 400))) for i in range(5)}
+    closes['NEW.NS'] = np.r_[np.full(300, np.nan), np.linspace(50, 60, 100)]
+    stats = price_stats(make_history(closes))
+
+    for symbol, series in closes.items():
+        series = pd.Series(series).dropna()
+        window = series.iloc[-252:]
+        assert stats.loc[symbol, 'fifty_two_week_high'] == pytest.approx(window.max() * 1.01)
+        assert stats.loc[symbol, 'fifty_two_week_low'] == pytest.approx(window.min() * 0.99)
+        for name, bars in HORIZONS.items():
+            base = series.iloc[max(len(series) - 1 - bars, 0)]
+            assert stats.loc[symbol, name] == pytest.approx((series.iloc[-1] / base - 1) * 100)
+
+def test_short_history_leaves_range_unknown():
+    """A 52-week range is not computed from a few months of bars"""
+
+    stats = price_stats(make_history({'A.NS': np.linspace(100, 90, 60)}))
+    assert np.isnan(stats.loc['A.NS', 'fifty_two_week_low'])
+    assert stats.loc['A.NS', 'three_month_change'] == pytest.approx(-10.0)
+
+    companies = [{'symbol': 'A', 'fifty_two_week_low': 80.0}, {'symbol': 'B'}]
+    merge_price_stats(companies, stats)
+    assert companies[0]['fifty_two_week_low'] == 80.0
+    assert companies[0]['one_month_change'] == pytest.approx((90 / (100 - 10 * 38 / 59) - 1) * 100)
+    assert companies[1] == {'symbol': 'B'}
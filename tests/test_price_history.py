@@ -0,0 +1,46 @@
+"""Tests for batched price history handling"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from price_history import normalize_history, period_change
+
+def _download_like(symbols, closes):
+    """Frame shaped like yf.download(group_by='column') output"""
+    dates = pd.date_range('2026-01-01', periods=len(closes[0]), freq='B')
+    data = {}
+    for field in ['Close', 'High', 'Low', 'Open', 'Volume']:
+        for symbol, series in zip(symbols, closes):
+            data[(field, symbol)] = series
+    return pd.DataFrame(data, index=dates)
+
+def test_normalize_orders_fields_and_symbols():
+    """Columns come back as (field, symbol) in the requested symbol order"""
+
+    frame = _download_like(['B.NS', 'A.NS'], [[1.0, 2.0], [3.0, 4.0]])
+    history = normalize_history(frame, ['A.NS', 'B.NS'])
+
+    assert list(history.columns.get_level_values(0).unique()) == ['Open', 'High', 'Low', 'Close', 'Volume']
+    assert list(history['Close'].columns) == ['A.NS', 'B.NS']
+
+def test_period_change_skips_missing_bars():
+    """Change is measured between each symbol's first and last valid close"""
+
+    frame = _download_like(['A.NS', 'B.NS'], [[np.nan, 100.0, 90.0], [50.0, 55.0, np.nan]])
+    changes = period_change(normalize_history(frame, ['A.NS', 'B.NS']))
+
+    assert changes['A.NS'] == -10.0
+    assert round(changes['B.NS'], 6) == 10.0
+
+def test_empty_download_keeps_shape():
+    """An empty download still yields an aligned, empty frame"""
+
+    history = normalize_history(pd.DataFrame(), ['A.NS'])
+    assert history.empty
+    assert period_change(history).empty
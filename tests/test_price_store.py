@@ -0,0 +1,88 @@
+"""Tests for the incremental OHLCV store"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from price_history import OHLCV_FIELDS
+from price_store import PriceStore
+from providers import MarketDataProvider, ProviderMissError
+
+DATES = pd.bdate_range('2026-01-01', periods=60)
+
+def make_history(symbols, dates):
+    columns = pd.MultiIndex.from_product([OHLCV_FIELDS, symbols], names=['Price', 'Ticker'])
+    values = np.arange(len(dates) * len(columns), dtype=float).reshape(len(dates), len(columns)) + 1
+    return pd.DataFrame(values, index=dates, columns=columns)
+
+class GrowingProvider(MarketDataProvider):
+    """Serves bars up to ``self.today`` and records every history request"""
+
+    def __init__(self):
+        self.today = DATES[39]
+        self.requests = []
+
+    def quote(self, symbol):
+        raise ProviderMissError(symbol)
+
+    def fundamentals(self, symbol):
+        raise ProviderMissError(symbol)
+
+    def holders(self, symbol, kind='institutional'):
+        raise ProviderMissError(symbol)
+
+    def history(self, symbols, period='3mo', start=None, end=None):
+        self.requests.append((tuple(symbols), period, start))
+        dates = DATES[DATES <= self.today]
+        if start:
+            dates = dates[dates >= pd.Timestamp(start)]
+        return make_history(list(symbols), dates)
+
+def test_append_read_round_trip(tmp_path):
+    """Stored bars come back in the bulk-download layout"""
+
+    history = make_history(['A.NS', 'B.NS'], DATES[:10])
+    with PriceStore(tmp_path / "prices.sqlite") as store:
+        assert store.append(history) == 20
+        assert store.append(history) == 20  # Upsert, not duplicate
+        assert store.count() == 20
+        read = store.read(['A.NS', 'B.NS', 'C.NS'])
+
+    assert list(read.columns.get_level_values(0).unique()) == OHLCV_FIELDS
+    pd.testing.assert_frame_equal(read[['Close']].droplevel(0, axis=1)[['A.NS', 'B.NS']],
+                                  history['Close'], check_freq=False, check_names=False)
+    assert read['Close']['C.NS'].isna().all()
+
+def test_sync_fetches_only_new_bars(tmp_path):
+    """Second sync asks for bars after the last stored date, once per last-date group"""
+
+    provider = GrowingProvider()
+    with PriceStore(tmp_path / "prices.sqlite") as store:
+        first = store.sync(['A.NS', 'B.NS'], provider, initial_period='2y')
+        assert first == {'requests': 1, 'backfilled': 2, 'updated': 0, 'bars': 80}
+
+        provider.today = DATES[44]
+        second = store.sync(['A.NS', 'B.NS', 'C.NS'], provider)
+        assert store.count() == 3 * 45
+
+        assert provider.requests[1] == (('C.NS',), '2y', None)
+        assert provider.requests[2] == (('A.NS', 'B.NS'), None, '2026-02-25')
+        assert second['requests'] == 2
+        # Last stored bar re-fetched plus five new ones for the two known symbols
+        assert second['bars'] == 45 + 2 * 6
+        assert len(store.read(['A.NS'], period='1mo')) < 45
+
+def test_backfill_reaches_back_to_initial_start(tmp_path):
+    """An older ``initial_start`` (e.g. a backtest's first pick) widens the backfill; a recent one doesn't"""
+
+    provider = GrowingProvider()
+    with PriceStore(tmp_path / "prices.sqlite") as store:
+        store.sync(['A.NS'], provider, initial_period='1y', initial_start='2020-01-06')
+        store.sync(['B.NS'], provider, initial_period='1y', initial_start=pd.Timestamp.today().strftime('%Y-%m-%d'))
+
+    assert provider.requests == [(('A.NS',), None, '2020-01-06'), (('B.NS',), '1y', None)]
@@ -0,0 +1,166 @@
+"""Tests for market-data providers"""
+
+import importlib.util
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from providers import (FallbackProvider, LocalFileProvider, MarketDataProvider, ProviderMissError, call_provider,
+                       get_default_provider)
+from data_cache import DataCache
+from dynamic_pli_analyzer import fetch_company_data
+from rate_limit import TokenBucket
+
+@pytest.fixture
+def dump_dir(tmp_path):
+    """Small vendor dump in CSV form"""
+
+    pd.DataFrame([
+        {'symbol': 'DIXON', 'longName': 'Dixon Technologies', 'currentPrice': 11000.0, 'trailingPE': None},
+    ]).to_csv(tmp_path / "quotes.csv", index=False)
+    pd.DataFrame([
+        {'symbol': 'DIXON', 'item': 'Total Debt', 'date': '2025-03-31', 'value': 10.0},
+        {'symbol': 'DIXON', 'item': 'Total Debt', 'date': '2024-03-31', 'value': 8.0},
+    ]).to_csv(tmp_path / "balance_sheet.csv", index=False)
+    pd.DataFrame([
+        {'symbol': 'DIXON', 'kind': 'mutualfund', 'Holder': 'Fund A', 'Value': 5.0},
+        {'symbol': 'DIXON', 'kind': 'institutional', 'Holder': 'Inst B', 'Value': 7.0},
+    ]).to_csv(tmp_path / "holders.csv", index=False)
+    dates = pd.date_range('2026-01-01', periods=120, freq='D')
+    pd.DataFrame({'date': dates, 'symbol': 'DIXON', 'Close': range(120)}).to_csv(tmp_path / "history.csv", index=False)
+    return tmp_path
+
+class RemoteProvider(MarketDataProvider):
+    """Answers every symbol, standing in for yfinance"""
+
+    remote = True
+
+    def quote(self, symbol):
+        return {'longName': 'Remote ' + symbol}
+
+    def fundamentals(self, symbol):
+        raise ProviderMissError(symbol)
+
+    def holders(self, symbol, kind='institutional'):
+        raise ProviderMissError(symbol)
+
+    def history(self, symbols, period='3mo', start=None, end=None):
+        frame = pd.DataFrame({('Close', s): [1.0, 2.0] for s in symbols},
+                             index=pd.date_range('2026-04-29', periods=2))
+        frame.columns = pd.MultiIndex.from_tuples(frame.columns)
+        return frame
+
+class CountingBucket(TokenBucket):
+    """Token bucket that counts acquisitions"""
+
+    def __init__(self):
+        super().__init__(1000)
+        self.acquired = 0
+
+    def acquire(self, tokens=1.0):
+        self.acquired += 1
+        super().acquire(tokens)
+
+def test_local_provider_reads_dumps(dump_dir):
+    """Quotes, balance sheets and holders come back shaped like yfinance"""
+
+    provider = LocalFileProvider(dump_dir)
+
+    quote = provider.fetch('DIXON.NS', 'info')
+    assert quote['longName'] == 'Dixon Technologies' and 'trailingPE' not in quote
+
+    sheet = provider.fetch('DIXON.NS', 'balance_sheet')
+    assert sheet.loc['Total Debt'].iloc[0] == 10.0
+
+    holders = provider.fetch('DIXON.NS', 'mutualfund_holders')
+    assert list(holders['Holder']) == ['Fund A']
+
+    history = provider.history(['DIXON.NS'], period='1mo')
+    assert history['Close']['DIXON.NS'].iloc[-1] == 119
+    assert len(history) <= 32
+
+def test_fallback_provider_fills_missing_symbols(dump_dir):
+    """Symbols absent from the dump are served by the next provider"""
+
+    provider = FallbackProvider([LocalFileProvider(dump_dir), RemoteProvider()])
+
+    assert provider.remote
+    assert provider.quote('DIXON.NS')['longName'] == 'Dixon Technologies'
+    assert provider.quote('AMBER.NS')['longName'] == 'Remote AMBER.NS'
+
+    history = provider.history(['DIXON.NS', 'AMBER.NS'], period='1mo')
+    assert list(history['Close'].columns) == ['DIXON.NS', 'AMBER.NS']
+    assert history['Close']['AMBER.NS'].dropna().tolist() == [1.0, 2.0]
+
+def test_local_answers_never_take_a_token(dump_dir):
+    """Only calls that reach the remote member of a chain are rate limited"""
+
+    provider = FallbackProvider([LocalFileProvider(dump_dir), RemoteProvider()])
+    limiter = CountingBucket()
+
+    for kind in ('info', 'balance_sheet', 'institutional_holders', 'mutualfund_holders'):
+        call_provider(provider, lambda p: p.fetch('DIXON.NS', kind), limiter, endpoint=kind, symbol='DIXON.NS')
+    call_provider(provider, lambda p: p.history(['DIXON.NS'], period='1mo'), limiter)
+    assert limiter.acquired == 0
+
+    assert call_provider(provider, lambda p: p.quote('AMBER.NS'), limiter, endpoint='info') == {
+        'longName': 'Remote AMBER.NS'}
+    assert limiter.acquired == 1
+
+def test_refreshed_dump_is_read_on_the_next_run(dump_dir, tmp_path):
+    """Local answers skip the response cache; remote ones are cached"""
+
+    cache = DataCache(tmp_path / "cache")
+
+    def run():
+        provider = FallbackProvider([LocalFileProvider(dump_dir), RemoteProvider()])
+        return fetch_company_data(['DIXON.NS'], cache=cache, provider=provider, limiter=CountingBucket())
+
+    assert run()[0]['info']['currentPrice'] == 11000.0
+    pd.DataFrame([{'symbol': 'DIXON', 'longName': 'Dixon Technologies', 'currentPrice': 12000.0}]).to_csv(
+        dump_dir / "quotes.csv", index=False)
+    assert run()[0]['info']['currentPrice'] == 12000.0
+    assert cache.stats['writes'] == 0
+
+    provider = FallbackProvider([LocalFileProvider(dump_dir), RemoteProvider()])
+    call_provider(provider, lambda p: p.quote('AMBER.NS'), endpoint='info', symbol='AMBER.NS', cache=cache)
+    assert cache.get('AMBER.NS', 'info') == {'longName': 'Remote AMBER.NS'}
+
+def test_incomplete_provider_fails_when_created():
+    """A provider missing part of the interface can't be instantiated"""
+
+    class QuoteOnly(MarketDataProvider):
+        def quote(self, symbol):
+            return {}
+
+    with pytest.raises(TypeError, match='fundamentals'):
+        QuoteOnly()
+
+def test_local_provider_miss(dump_dir):
+    """Unknown symbols raise ProviderMissError"""
+
+    with pytest.raises(ProviderMissError):
+        LocalFileProvider(dump_dir).quote('AMBER.NS')
+
+def test_local_provider_reads_parquet(dump_dir):
+    """Parquet dumps read like CSV ones"""
+
+    pytest.importorskip('pyarrow')
+    pd.read_csv(dump_dir / "quotes.csv").to_parquet(dump_dir / "quotes.parquet", index=False)
+    (dump_dir / "quotes.csv").unlink()
+
+    assert LocalFileProvider(dump_dir).quote('DIXON.NS')['longName'] == 'Dixon Technologies'
+
+@pytest.mark.skipif(importlib.util.find_spec('pyarrow') is not None, reason="pyarrow is installed")
+def test_parquet_dump_without_pyarrow_fails_up_front(tmp_path):
+    """A Parquet dump without pyarrow is reported before any fetch, not as a miss"""
+
+    (tmp_path / "quotes.parquet").write_bytes(b'')
+
+    with pytest.raises(ImportError, match='pip install pyarrow'):
+        get_default_provider(tmp_path)
@@ -0,0 +1,54 @@
+"""Tests for rate limiting and retries"""
+
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from rate_limit import TokenBucket, call_with_retry
+
+def test_token_bucket_paces_after_burst():
+    """Burst capacity is free, further calls wait for refill"""
+
+    bucket = TokenBucket(rate=20, capacity=5)
+    start = time.perf_counter()
+    for _ in range(10):
+        bucket.acquire()
+    elapsed = time.perf_counter() - start
+
+    # 5 burst tokens, then 5 more at 20/s ~= 0.25s
+    assert 0.2 <= elapsed < 0.6
+
+def test_retry_until_success():
+    """Transient failures are retried with backoff"""
+
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise ConnectionError("429")
+        return 'ok'
+
+    retried = []
+    assert call_with_retry(flaky, retries=3, base_delay=0.001, max_delay=0.01,
+                           on_retry=lambda n, e: retried.append(n)) == 'ok'
+    assert retried == [1, 2]
+
+def test_permanent_errors_are_not_retried():
+    """should_retry=False errors propagate immediately"""
+
+    attempts = []
+
+    def missing():
+        attempts.append(1)
+        raise KeyError("no such symbol")
+
+    with pytest.raises(KeyError):
+        call_with_retry(missing, retries=5, base_delay=0.001,
+                        should_retry=lambda e: not isinstance(e, KeyError))
+    assert len(attempts) == 1
@@ -0,0 +1,68 @@
+"""Tests for the streaming report renderer"""
+
+import io
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from report_renderer import format_for_path, index_by_symbol, render_report
+
+INSIGHTS = {
+    'industry_metrics': {'component_pli_size': 40000},
+    'strategic_winners': {'DIXON': {'catalyst': 'Display JV <camera>', 'warning': 'Mobile PLI cut'}},
+    'stealth_ranking': {1: {'symbol': 'SYRMA', 'score': 'High Alpha', 'detail': ''}},
+}
+COMPANIES = [
+    {'symbol': 'SYRMA', 'name': 'Syrma SGS', 'current_price': 500.0, 'mf_percentage': 2.5,
+     'fifty_two_week_low': 450.0, 'fifty_two_week_high': 700.0, 'asymmetry_score': 7,
+     'asymmetry_reasons': ['High stealth (Rank 1)'], 'risk_flags': ['⚠️ High debt']},
+    {'symbol': 'DIXON', 'name': 'Dixon Technologies', 'current_price': 12000.0},
+]
+ASYMMETRY = {'top_company': COMPANIES[0], 'all_companies': COMPANIES}
+LEVELS = {'buy_trigger': 459.0, 'target': 700.0, 'stop': 427.5}
+
+class CountingWriter(io.StringIO):
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+
+    def write(self, text):
+        self.writes += 1
+        return super().write(text)
+
+def render(fmt):
+    out = CountingWriter()
+    render_report(COMPANIES, ASYMMETRY, INSIGHTS, out=out, fmt=fmt, levels=LEVELS)
+    return out
+
+def test_plain_report_streams_without_escape_codes():
+    """Every section is written separately; plain text carries no ANSI codes"""
+
+    out = render('plain')
+    text = out.getvalue()
+    assert out.writes >= 7
+    assert '\033[' not in text
+    assert 'DIXON - ₹12000.00' in text
+    assert '1      Syrma SGS' in text
+    assert 'Buy at: ₹459.00' in text
+    assert '\033[1m' in render('ansi').getvalue()
+
+def test_markdown_and_html_targets():
+    """Same data as Markdown tables and escaped HTML"""
+
+    markdown = render('markdown').getvalue()
+    assert '## 🕵️ INSTITUTIONAL STEALTH RANKING' in markdown
+    assert '| 1 | Syrma SGS | High Alpha | 2.5% | ₹500.00 |' in markdown
+
+    page = render('html').getvalue()
+    assert page.startswith('<!DOCTYPE html>') and page.rstrip().endswith('</html>')
+    assert 'Display JV &lt;camera&gt;' in page
+    assert page.count('<ul>') == page.count('</ul>')
+
+def test_symbol_index_and_format_for_path():
+    assert index_by_symbol(COMPANIES + [{'symbol': 'SYRMA', 'name': 'dup'}])['SYRMA']['name'] == 'Syrma SGS'
+    assert format_for_path(Path('report.md')) == 'markdown'
+    assert format_for_path(Path('report.HTML')) == 'html'
+    assert format_for_path(Path('report.txt')) == 'plain'
@@ -0,0 +1,69 @@
+"""Tests for the append-only run store"""
+
+import json
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from run_store import RunStore
+
+def make_run(timestamp, top_symbol, prices):
+    companies = [{'symbol': s, 'name': s.title(), 'price': p, 'score': 10 - i}
+                 for i, (s, p) in enumerate(prices.items())]
+    top = companies[0]
+    return {
+        'timestamp': timestamp,
+        'top_company': {'name': top['name'], 'symbol': top_symbol, 'current_price': top['price'],
+                        'fifty_two_week_low': 90.0, 'fifty_two_week_high': 150.0, 'asymmetry_score': top['score'],
+                        'asymmetry_reasons': ['Near 52-week low (₹90.00)'], 'risk_flags': []},
+        'all_companies': companies,
+    }
+
+def test_latest_run_and_symbol_history(tmp_path):
+    """The newest run round-trips in the report shape; per-symbol series span runs"""
+
+    with RunStore(tmp_path / "runs.sqlite") as store:
+        assert store.latest_run() is None
+        store.append_run(make_run('2026-06-22T09:45:00', 'SYRMA', {'SYRMA': 100.0, 'DIXON': 200.0}))
+        store.append_run(make_run('2026-06-29T08:55:00', 'DIXON', {'DIXON': 210.0, 'SYRMA': 95.0}))
+
+        latest = store.latest_run()
+        assert latest['timestamp'] == '2026-06-29T08:55:00'
+        assert latest['top_company']['symbol'] == 'DIXON'
+        assert latest['top_company']['asymmetry_reasons'] == ['Near 52-week low (₹90.00)']
+        assert [c['symbol'] for c in latest['all_companies']] == ['DIXON', 'SYRMA']
+
+        series = store.symbol_history('SYRMA')
+        assert [(r['rank'], r['price']) for r in series] == [(1, 100.0), (2, 95.0)]
+        assert [p['symbol'] for p in store.top_picks()] == ['SYRMA', 'DIXON']
+
+def test_import_reports_is_idempotent(tmp_path):
+    """Legacy JSON reports import once; re-running the importer adds nothing"""
+
+    reports = tmp_path / "reports"
+    reports.mkdir()
+    for day in ('22', '29'):
+        run = make_run(f'2026-06-{day}T09:00:00', 'SYRMA', {'SYRMA': 100.0})
+        (reports / f"analysis_202606{day}_0900.json").write_text(json.dumps(run))
+
+    with RunStore(tmp_path / "runs.sqlite") as store:
+        assert store.import_reports(reports) == 2
+        assert store.import_reports(reports) == 0
+        assert store.count() == 2
+
+def test_imported_older_reports_do_not_become_latest(tmp_path):
+    """Latest means newest timestamp, even when older runs are imported afterwards"""
+
+    reports = tmp_path / "reports"
+    reports.mkdir()
+    old = make_run('2026-03-02T09:00:00', 'TCIEXP', {'TCIEXP': 500.0})
+    (reports / "analysis_20260302_0900.json").write_text(json.dumps(old))
+
+    with RunStore(tmp_path / "runs.sqlite") as store:
+        store.append_run(make_run('2026-06-29T08:55:00', 'DIXON', {'DIXON': 210.0}))
+        assert store.import_reports(reports) == 1
+
+        assert store.latest_run()['top_company']['symbol'] == 'DIXON'
+        assert [p['symbol'] for p in store.top_picks()] == ['TCIEXP', 'DIXON']
@@ -0,0 +1,159 @@
+"""Tests for the columnar scoring engine"""
+
+import random
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+import pytest
+
+from dynamic_pli_analyzer import EXPERT_INSIGHTS, _build_company, analyze_expert_validated_asymmetry
+from rule_engine import RuleError, RuleSet
+from scoring import score_companies
+
+# The original hard-coded factors expressed as rules
+LEGACY_RULES = {
+    'defaults': {'three_month_change': 0, 'stealth_rank': 5},
+    'rules': [
+        {'name': 'near_52w_low', 'when': 'current_price < fifty_two_week_low * 1.1', 'weight': 3},
+        {'name': 'three_month_drawdown', 'when': 'three_month_change < -5', 'weight': 2},
+        {'name': 'expert_catalyst', 'when': 'has_expert_catalyst', 'weight': 4},
+        {'name': 'high_stealth', 'when': 'stealth_rank <= 2', 'weight': 5},
+        {'name': 'moderate_stealth', 'when': '(stealth_rank > 2) & (stealth_rank <= 3)', 'weight': 2},
+        {'name': 'high_debt', 'when': '(symbol == "SYRMA") & (debt_to_equity > AVG_DEBT_EQUITY * 2)',
+         'weight': -2, 'kind': 'risk'},
+        {'name': 'geopolitical_risk', 'when': 'has_geopolitical_risk', 'weight': -3, 'kind': 'risk'},
+        {'name': 'extreme_pe', 'when': '(symbol == "AMBER") & (pe_ratio > 150)', 'weight': -4, 'kind': 'risk'},
+    ],
+}
+
+def legacy_score(company):
+    """The original per-dict scoring loop, kept as the reference"""
+
+    score = 0
+    if company['current_price'] < company['fifty_two_week_low'] * 1.1:
+        score += 3
+    if company.get('three_month_change', 0) < -5:
+        score += 2
+    if 'expert_catalyst' in company:
+        score += 4
+    stealth_rank = company.get('stealth_rank', 5)
+    if stealth_rank <= 2:
+        score += 5
+    elif stealth_rank <= 3:
+        score += 2
+    if company['symbol'] == 'SYRMA':
+        d_e = company.get('debt_to_equity', 0)
+        if d_e and d_e > EXPERT_INSIGHTS['industry_metrics']['avg_debt_equity'] * 2:
+            score -= 2
+    if 'geopolitical_risk' in company:
+        score -= 3
+    if company['symbol'] == 'AMBER' and company.get('pe_ratio', 0) > 150:
+        score -= 4
+    return score
+
+def random_universe(n, seed=7):
+    rng = random.Random(seed)
+    companies = []
+    for i in range(n):
+        low = rng.uniform(50, 5000)
+        company = {
+            'symbol': rng.choice(['SYRMA', 'AMBER', 'DIXON', f"SYM{i}"]),
+            'name': f"Company {i}",
+            'current_price': low * rng.uniform(0.95, 2.0),
+            'fifty_two_week_low': low,
+            'debt_to_equity': rng.choice([None, rng.uniform(0, 1)]),
+            'pe_ratio': rng.uniform(5, 250),
+        }
+        if rng.random() < 0.7:
+            company['three_month_change'] = rng.uniform(-30, 30)
+        if rng.random() < 0.5:
+            company['stealth_rank'] = rng.randint(1, 5)
+        if rng.random() < 0.3:
+            company['expert_catalyst'] = 'Component PLI boost'
+        if rng.random() < 0.2:
+            company['geopolitical_risk'] = ''
+        companies.append(company)
+    return companies
+
+def test_scores_match_legacy_loop():
+    """The legacy factors written as rules score like the original loop, except for empty risks"""
+
+    companies = random_universe(2000)
+    # has_<field> is truthiness: an empty geopolitical_risk no longer costs 3 as the key check did
+    expected = [legacy_score(c) + (3 if c.get('geopolitical_risk') == '' else 0) for c in companies]
+    assert any(c.get('geopolitical_risk') == '' for c in companies)
+
+    rules = RuleSet(LEGACY_RULES, {'AVG_DEBT_EQUITY': EXPERT_INSIGHTS['industry_metrics']['avg_debt_equity']})
+    result = score_companies(companies, rules)
+
+    assert [c['asymmetry_score'] for c in companies] == expected
+    ranked = [c['asymmetry_score'] for c in result['all_companies']]
+    assert ranked == sorted(expected, reverse=True)
+
+def test_reasons_only_for_top_k():
+    """Reason strings are built for reported rows; risk flags for every flagged row"""
+
+    companies = random_universe(200)
+    result = analyze_expert_validated_asymmetry(companies, top_k=3)
+
+    assert all(c['asymmetry_reasons'] == [] for c in result['all_companies'][3:])
+    assert any(c['asymmetry_reasons'] for c in result['all_companies'][:3])
+    assert not any(flag.startswith('⚠️ Geopolitical') for c in companies for flag in c['risk_flags'])
+
+def test_empty_geopolitical_risk_is_not_penalised():
+    """An empty risk string (a winner with no flagged exposure) scores 0; any text scores -3"""
+
+    companies = [
+        {'symbol': 'A', 'current_price': 200, 'fifty_two_week_low': 100, 'geopolitical_risk': ''},
+        {'symbol': 'B', 'current_price': 200, 'fifty_two_week_low': 100, 'geopolitical_risk': 'Chinese JV'},
+    ]
+    score_companies(companies, RuleSet(LEGACY_RULES, {'AVG_DEBT_EQUITY': 0.12}))
+
+    assert [c['asymmetry_score'] for c in companies] == [0, -3]
+    assert companies[0]['risk_flags'] == []
+    assert legacy_score(companies[0]) == -3  # What the original key check gave
+
+def test_ties_keep_input_order():
+    """Equal scores rank in input order, as the old stable sort did"""
+
+    companies = [{'symbol': s, 'current_price': 200, 'fifty_two_week_low': 100} for s in 'ABC']
+    result = analyze_expert_validated_asymmetry(companies)
+    assert [c['symbol'] for c in result['all_companies']] == ['A', 'B', 'C']
+
+
+def test_default_rules_apply_to_every_symbol():
+    """Debt, P/E and liquidity thresholds come from settings, not symbol names"""
+
+    company = {'symbol': 'ANY', 'current_price': 200, 'fifty_two_week_low': 100,
+               'debt_to_equity': 0.5, 'pe_ratio': 200, 'avg_volume': 5000}
+    analyze_expert_validated_asymmetry([company])
+
+    assert company['asymmetry_score'] == -2 - 4 - 1
+    assert len(company['risk_flags']) == 3
+    assert company['risk_flags'][0].startswith('⚠️ High debt: 0.50')
+
+def test_missing_volume_is_not_thin_liquidity():
+    """A quote without averageVolume carries no liquidity penalty or '0' reason"""
+
+    info = {'longName': 'No Volume Ltd', 'currentPrice': 200, 'fiftyTwoWeekLow': 100, 'marketCap': 1e9}
+    company = _build_company('NOVOL.NS', {'info': info, 'balance_sheet': None,
+                                          'institutional_holders': None, 'mutualfund_holders': None})
+    assert company['avg_volume'] is None
+
+    analyze_expert_validated_asymmetry([company])
+    assert company['asymmetry_score'] == 0
+    assert not any('liquidity' in flag for flag in company['risk_flags'])
+
+def test_rule_weights_and_validation():
+    """Weights can be swapped without recompiling; unsafe expressions are rejected"""
+
+    rules = RuleSet(LEGACY_RULES, {'AVG_DEBT_EQUITY': 0.12})
+    companies = [{'symbol': 'X', 'current_price': 100, 'fifty_two_week_low': 100}]
+    assert score_companies(companies, rules.with_weights({'near_52w_low': 7}))['top_company']['asymmetry_score'] == 7
+
+    for expression in ['__import__("os")', 'pe_ratio > 1 and pe_ratio < 9', 'UNKNOWN_LIMIT > 1']:
+        with pytest.raises(RuleError):
+            RuleSet({'rules': [{'name': 'bad', 'when': expression, 'weight': 1}]}, {})
@@ -0,0 +1,75 @@
+"""Tests for record/replay snapshots"""
+
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+import dynamic_pli_analyzer
+from data_cache import DataCache
+from providers import MarketDataProvider
+from snapshot import Snapshot, SnapshotMissError
+
+def test_record_then_replay(tmp_path):
+    """Recorded responses are served back verbatim without calling the provider"""
+
+    path = tmp_path / "run.snap"
+    with Snapshot.record(path) as snap:
+        assert snap.fetch(('yfinance', 'A', 'info'), lambda: {'longName': 'A'}) == {'longName': 'A'}
+
+    replay = Snapshot.replay(path)
+    assert replay.fetch(('yfinance', 'A', 'info')) == {'longName': 'A'}
+    with pytest.raises(SnapshotMissError):
+        replay.fetch(('yfinance', 'B', 'info'))
+
+class FakeProvider(MarketDataProvider):
+    """Remote-looking provider that fails once switched offline"""
+
+    remote = True
+
+    def __init__(self):
+        self.online = True
+
+    def _check(self):
+        if not self.online:
+            raise AssertionError("network call during replay")
+
+    def quote(self, symbol):
+        self._check()
+        return {'longName': symbol, 'currentPrice': 100.0, 'marketCap': 1e9,
+                'fiftyTwoWeekLow': 95.0, 'fiftyTwoWeekHigh': 150.0}
+
+    def fundamentals(self, symbol):
+        self._check()
+        return pd.DataFrame()
+
+    def holders(self, symbol, kind='institutional'):
+        self._check()
+        return pd.DataFrame({'Value': [1e7]})
+
+    def history(self, symbols, period='3mo', start=None, end=None):
+        self._check()
+        history = pd.DataFrame({('Close', s): [100.0, 90.0] for s in symbols})
+        history.columns = pd.MultiIndex.from_tuples(history.columns)
+        return history
+
+def test_discovery_replays_offline(tmp_path):
+    """A replayed discovery run matches the recorded one with no provider calls"""
+
+    provider = FakeProvider()
+    path = tmp_path / "run.snap"
+    with Snapshot.record(path) as snap:
+        recorded = dynamic_pli_analyzer.discover_companies_with_expert_insights(
+            ['DIXON.NS'], cache=DataCache(root=tmp_path / "cache"), snapshot=snap, provider=provider)
+
+    provider.online = False
+    replayed = dynamic_pli_analyzer.discover_companies_with_expert_insights(
+        ['DIXON.NS'], cache=DataCache(root=tmp_path / "cache2"), snapshot=Snapshot.replay(path),
+        provider=provider)
+
+    assert replayed == recorded
+    assert replayed[0]['three_month_change'] == -10.0
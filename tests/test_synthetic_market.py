@@ -0,0 +1,65 @@
+"""Tests for the synthetic market and news generators"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+# Add src and the repo root (latest_headline.py) to path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+sys.path.append(str(Path(__file__).parent.parent))
+
+from dynamic_pli_analyzer import discover_companies_with_expert_insights
+from latest_headline import fetch_live_headline_from_newsapi
+from news_client import AsyncNewsClient
+from price_store import PriceStore
+from synthetic_market import SyntheticMarketProvider, SyntheticNewsSource, synthetic_symbols
+
+def test_provider_is_seeded_and_shaped_like_yfinance():
+    """Same seed and end date, same data in any call order; fields match discovery's expectations"""
+
+    symbols = synthetic_symbols(3)
+    a = SyntheticMarketProvider(seed=1, end='2026-03-02')
+    b = SyntheticMarketProvider(seed=1, end='2026-03-02')
+
+    b.quote(symbols[2])
+    assert a.quote(symbols[2]) == b.quote(symbols[2])
+    assert a.quote(symbols[0]) != SyntheticMarketProvider(seed=2, end='2026-03-02').quote(symbols[0])
+
+    quote = a.quote(symbols[0])
+    assert quote['fiftyTwoWeekLow'] <= quote['currentPrice'] <= quote['fiftyTwoWeekHigh']
+    sheet = a.fetch(symbols[0], 'balance_sheet')
+    assert 'Total Debt' in sheet.index and sheet.columns[0] == pd.Timestamp('2025-03-31')
+    assert list(a.fetch(symbols[0], 'mutualfund_holders').columns[:2]) == ['Date Reported', 'Holder']
+
+    history = a.history(symbols, period='1y')
+    assert history.index[-1] == pd.Timestamp('2026-03-02')
+    assert history['Close'].notna().all().all() and len(history) <= 262
+
+def test_discovery_runs_on_synthetic_market(tmp_path):
+    """The provider plugs straight into discovery, including local price statistics"""
+
+    symbols = synthetic_symbols(20)
+    with PriceStore(tmp_path / "prices.sqlite") as store:
+        companies = discover_companies_with_expert_insights(symbols, provider=SyntheticMarketProvider(end='2026-03-02'),
+                                                            store=store)
+    assert len(companies) == 20
+    assert all(c['mutual_fund_value'] > 0 and c['institutional_value'] > 0 for c in companies)
+    assert all('three_month_change' in c for c in companies)
+
+def test_news_source_serves_headline_and_paged_stream():
+    """One source answers the headline fetch and the paginating async client"""
+
+    news = SyntheticNewsSource(seed=3, per_day=10, days=20)  # The headline asks for the last 7 days
+    headline = fetch_live_headline_from_newsapi('PLI Scheme', request=news.request)
+    assert headline['title'] == news.articles('PLI Scheme')[0]['title']
+    assert headline['published_at'] == news.articles('PLI Scheme')[0]['publishedAt'][:10]
+
+    async def stream():
+        async with AsyncNewsClient('synthetic', transport=news, page_size=50, max_pages=20) as client:
+            return await client.fetch_all(['"Dixon"', 'PLI Scheme'])
+
+    articles = asyncio.run(stream())
+    expected = len(news.articles('"Dixon"')) + len(news.articles('PLI Scheme'))
+    assert len(articles) == expected and len({a['url'] for a in articles}) == expected
@@ -0,0 +1,57 @@
+"""Tests for the append-only track record"""
+
+import json
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from track_record import TrackRecord
+
+def pick(day, symbol='SYRMA', price=100.0):
+    return {'date': f"2026-06-{day:02d}", 'company': symbol.title(), 'symbol': symbol,
+            'price': price, 'target': 150.0, 'status': 'Active'}
+
+def test_append_dedup_and_tail(tmp_path):
+    """Duplicates are rejected; tail reads the newest picks in order"""
+
+    record = TrackRecord(tmp_path / "track.jsonl")
+    for day in range(1, 30):
+        assert record.append(pick(day, price=100.0 + day))
+    assert not record.append(pick(5))
+    assert record.has_date('2026-06-05') and not record.has_date('2026-07-01')
+
+    assert [e['date'] for e in record.tail(3)] == ['2026-06-27', '2026-06-28', '2026-06-29']
+    assert len(record.tail(100)) == 29
+    assert record.get('2026-06-10', 'SYRMA')['price'] == 110.0
+
+def test_status_updates_survive_reopen(tmp_path):
+    """Status changes go to the index, never rewriting the log"""
+
+    path = tmp_path / "track.jsonl"
+    record = TrackRecord(path)
+    record.append(pick(1))
+    record.append(pick(8, 'DIXON'))
+    log_before = path.read_bytes()
+
+    assert record.set_status('2026-06-01', 'SYRMA', 'Target Hit')
+    assert not record.set_status('2026-06-01', 'SYRMA', 'Target Hit')
+    assert path.read_bytes() == log_before
+
+    reopened = TrackRecord(path)
+    assert [e['status'] for e in reopened] == ['Target Hit', 'Active']
+    assert reopened.tail(1)[0]['symbol'] == 'DIXON'
+
+def test_recovers_unindexed_lines_and_migrates(tmp_path):
+    """Log lines missing from the index are picked up; legacy JSON imports once"""
+
+    path = tmp_path / "track.jsonl"
+    path.write_text(json.dumps(pick(1)) + "\n" + json.dumps(pick(2)) + "\n")
+    record = TrackRecord(path)
+    assert len(record) == 2
+
+    legacy = tmp_path / "track_record.json"
+    legacy.write_text(json.dumps([pick(2), pick(3)]))
+    assert record.migrate_json(legacy) == 1
+    assert len(TrackRecord(path)) == 3
@@ -0,0 +1,65 @@
+"""Tests for the sorted trigger index"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from track_record import TrackRecord
+from trigger_index import UNIVERSE, TriggerIndex, build_trigger_index
+
+def test_crossed_matches_brute_force():
+    """Bisect lookups return exactly the levels a pairwise comparison would"""
+
+    rng = np.random.default_rng(3)
+    index = TriggerIndex()
+    levels = {}
+    for i in range(50):
+        symbol = f"S{i}.NS"
+        prices = np.round(rng.uniform(50, 150, 40), 1)
+        levels[symbol] = prices
+        for j, price in enumerate(prices):
+            index.add(symbol, 'target', float(price), source=str(j))
+    assert len(index) == 2000
+
+    for _ in range(500):
+        symbol = f"S{rng.integers(50)}.NS"
+        previous, price = (float(p) for p in np.round(rng.uniform(40, 160, 2), 1))
+        expected = sorted(p for p in levels[symbol]
+                          if previous < p <= price or previous > p >= price)
+        assert sorted(level.price for level in index.crossed(symbol, previous, price)) == expected
+
+def test_crossed_nearest_first_and_replace():
+    """Downward moves list the nearest level first; replace swaps one source's levels"""
+
+    index = TriggerIndex()
+    index.replace('A.NS', {'buy_trigger': 102.0, 'target': 150.0, 'stop': 95.0})
+    index.add('A.NS', 'stop', 90.0, source='2026-02-23')
+
+    assert [l.name for l in index.crossed('A.NS', 110.0, 89.0)] == ['buy_trigger', 'stop', 'stop']
+    assert index.crossed('A.NS', 100.0, 100.0) == []
+
+    index.replace('A.NS', {'buy_trigger': 81.6, 'target': 150.0, 'stop': 76.0})
+    assert index.levels('A.NS') == {'stop': 76.0, 'buy_trigger': 81.6, 'target': 150.0}
+    assert [l.source for l in index.crossed('A.NS', 110.0, 89.0)] == ['2026-02-23']
+
+def test_build_includes_active_picks(tmp_path):
+    """Company levels come from calculate_buy_trigger; only active picks add levels"""
+
+    record = TrackRecord(tmp_path / "track_record.jsonl")
+    record.append({'date': '2026-02-23', 'symbol': 'DIXON', 'company': 'Dixon', 'price': 100.0, 'target': 130.0})
+    record.append({'date': '2026-03-02', 'symbol': 'AMBER', 'company': 'Amber', 'price': 50.0, 'target': 70.0,
+                   'status': 'Target Hit'})
+    companies = [{'symbol': 'SYRMA', 'fifty_two_week_low': 100.0, 'fifty_two_week_high': 150.0}]
+
+    index = build_trigger_index(companies, record, runs_db=tmp_path / "runs.sqlite")
+
+    assert index.levels('SYRMA.NS') == {'stop': pytest.approx(95.0), 'buy_trigger': pytest.approx(102.0),
+                                        'target': 150.0}
+    assert index.levels('DIXON.NS', source='2026-02-23') == {'stop': pytest.approx(95.0), 'target': 130.0}
+    assert 'AMBER.NS' not in index
+    assert index.levels('DIXON.NS', source=UNIVERSE) == {}
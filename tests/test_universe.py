@@ -0,0 +1,52 @@
+"""Tests for universe construction and scan progress"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from universe import ScanProgress, build_universe, sector_map
+
+def test_default_universe_covers_every_pli_sector():
+    """Every configured sector is scanned, each symbol once"""
+
+    from config import settings
+
+    universe = build_universe()
+    assert list(universe) == list(settings.PLI_SECTORS)
+    symbols = [s for group in universe.values() for s in group]
+    assert len(symbols) == len(set(symbols))
+    assert 'SAHASRA.NS' in symbols
+
+def test_extra_symbol_list_is_appended_and_deduplicated(tmp_path):
+    """NSE list symbols get a .NS suffix and keep their first sector"""
+
+    symbols_file = tmp_path / "nse.csv"
+    symbols_file.write_text("symbol,sector\nDIXON,electronics\nKAYNES,ems\nTATAELXSI,\n")
+
+    universe = build_universe(sectors={'electronics': ['DIXON.NS']}, symbols_file=symbols_file)
+    assert universe == {'electronics': ['DIXON.NS'], 'ems': ['KAYNES.NS'], 'nse': ['TATAELXSI.NS']}
+    assert sector_map(universe)['KAYNES.NS'] == 'ems'
+
+def test_missing_symbol_list_names_the_flag(tmp_path):
+    """A missing --universe file fails with a pointer to the flag and format"""
+
+    with pytest.raises(FileNotFoundError, match='--universe FILE'):
+        build_universe(symbols_file=tmp_path / "nse_universe.csv")
+
+def test_progress_reports_completed_sectors():
+    """A line is reported once every symbol in a sector has finished"""
+
+    lines = []
+    progress = ScanProgress({'A.NS': 'x', 'B.NS': 'x', 'C.NS': 'y'}, report=lines.append)
+    progress.update('A.NS', True)
+    assert lines == []
+    progress.update('B.NS', False)
+    progress.update('C.NS', True)
+
+    assert lines[0].startswith("  ▸ x: 1/2 fetched")
+    assert lines[1].startswith("  ▸ y: 1/1 fetched")
+    assert progress.summary().startswith("2/3 symbols across 2 sectors")
@@ -0,0 +1,63 @@
+"""Tests for watch mode"""
+
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+import pytest
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from watch import Watcher, market_is_open, watch
+
+IST = ZoneInfo('Asia/Kolkata')
+
+def make_watcher(tmp_path, lines):
+    companies = [
+        {'symbol': 'AAA', 'current_price': 110.0, 'fifty_two_week_low': 100.0, 'fifty_two_week_high': 150.0},
+        {'symbol': 'BBB', 'current_price': 60.0, 'fifty_two_week_low': 50.0, 'fifty_two_week_high': 80.0},
+    ]
+    return Watcher(companies, alerts_path=tmp_path / "alerts.jsonl", emit=lines.append)
+
+def test_market_hours():
+    """Weekday sessions from 09:15 to 15:30 IST only"""
+
+    assert market_is_open(datetime(2026, 10, 16, 9, 15, tzinfo=IST))
+    assert not market_is_open(datetime(2026, 10, 16, 15, 30, tzinfo=IST))
+    assert not market_is_open(datetime(2026, 10, 17, 11, 0, tzinfo=IST))  # Saturday
+
+def test_tick_alerts_only_on_crossings(tmp_path):
+    """Crossing the buy trigger and then the stop raises one alert each"""
+
+    lines = []
+    watcher = make_watcher(tmp_path, lines)
+    now = datetime(2026, 10, 16, 10, 0, tzinfo=IST)
+
+    assert watcher.tick({'AAA.NS': 110.0, 'BBB.NS': 60.0}, now) == []
+    alerts = watcher.tick({'AAA.NS': 101.0, 'BBB.NS': 61.0}, now)
+    assert [(a['symbol'], a['level'], a['direction']) for a in alerts] == [('AAA', 'buy_trigger', 'down')]
+    assert 'asymmetry_score' in watcher.companies['BBB.NS']
+
+    alerts = watcher.tick({'AAA.NS': 94.0}, now)
+    assert [a['level'] for a in alerts] == ['stop']
+    # A new low moves the levels with it
+    assert watcher.companies['AAA.NS']['fifty_two_week_low'] == 94.0
+    assert watcher.index.levels('AAA.NS')['stop'] == pytest.approx(94.0 * 0.95)
+
+    logged = [json.loads(line) for line in (tmp_path / "alerts.jsonl").read_text().splitlines()]
+    assert [a['level'] for a in logged] == ['buy_trigger', 'stop']
+    assert len(lines) == 2
+
+def test_watch_polls_until_max_ticks(tmp_path):
+    """The loop fetches once per tick and never sleeps after the last one"""
+
+    watcher = make_watcher(tmp_path, [])
+    polls, sleeps = [], []
+    watch(watcher, lambda symbols: polls.append(symbols) or {'AAA.NS': 120.0},
+          max_ticks=3, ignore_hours=True, sleep=sleeps.append)
+
+    assert len(polls) == 3
+    assert len(sleeps) == 2